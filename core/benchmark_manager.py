@@ -1,33 +1,126 @@
+import contextlib
+import io
 import json
 import os
 import re 
-from typing import List, Dict, Any
-from tools.cppcheck_tool import CppcheckTool
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Dict, Any, Optional, Sequence, Tuple
+from core import profiler
 from core.build_manager import BuildManager
-# --- תוספת 1: ייבוא הכלי החדש ---
-from tools.valgrind_tool import ValgrindTool
+from core.checkpoint import RunJournal
+from core.dynamic_scheduler import DynamicScheduler, adaptive_timeouts
+from core.findings import has_diagnostics
+from core.pipeline import TaskGraph
+from core.preprocess_cache import PreprocessCache
+from core.result_cache import ResultCache
+from core.reporting import REPORT_FORMATS, ProgressBar, ReportWriter
+from core.results_store import ResultsStore
+from core.sharding import partition, shard_file_name, write_shard_file
+from core.tool_registry import DEFAULT_STATIC_TOOLS, ToolRegistry
+from core.tool_runner import execute_tool, execute_tool_in_worker
+from core.valgrind_errors import ErrorGroups, SuppressionFile
+from core.verification import MatchEngine, TargetResult, VerificationReport
+
 
 class BenchmarkManager:
-    def __init__(self, input_dir_name: str = "src", config_file: str = "expected_results.json"):
+    def __init__(self, input_dir_name: str = "src", config_file: str = "expected_results.json",
+                 workers: int = 1, use_cache: bool = True, incremental: bool = False,
+                 build_options: Optional[Dict[str, Any]] = None,
+                 dynamic_options: Optional[Dict[str, Any]] = None, project_mode: bool = False,
+                 pipelined: bool = False, line_tolerance: int = 1, store_path: Optional[str] = None,
+                 dynamic_tool_names: Optional[List[str]] = None, shard: Optional[Tuple[int, int]] = None,
+                 resume: bool = False, tool_names: Optional[List[str]] = None,
+                 registry: Optional[ToolRegistry] = None, verbose: bool = True,
+                 report_formats: Sequence[str] = REPORT_FORMATS, compress_reports: bool = False):
         """
         Initialize the manager.
+        workers > 1 spreads the static analysis phase over a process pool.
+        use_cache=False re-runs static tools even on files whose results are cached, and
+        turns off the dependency scans the static tools share and the learned valgrind suppressions.
+        incremental=True reuses the existing build tree instead of a clean rebuild.
+        build_options are passed on to BuildManager (jobs, generator, use_ccache).
+        dynamic_options are passed on to DynamicScheduler (max_jobs, cpu_seconds, memory_bytes, memory_budget).
+        project_mode=True runs tools that support it once over the build's compile_commands.json.
+        pipelined=True builds while static analysis runs, and analyzes each executable as soon as it is linked.
+        line_tolerance is how many lines a finding may be off from the expected bug and still match it.
+        store_path is the SQLite results database every run is saved to ("" disables it).
+        tool_names selects the tools of the registry to run (default: cppcheck, clang-tidy and
+        the dynamic_tool_names, which default to valgrind); tools that are not installed are skipped.
+        shard=(i, N) only analyzes the i-th of N parts of the files and executables and writes
+        its results to reports/shard_i_of_N.json, to be combined with run_benchmark.py --merge.
+        resume=True continues an interrupted run: (tool, target) results in its checkpoint
+        journal are not run again, and the build tree is reused.
+        verbose=False shows a progress bar instead of every tool run and its verification;
+        the full output is kept in reports/run_<name>.log.
+        report_formats are the consolidated reports written after each run (jsonl, sarif, junit),
+        gzip compressed with compress_reports=True.
         """
         current_dir = os.path.dirname(os.path.abspath(__file__))
         self.project_root = os.path.dirname(current_dir)
         self.src_path = os.path.join(self.project_root, input_dir_name)
         self.config_path = os.path.join(self.src_path, config_file)
         self.reports_path = os.path.join(self.project_root, "reports")
+        self.workers = max(1, workers)
+        self.incremental = incremental or resume
+        self.resume = resume
+        self.journal = None     # checkpoint of the running run_all_tests()
+        self.verbose = verbose
+        self.progress = None    # ProgressBar of the running run_all_tests(), if not verbose
+        self.report_writer = ReportWriter(self.reports_path, report_formats, compress_reports)
+        self.project_mode = project_mode
+        self.pipelined = pipelined
+        self.cache = ResultCache(os.path.join(self.project_root, ".cache", "results"),
+                                 source_root=self.src_path) if use_cache else None
 
         self._validate_input()
         os.makedirs(self.reports_path, exist_ok=True)
         self.ground_truth = self._load_ground_truth()
+        self.matcher = MatchEngine(self.ground_truth, line_tolerance)
+        self.verification = VerificationReport()
         
         # אתחול מנהל הבנייה
-        self.builder = BuildManager(self.src_path)
+        build_options = dict(build_options or {})
+        if shard:
+            # shards running on one machine must not clean or build each other's tree
+            build_options.setdefault("build_dir_name", f"build-shard-{shard[0]}")
+        self.builder = BuildManager(self.src_path, **build_options)
+        self.variant_builders: Dict[str, BuildManager] = {}
         
         # --- תוספת 2: רשימת הכלים ---
-        self.static_tools = [CppcheckTool()]
-        self.dynamic_tools = [ValgrindTool()]
+        self.registry = registry or ToolRegistry(os.path.join(self.project_root, ".cache", "tool_probe.json"))
+        tools = self.registry.create(tool_names or DEFAULT_STATIC_TOOLS + (dynamic_tool_names or ["valgrind"]))
+        self.static_tools = [tool for tool in tools if tool.kind == "static"]
+        self.dynamic_tools = [tool for tool in tools if tool.kind == "dynamic"]
+        self.suppressions = None
+        self.preprocess_cache = None
+        self._dependencies: Dict[str, Any] = {}     # dependency scans of the running static phase
+        if use_cache:
+            # the headers of every file are resolved once for the cache keys of all static tools
+            self.preprocess_cache = PreprocessCache(os.path.join(self.project_root, ".cache", "preprocessed"))
+            for tool in self.static_tools:
+                tool.preprocess_cache = self.preprocess_cache
+            # third-party noise found by valgrind is suppressed in later runs
+            self.suppressions = SuppressionFile(os.path.join(self.project_root, ".cache", "valgrind", "noise.supp"))
+            for tool in self.dynamic_tools:
+                tool.suppressions_file = self.suppressions.path
+        for tool in self.dynamic_tools:
+            tool.project_roots = (os.path.realpath(self.src_path), os.path.realpath(self.builder.build_path))
+        self.dynamic_scheduler = DynamicScheduler(**(dynamic_options or {}))
+        self.run_profile = profiler.Profiler()
+        self.store_path = os.path.join(self.reports_path, "results.db") if store_path is None else store_path
+        self.run_config = {"src": input_dir_name, "workers": self.workers, "project_mode": project_mode,
+                           "pipelined": pipelined, "line_tolerance": line_tolerance,
+                           "static_tools": [tool.__class__.__name__ for tool in self.static_tools],
+                           "dynamic_tools": [tool.__class__.__name__ for tool in self.dynamic_tools],
+                           "fast_fail": self.dynamic_scheduler.fast_fail}
+        self.shard = shard
+        self._shard_costs = None
+        self._shard_executables = None      # executable names of this shard, once known
+        if shard:
+            self.run_config["shard"] = list(shard)
 
     def _validate_input(self):
         if not os.path.isdir(self.src_path):
@@ -44,6 +137,12 @@ class BenchmarkManager:
         with open(self.config_path, 'r') as f:
             return json.load(f)
 
+    def reload_ground_truth(self):
+        """Re-reads expected_results.json (e.g. after it was edited in watch mode)."""
+        self._validate_input()
+        self.ground_truth = self._load_ground_truth()
+        self.matcher = MatchEngine(self.ground_truth, self.matcher.line_tolerance)
+
     def _parse_cmake_files(self) -> List[str]:
         cmake_path = os.path.join(self.src_path, "CMakeLists.txt")
         if not os.path.exists(cmake_path):
@@ -57,6 +156,24 @@ class BenchmarkManager:
         source_files = re.findall(r'([\w\-\./\\]+\.(?:cpp|c|cc|cxx))', content, re.IGNORECASE)
         return list(set(source_files))
 
+    def _parse_cmake_targets(self) -> Dict[str, List[str]]:
+        """
+        Returns {executable target: [source files, relative to the source folder]} from the
+        add_executable() calls of CMakeLists.txt.
+        """
+        cmake_path = os.path.join(self.src_path, "CMakeLists.txt")
+        if not os.path.exists(cmake_path):
+            return {}
+
+        with open(cmake_path, 'r') as f:
+            content = f.read()
+
+        targets = {}
+        for name, arguments in re.findall(r'add_executable\s*\(\s*([\w\-\.]+)([^)]*)\)', content, re.IGNORECASE):
+            sources = re.findall(r'([\w\-\./\\]+\.(?:cpp|c|cc|cxx))', arguments, re.IGNORECASE)
+            targets[name] = [os.path.normpath(source) for source in sources]
+        return targets
+
     def get_files_to_test(self) -> List[Dict]:
         json_files_map = {item["filename"]: item.get("bugs", []) for item in self.ground_truth.get("files", [])}
         cmake_files = self._parse_cmake_files()
@@ -75,92 +192,709 @@ class BenchmarkManager:
                     "filename": clean_filename,
                     "expected_bugs": expected_bugs
                 })
-        return final_file_list
+        # sorted so serial and parallel runs report in the same order
+        return sorted(final_file_list, key=lambda item: item["filename"])
 
-    def build_project(self):
+    def build_project(self, on_target_built: Optional[Callable[[str, str], None]] = None):
         """Compiles the project using the BuildManager."""
-        self.builder.clean_build()
-        success = self.builder.run_build()
+        # a tree configured earlier in this run (project mode) is already fresh
+        if not self.incremental and not self.builder.configured:
+            self.builder.clean_build()
+        success = self.builder.run_build(on_target_built)
         if not success:
             raise RuntimeError("Project compilation failed. Aborting benchmark.")
         return self.builder.get_executables()
 
+    def _variant_names(self) -> List[str]:
+        """Build variants needed by the dynamic tools (e.g. a sanitizer build), in tool order."""
+        names = []
+        for tool in self.dynamic_tools:
+            if tool.build_variant and tool.build_variant not in names:
+                names.append(tool.build_variant)
+        return names
+
+    def build_variant(self, name: str) -> Dict[str, str]:
+        """
+        Builds the instrumented variant of the project the dynamic tools named name need.
+        Returns {executable name: executable path}, empty if the build failed.
+        """
+        if name not in self.variant_builders:
+            flags = []
+            for tool in self.dynamic_tools:
+                if tool.build_variant == name:
+                    flags += [flag for flag in tool.build_flags if flag not in flags]
+            self.variant_builders[name] = self.builder.variant(name, flags)
+            for tool in self.dynamic_tools:
+                tool.project_roots += (os.path.realpath(self.variant_builders[name].build_path),)
+        builder = self.variant_builders[name]
+
+        print(f"\n--- Building '{name}' variant ---")
+        if not self.incremental and not builder.configured:
+            builder.clean_build()
+        with profiler.span("build", f"variant:{name}", builder.build_path):
+            success = builder.run_build()
+        if not success:
+            print(f"The '{name}' variant failed to build, its tools are skipped.")
+            return {}
+        return {os.path.basename(path): path for path in builder.get_executables()}
+
+    def _dynamic_jobs(self, executables: List[str], variant_executables: Dict[str, Dict[str, str]]):
+        """
+        Returns (tool, executable, path to run) for every dynamic tool and executable.
+        Tools with a build variant run that variant's executable of the same name;
+        the path is None when the variant has no such executable.
+        """
+        jobs = []
+        for exe_path in executables:
+            for tool in self.dynamic_tools:
+                run_path = exe_path
+                if tool.build_variant:
+                    run_path = variant_executables.get(tool.build_variant, {}).get(os.path.basename(exe_path))
+                jobs.append((tool, exe_path, run_path))
+        return jobs
+
+    @staticmethod
+    def _missing_variant_outcome(tool, exe_path: str) -> Tuple[None, str, str]:
+        return None, f"no '{tool.build_variant}' build of {os.path.basename(exe_path)}", ""
+
     def run_all_tests(self):
+        run_name = time.strftime("%Y%m%d_%H%M%S")
+        if self.shard:
+            run_name += "_" + shard_file_name(*self.shard)[:-len(".json")]
+        self.journal = RunJournal(self._journal_path(), {"src": self.src_path, "shard": self.run_config.get("shard")},
+                                  resume=self.resume)
+        self.dynamic_scheduler.timeouts = self._adaptive_timeouts()
+        previous = profiler.activate(self.run_profile)
+        completed = False
+        log = io.StringIO() if not self.verbose else None
+        try:
+            with profiler.span("manager", "total"), self._console(log):
+                if self.pipelined:
+                    self._run_pipelined()
+                else:
+                    self._run_phases()
+            completed = True
+        finally:
+            profiler.activate(previous)
+            self.journal.close(completed)
+            self.journal = None
+
+        print(f"\n=== Verification Summary ===")
+        print(self.verification.summary())
+        self._write_reports(run_name, log.getvalue() if log else None)
+        self._write_profile(run_name)
+        if self.shard:
+            self._write_shard_results()
+        else:
+            self._save_results()
+
+    def _adaptive_timeouts(self) -> Dict[Tuple[str, str], float]:
+        """Timeouts of the dynamic jobs, derived from their runtimes in recent stored runs."""
+        if not self.store_path or not os.path.exists(self.store_path):
+            return {}
+        store = ResultsStore(self.store_path)
+        try:
+            runtimes = store.tool_runtimes()
+        finally:
+            store.close()
+        timeouts = adaptive_timeouts(runtimes, self.dynamic_tools, self.dynamic_scheduler.timeout_factor)
+        if timeouts:
+            print(f"Using adaptive timeouts for {len(timeouts)} dynamic jobs (x{self.dynamic_scheduler.timeout_factor:g} "
+                  f"their recorded runtime).")
+        return timeouts
+
+    def _journal_path(self) -> str:
+        name = "checkpoint.jsonl" if not self.shard else f"checkpoint_shard_{self.shard[0]}_of_{self.shard[1]}.jsonl"
+        return os.path.join(self.reports_path, name)
+
+    def _resumed_result(self, tool_name: str, target: str) -> Optional[Dict[str, Any]]:
+        """Result of tool_name on target from the interrupted run being resumed, if it finished."""
+        return self.journal.get(tool_name, target) if self.journal else None
+
+    def _select_shard(self, names: List[str]) -> List[str]:
+        """
+        Returns the names that belong to this shard. All shards compute the same partition,
+        balanced by the tool time of every name in recent stored runs.
+        """
+        if self._shard_costs is None:
+            self._shard_costs = {}
+            if self.store_path and os.path.exists(self.store_path):
+                store = ResultsStore(self.store_path)
+                try:
+                    self._shard_costs = store.target_costs()
+                finally:
+                    store.close()
+        index, count = self.shard
+        return partition(names, count, self._shard_costs)[index - 1]
+
+    def _shard_files(self, files_data: List[Dict]) -> List[Dict]:
+        if not self.shard:
+            return files_data
+        selected = set(self._select_shard([item["filename"] for item in files_data]))
+        return [item for item in files_data if item["filename"] in selected]
+
+    def _plan_executable_shard(self, executables: List[str]):
+        """Decides which executables this shard analyzes (once, from the full list)."""
+        if self.shard and self._shard_executables is None:
+            self._shard_executables = set(self._select_shard([os.path.basename(path) for path in executables]))
+
+    def _in_shard(self, exe_path: str) -> bool:
+        """False for executables of other shards, and while the executable list is not known yet."""
+        if not self.shard:
+            return True
+        return self._shard_executables is not None and os.path.basename(exe_path) in self._shard_executables
+
+    def _write_shard_results(self):
+        index, count = self.shard
+        path = os.path.join(self.reports_path, shard_file_name(index, count))
+        write_shard_file(path, index, count, self.verification, self.run_profile.records, self.run_config)
+        print(f"Partial results of shard {index}/{count} written to {path}")
+
+    def _save_results(self):
+        """Stores findings, verification outcomes and timings of this run in the results database."""
+        if not self.store_path:
+            return
+        store = ResultsStore(self.store_path)
+        try:
+            run_id = store.save_run(self.verification, self.run_profile.records, self.run_config)
+        finally:
+            store.close()
+        print(f"Results stored as run #{run_id} in {self.store_path}")
+
+    @contextlib.contextmanager
+    def _console(self, log: Optional[io.StringIO]):
+        """
+        Without verbose, everything the phases and tools print goes to log (written to
+        reports/ with the other reports) and the console shows a progress bar instead.
+        If the run fails, the log is printed so the error keeps its context.
+        """
+        if log is None:
+            yield
+            return
+        real_stdout = sys.stdout
+        self.progress = ProgressBar(real_stdout)
+        sys.stdout = log
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            sys.stdout = real_stdout
+            self.progress.close()
+            self.progress = None
+            if failed:
+                print(log.getvalue(), end="")
+
+    def _write_reports(self, run_name: str, log: Optional[str]):
+        paths = self.report_writer.write(self.verification, run_name, log)
+        if paths:
+            print(f"\nReports: {', '.join(os.path.relpath(path, self.project_root) for path in paths)}")
+
+    def _write_profile(self, run_name: str):
+        """Writes the timing profile of this run to reports/ and prints its summary."""
+        paths = self.run_profile.write(self.reports_path, run_name)
+        print(f"\n=== Run Profile ({', '.join(os.path.basename(p) for p in paths)}) ===")
+        print(self.run_profile.summary())
+
+    def _run_phases(self):
         # static analysis
-        files_data = self.get_files_to_test()
+        files_data = self._shard_files(self.get_files_to_test())
         if files_data:
             print(f"\n=== Phase 1: Static Analysis ({len(files_data)} files) ===")
-            for file_info in files_data:
-                file_path = file_info["path"]
-                filename = file_info["filename"]
-                expected_bugs = file_info["expected_bugs"]
+            with profiler.span("manager", "static_phase"):
+                self._run_static_phase(files_data)
+
+        if not self.dynamic_tools:
+            print("\nNo dynamic tools selected, skipping the build and dynamic analysis.")
+            print("\n--- Benchmark Completed ---")
+            return
 
-                print(f"\n[File]: {filename}")
-                for tool in self.static_tools:
-                    self._run_tool(tool, file_path, filename, expected_bugs)
-        
         # build user's project
         print(f"\n=== Phase 2: Building Project ===")
         try:
-            executables = self.build_project()
+            with profiler.span("manager", "build_phase"):
+                executables = self.build_project()
+                variant_executables = {name: self.build_variant(name) for name in self._variant_names()}
         except RuntimeError as e:
             print(e)
             return
 
         # dynamic analysis
+        self._plan_executable_shard(executables)
+        executables = [exe_path for exe_path in executables if self._in_shard(exe_path)]
         if executables:
             print(f"\n=== Phase 3: Dynamic Analysis ({len(executables)} executables) ===")
-            for exe_path in executables:
-                exe_name = os.path.basename(exe_path)
-                print(f"\n[Executable]: {exe_name}")
-                
-                for tool in self.dynamic_tools:
-                    self._run_tool(tool, exe_path, exe_name, [])
+            with profiler.span("manager", "dynamic_phase"):
+                self._run_dynamic_phase(executables, variant_executables)
         else:
             print("No executables found to test.")
         
         print("\n--- Benchmark Completed ---")
 
-    def _run_tool(self, tool, path, name, expected_bugs):
-        """Helper to run a single tool and verify results."""
-        tool_name = tool.__class__.__name__
-        print(f"Running {tool_name} ...", end=" ", flush=True)
+    def _run_pipelined(self):
+        """
+        Runs the same work as the three phases as a task graph:
+        configure -> (static analysis | build), one build task per build variant,
+        and one dynamic analysis task per (tool, executable) that starts as soon
+        as the executable is linked (in the tool's build variant, if it has one).
+        The output is replayed afterwards in phase order, so it reads like a phased run.
+        """
+        files_data = self._shard_files(self.get_files_to_test())
+        graph = TaskGraph(max_workers=3 + self.dynamic_scheduler.concurrency)
+        scheduled = set()
+        variant_built = {}
+        lock = threading.Lock()
+
+        def schedule_dynamic(exe_path: str, variant: Optional[str] = None):
+            if not self._in_shard(exe_path):
+                return
+            for tool in self.dynamic_tools:
+                if tool.build_variant != variant or self._dynamic_resumed(tool, exe_path):
+                    continue
+                name = self._dynamic_task_name(tool, exe_path)
+                with lock:
+                    if name in scheduled:
+                        continue
+                    scheduled.add(name)
+                future_job = lambda tool=tool: self.dynamic_scheduler.outcome(self.dynamic_scheduler.submit(tool, exe_path))
+                graph.add(name, future_job)
+
+        def configure() -> bool:
+            if not self.incremental:
+                self.builder.clean_build()
+            configured = self.builder.configure()
+            targets = self.builder.get_targets()
+            if configured and targets is not None:
+                # the File API lists the executables before they are built
+                self._plan_executable_shard([target["executable"] for target in targets])
+            return configured
+
+        def build() -> List[str]:
+            executables = self.build_project(on_target_built=lambda target, exe_path: schedule_dynamic(exe_path))
+            self._plan_executable_shard(executables)
+            # targets that were already up to date are never reported as linked
+            for exe_path in executables:
+                schedule_dynamic(exe_path)
+            # variants that finished before this shard's executables were known
+            for name, variant_executables in list(variant_built.items()):
+                for exe_path in variant_executables.values():
+                    schedule_dynamic(exe_path, name)
+            return executables
+
+        def build_variant(name: str) -> Dict[str, str]:
+            variant_executables = self.build_variant(name)
+            variant_built[name] = variant_executables
+            for exe_path in variant_executables.values():
+                schedule_dynamic(exe_path, name)
+            return variant_executables
+
+        graph.add("configure", configure)
+        graph.add("build", build, deps=["configure"])
+        # a variant has its own build directory, so it builds alongside the main build
+        for name in self._variant_names():
+            graph.add(f"build:{name}", lambda name=name: build_variant(name))
+        if files_data:
+            # project mode reads compile_commands.json, which the configure step writes
+            graph.add("static", lambda: self._run_static_phase(files_data),
+                      deps=["configure"] if self.project_mode else [])
+
+        with self.dynamic_scheduler:
+            outcomes = graph.run()
+
+        if files_data:
+            print(f"\n=== Phase 1: Static Analysis ({len(files_data)} files) ===")
+            result, error, log = outcomes["static"]
+            print(log, end="")
+            if error is not None:
+                print(f"Static analysis failed: {error}")
+
+        print(f"\n=== Phase 2: Building Project ===")
+        for name in ["configure", "build"] + [f"build:{name}" for name in self._variant_names()]:
+            print(outcomes[name][2], end="")
+        executables, error, _ = outcomes["build"]
+        if error is not None:
+            print(error)
+            return
+
+        executables = [exe_path for exe_path in executables if self._in_shard(exe_path)]
+        if executables:
+            print(f"\n=== Phase 3: Dynamic Analysis ({len(executables)} executables) ===")
+            jobs = self._dynamic_jobs(executables, {})
+            results = []
+            for tool, exe_path, _ in jobs:
+                if self._dynamic_resumed(tool, exe_path):
+                    continue
+                outcome = outcomes.get(self._dynamic_task_name(tool, exe_path))
+                results.append(self._task_outcome(outcome) if outcome else self._missing_variant_outcome(tool, exe_path))
+            self._report_dynamic_results([(tool, exe_path) for tool, exe_path, _ in jobs], results)
+        else:
+            print("No executables found to test.")
 
+        print("\n--- Benchmark Completed ---")
+
+    @staticmethod
+    def _dynamic_task_name(tool, exe_path: str) -> str:
+        # by executable name: a variant's executable shares the task of the main build's one
+        return f"dynamic:{tool.__class__.__name__}:{os.path.basename(exe_path)}"
+
+    @staticmethod
+    def _task_outcome(outcome: Tuple[Any, Optional[str], str]) -> Tuple[Optional[Dict[str, Any]], Optional[str], str]:
+        """Turns a TaskGraph outcome of a dynamic job back into (result, error, log)."""
+        job_outcome, error, _ = outcome
+        return job_outcome if error is None else (None, error, "")
+
+    def _run_static_phase(self, files_data: List[Dict]):
+        """
+        Runs every static tool on every file. In project mode, tools that support it
+        analyze all files listed in compile_commands.json in one invocation;
+        everything else runs per file, serially or on the process pool.
+        """
+        if self.progress is not None:
+            self.progress.add_total(len(files_data) * len(self.static_tools))
+        self._dependencies = {}     # files may have changed since the last phase (watch mode)
+        self._scan_dependencies(files_data)
         try:
-            result = tool.run(path)
-            print("DONE.")
-            
-            found_bugs = result["bugs"] if isinstance(result, dict) and "bugs" in result else []
-            self._verify_result(name, tool_name, found_bugs, expected_bugs)
-                    
-        except Exception as e:
-            print(f"FAILED.")
-            print(f"Error: {e}")
+            self._run_static_tools(files_data)
+        finally:
+            if self.preprocess_cache is not None:
+                self.preprocess_cache.evict()
 
-    # compare expected results with the ones found
-    def _verify_result(self, filename: str, tool_name: str, found_bugs: List[Dict], expected_bugs: List[Dict]):
-        print(f"[Verification - {tool_name}]")
-        
-        if not expected_bugs and found_bugs:
-            print(f"Found {len(found_bugs)} bugs (No verification data).")
-            print("[Findings]:")
-            for bug in found_bugs:
-                print(f" - {bug.get('message')}")
+    def _run_static_tools(self, files_data: List[Dict]):
+        project_tools = [tool for tool in self.static_tools if tool.supports_project]
+        compile_entries = self._load_compile_commands() if self.project_mode and project_tools else {}
+        if not compile_entries:
+            self._run_static_files(files_data, self.static_tools)
+            return
+
+        in_project = [info for info in files_data if os.path.realpath(info["path"]) in compile_entries]
+        outside_project = [info for info in files_data if os.path.realpath(info["path"]) not in compile_entries]
+        other_tools = [tool for tool in self.static_tools if not tool.supports_project]
+
+        self._run_static_project(in_project, project_tools, compile_entries)
+        if other_tools:
+            self._run_static_files(in_project, other_tools)
+        self._run_static_files(outside_project, self.static_tools)
+
+    def _load_compile_commands(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Configures the project and returns its compile_commands.json as {real file path: entry}.
+        Returns {} (per-file mode) if the project cannot be configured.
+        """
+        if not self.incremental and not self.builder.configured:
+            self.builder.clean_build()
+        if not self.builder.configured and not self.builder.configure():
+            print("Falling back to per-file analysis.")
+            return {}
+
+        try:
+            with open(self.builder.compile_commands_path, 'r') as f:
+                entries = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Cannot read compile_commands.json ({e}), falling back to per-file analysis.")
+            return {}
+
+        return {os.path.realpath(os.path.join(entry.get("directory", ""), entry["file"])): entry
+                for entry in entries}
+
+    def _run_static_project(self, files_data: List[Dict], tools: List, compile_entries: Dict[str, Dict[str, Any]]):
+        """
+        Runs each tool once over all (uncached) files, then reports per file in file order.
+        """
+        outcomes = {}
+        for tool_index, tool in enumerate(tools):
+            pending = []
+            for file_info in files_data:
+                resumed = self._resumed_result(tool.__class__.__name__, file_info["filename"])
+                if resumed is not None:
+                    outcomes[(tool_index, file_info["path"])] = (resumed, None, "resumed")
+                    continue
+                entry = compile_entries[os.path.realpath(file_info["path"])]
+                compile_command = entry.get("arguments") or entry.get("command")
+                key, cached = self._lookup_cache(tool, file_info["path"], extra=compile_command)
+                if cached is not None:
+                    outcomes[(tool_index, file_info["path"])] = (cached, None, "cached")
+                else:
+                    pending.append((file_info, key))
+
+            if not pending:
+                continue
+
+            try:
+                with profiler.span("tool", tool.__class__.__name__, self.builder.compile_commands_path):
+                    results = tool.run_project(self.builder.compile_commands_path,
+                                               [file_info["path"] for file_info, _ in pending], jobs=self.workers)
+                error = None
+            except Exception as e:
+                results, error = {}, str(e)
+
+            for file_info, key in pending:
+                result = results.get(file_info["path"])
+                self._store_cache(key, result, error)
+                outcomes[(tool_index, file_info["path"])] = (result, error, "")
+
+        reported_headers = [set() for _ in tools]
+        for file_info in files_data:
+            print(f"\n[File]: {file_info['filename']}")
+            for tool_index, tool in enumerate(tools):
+                tool_name = tool.__class__.__name__
+                print(f"Running {tool_name} ...", end=" ", flush=True)
+                result, error, source = outcomes[(tool_index, file_info["path"])]
+                result = self._without_repeated_headers(result, reported_headers[tool_index])
+                self._report_tool_result(tool_name, file_info["filename"], result, error, [file_info["filename"]],
+                                         cached=source == "cached", resumed=source == "resumed")
+
+    @staticmethod
+    def _without_repeated_headers(result: Optional[Dict[str, Any]], reported: set) -> Optional[Dict[str, Any]]:
+        """
+        Drops the findings in a header (bugs with a "header" path) that were already reported
+        for an earlier file. Cached and fresh results hold all their header findings, so the
+        dedup is the same whichever of the files were analyzed again.
+        """
+        if not isinstance(result, dict) or not result.get("bugs"):
+            return result
+        bugs = []
+        for bug in result["bugs"]:
+            header = bug.get("header")
+            if header is not None:
+                key = (header, bug.get("line"), bug.get("type"))
+                if key in reported:
+                    continue
+                reported.add(key)
+            bugs.append(bug)
+        if len(bugs) == len(result["bugs"]):
+            return result
+        return dict(result, bugs=bugs)
+
+    def _run_static_files(self, files_data: List[Dict], tools: List):
+        """Runs the tools on every file separately, serially or on the process pool."""
+        if not files_data or not tools:
+            return
+        if self.workers > 1:
+            self._run_static_parallel(files_data, tools)
+            return
+
+        for file_info in files_data:
+            file_path = file_info["path"]
+            filename = file_info["filename"]
+
+            print(f"\n[File]: {filename}")
+            for tool in tools:
+                tool_name = tool.__class__.__name__
+                print(f"Running {tool_name} ...", end=" ", flush=True)
+
+                resumed = self._resumed_result(tool_name, filename)
+                if resumed is not None:
+                    self._report_tool_result(tool_name, filename, resumed, None, [filename], resumed=True)
+                    continue
+
+                key, result = self._lookup_cache(tool, file_path)
+                if result is not None:
+                    self._report_tool_result(tool_name, filename, result, None, [filename], cached=True)
+                    continue
+
+                result, error = execute_tool(tool, file_path)
+                self._store_cache(key, result, error)
+                self._report_tool_result(tool_name, filename, result, error, [filename])
+
+    def _run_static_parallel(self, files_data: List[Dict], tools: List):
+        """
+        Spreads every (file, tool) pair over a process pool.
+        Results are reported in submission order, so the output matches a serial run.
+        """
+        print(f"Using {self.workers} workers.")
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            tasks = []
+            for file_info in files_data:
+                jobs = []
+                for tool in tools:
+                    # resumed results and cache hits never reach the pool
+                    resumed = self._resumed_result(tool.__class__.__name__, file_info["filename"])
+                    key, cached = self._lookup_cache(tool, file_info["path"]) if resumed is None else (None, None)
+                    future = None
+                    if resumed is None and cached is None:
+                        future = pool.submit(execute_tool_in_worker, tool, file_info["path"])
+                    jobs.append((tool, key, cached, resumed, future))
+                tasks.append((file_info, jobs))
+
+            for file_info, jobs in tasks:
+                print(f"\n[File]: {file_info['filename']}")
+                for tool, key, cached, resumed, future in jobs:
+                    tool_name = tool.__class__.__name__
+                    print(f"Running {tool_name} ...", end=" ", flush=True)
+                    if resumed is not None:
+                        self._report_tool_result(tool_name, file_info["filename"], resumed, None,
+                                                 [file_info["filename"]], resumed=True)
+                        continue
+                    if cached is not None:
+                        self._report_tool_result(tool_name, file_info["filename"], cached, None,
+                                                 [file_info["filename"]], cached=True)
+                        continue
+
+                    try:
+                        result, error, log = future.result()
+                    except Exception as e:
+                        # the worker itself died (or the task could not be pickled)
+                        result, error, log = None, str(e), ""
+                    print(log, end="")
+                    self._store_cache(key, result, error)
+                    self._report_tool_result(tool_name, file_info["filename"], result, error,
+                                             [file_info["filename"]])
+
+    def _run_dynamic_phase(self, executables: List[str], variant_executables: Optional[Dict[str, Dict[str, str]]] = None):
+        """
+        Runs every dynamic tool on every executable through the DynamicScheduler.
+        Results are reported in executable order, whatever order the jobs finish in.
+        variant_executables holds the executables of the build variants ({variant: {name: path}}).
+        """
+        jobs = self._dynamic_jobs(executables, variant_executables or {})
+        pending = [(tool, exe_path, run_path) for tool, exe_path, run_path in jobs
+                   if not self._dynamic_resumed(tool, exe_path)]
+        runnable = [(tool, run_path) for tool, _, run_path in pending if run_path is not None]
+        finished = iter(self.dynamic_scheduler.run(runnable))
+        outcomes = (next(finished) if run_path is not None else self._missing_variant_outcome(tool, exe_path)
+                    for tool, exe_path, run_path in pending)
+        self._report_dynamic_results([(tool, exe_path) for tool, exe_path, _ in jobs], outcomes)
+
+    def _dynamic_resumed(self, tool, exe_path: str) -> bool:
+        return self._resumed_result(tool.__class__.__name__, os.path.basename(exe_path)) is not None
+
+    def _report_dynamic_results(self, jobs: List[Tuple[Any, str]], outcomes):
+        """
+        Reports (result, error, log) outcomes of (tool, executable) jobs, grouped by executable.
+        Jobs resumed from the checkpoint have no outcome; their journaled result is reported.
+        """
+        if self.dynamic_scheduler.concurrency > 1:
+            print(f"Running up to {self.dynamic_scheduler.concurrency} jobs at once.")
+        if self.progress is not None:
+            self.progress.add_total(len(jobs))
+
+        # the File API knows the real sources of every target; the regex is the fallback
+        target_sources = self.builder.target_sources()
+        if target_sources is None:
+            target_sources = self._parse_cmake_targets()
+        outcomes = iter(outcomes)
+        error_groups = ErrorGroups()
+        current_exe = None
+        for tool, exe_path in jobs:
+            exe_name = os.path.basename(exe_path)
+            if exe_path != current_exe:
+                current_exe = exe_path
+                print(f"\n[Executable]: {exe_name}")
+
+            tool_name = tool.__class__.__name__
+            print(f"Running {tool_name} ...", end=" ", flush=True)
+            resumed = self._resumed_result(tool_name, exe_name)
+            if resumed is not None:
+                self._report_tool_result(tool_name, exe_name, resumed, None, target_sources.get(exe_name, []),
+                                         resumed=True)
+                error_groups.add(exe_name, resumed.get("bugs", []))
+                continue
+            result, error, log = next(outcomes)
+            print(log, end="")
+            self._report_tool_result(tool_name, exe_name, result, error, target_sources.get(exe_name, []))
+            if error is None and isinstance(result, dict):
+                error_groups.add(exe_name, result.get("bugs", []))
+        self._report_error_groups(error_groups)
+
+    def _report_error_groups(self, error_groups: ErrorGroups):
+        """Prints valgrind's errors grouped by stack across the executables, and learns the noise suppressions."""
+        if not error_groups:
             return
+        print(f"\n=== Valgrind Error Groups ===")
+        print(error_groups.summary())
+        if self.suppressions is not None:
+            for group in error_groups.noise():
+                self.suppressions.add(group.suppression)
+            added = self.suppressions.save()
+            if added:
+                print(f"Learned {added} suppressions of third-party noise ({len(self.suppressions)} in "
+                      f"{os.path.relpath(self.suppressions.path, self.project_root)}); later runs skip them.")
 
-        expected_count = len(expected_bugs)
-        found_count = len(found_bugs) if found_bugs else 0
+    def _lookup_cache(self, tool, path: str, extra: Any = None) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Returns (cache key, cached result). The key is None when the result cannot be cached,
+        the result is None on a cache miss.
+        """
+        if self.cache is None:
+            return None, None
+        try:
+            key = self.cache.make_key(tool, path, extra, self._source_headers(path))
+        except OSError:
+            return None, None
+        if key is None:
+            return None, None
+        return key, self.cache.get(key)
+
+    def _scan_dependencies(self, files_data: List[Dict]):
+        """
+        Resolves the headers of every file on the process pool, before the cache lookups
+        (done in this process) need them. Files whose scan failed are scanned again on lookup.
+        """
+        if self.cache is None or self.preprocess_cache is None or self.workers <= 1 or len(files_data) < 2:
+            return
+        paths = list(dict.fromkeys(file_info["path"] for file_info in files_data))
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = [(path, pool.submit(self.preprocess_cache.dependencies, path)) for path in paths]
+            for path, future in futures:
+                try:
+                    self._dependencies[path] = future.result()
+                except Exception:
+                    continue
+
+    def _source_headers(self, path: str) -> Optional[Dict[str, str]]:
+        """The file's headers from the shared dependency scan (done once per file and static phase)."""
+        if self.preprocess_cache is None:
+            return None
+        if path not in self._dependencies:
+            self._dependencies[path] = self.preprocess_cache.dependencies(path)
+        dependencies = self._dependencies[path]
+        return dependencies.headers if dependencies is not None else None
+
+    @staticmethod
+    def _is_reusable(result: Optional[Dict[str, Any]]) -> bool:
+        """Results of tool runs that failed (type-less diagnostics) must be run again next time."""
+        return isinstance(result, dict) and not has_diagnostics(result.get("bugs", []))
+
+    def _store_cache(self, key: Optional[str], result: Optional[Dict[str, Any]], error: Optional[str]):
+        if key is not None and error is None and self._is_reusable(result):
+            self.cache.put(key, {name: value for name, value in result.items() if name != "profile"})
 
-        if found_count >= expected_count and expected_count > 0:
-             print(f"SUCCESS: Found {found_count} bugs (Expected: {expected_count})")
-        elif expected_count == 0 and found_count == 0:
-             print(f"SUCCESS: Clean file (as expected).")
+    def _report_tool_result(self, tool_name: str, name: str, result: Optional[Dict[str, Any]],
+                            error: Optional[str], files: List[str], cached: bool = False, resumed: bool = False):
+        """
+        Prints the outcome of one tool run on target name and verifies it
+        against the expected bugs of files (the sources the target covers).
+        Successful results are checkpointed, so a resumed run does not repeat them.
+        """
+        if isinstance(result, dict):
+            # profile records of runs in pool workers
+            self.run_profile.extend(result.pop("profile", []))
+        if self.progress is not None:
+            self.progress.advance(f"{tool_name} {name}")
+
+        if error is not None:
+            print(f"FAILED.")
+            print(f"Error: {error}")
+            return
+
+        if resumed:
+            print("DONE (resumed).")
         else:
-            print(f"MISMATCH: Found {found_count} bugs but expected {expected_count}.")
-            if found_count > 0:
-                 print("[Actual Findings]:")
-                 for bug in found_bugs:
-                     line = bug.get('line', '?')
-                     message = bug.get('message', 'No message')
-                     severity = bug.get('severity', '?')
-                     print(f" - Line {line} [{severity}]: {message}")
\ No newline at end of file
+            print("DONE (cached)." if cached else "DONE.")
+            if self.journal is not None and self._is_reusable(result):
+                self.journal.record(tool_name, name, result)
+        found_bugs = result["bugs"] if isinstance(result, dict) and "bugs" in result else []
+        self._verify_result(name, tool_name, found_bugs, files)
+
+    # compare expected results with the ones found
+    def _verify_result(self, target: str, tool_name: str, found_bugs: List[Dict], files: List[str]) -> TargetResult:
+        result = self.matcher.match(tool_name, target, files, found_bugs)
+        self.verification.add(result)
+
+        total = result.total
+        print(f"[Verification - {tool_name}] TP: {total.tp}, FP: {total.fp}, FN: {total.fn}")
+        for note in result.notes:
+            print(f"Note: {note.get('message')}")
+        return result
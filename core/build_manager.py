@@ -1,17 +1,63 @@
+import glob
+import json
 import os
+import re
 import subprocess
 import shutil
-from typing import List
+from collections import deque
+from typing import Callable, Dict, Any, List, Optional
+from core import profiler
+
+# progress lines that mean a target is complete: Makefiles / Ninja. Make prints its
+# "[ 50%] Linking ..." line before linking (the old binary is still there), so only
+# "Built target" counts; ninja prints "[3/4] Linking ..." when the link step finished
+# (when its output is not a terminal).
+TARGET_BUILT_PATTERNS = [
+    re.compile(r"Built target (\S+)"),
+    re.compile(r"^\[\d+/\d+\] Linking \w+ executable (\S+)"),
+]
+
+# CMake File API client name: the codemodel reply describes every target of the build
+FILE_API_CLIENT = "client-cpp-analysis-benchmark"
+
+# cache entry with the compile_flags a tree was configured with (CMAKE_CXX_FLAGS also holds $CXXFLAGS)
+FLAGS_CACHE_ENTRY = "BENCHMARK_COMPILE_FLAGS"
 
 class BuildManager:
     """
     Responsible for compiling the C++ project using CMake.
     """
-    def __init__(self, src_path: str, build_dir_name: str = "build"):
+    def __init__(self, src_path: str, build_dir_name: str = "build", jobs: Optional[int] = None,
+                 generator: Optional[str] = None, use_ccache: bool = False,
+                 compile_flags: Optional[List[str]] = None):
+        """
+        jobs: parallel build jobs (0 = one per CPU, None = the generator's default).
+        generator: CMake generator, e.g. "Ninja" (None = CMake's default).
+        use_ccache: compile through ccache when it is installed.
+        compile_flags: extra compiler and linker flags (e.g. sanitizer instrumentation).
+        """
         self.src_path = src_path
         # Build folder will be inside the main project folder.
         self.project_root = os.path.dirname(src_path) 
+        self.build_dir_name = build_dir_name
         self.build_path = os.path.join(self.project_root, build_dir_name)
+        self.jobs = jobs
+        self.generator = generator
+        self.use_ccache = use_ccache
+        self.compile_flags = compile_flags or []
+        self.configured = False     # configured during this run
+        self.compile_commands_path = os.path.join(self.build_path, "compile_commands.json")
+        self.file_api_path = os.path.join(self.build_path, ".cmake", "api", "v1")
+        self._targets = None        # executable targets read from the File API reply
+
+    def variant(self, name: str, compile_flags: List[str]) -> "BuildManager":
+        """
+        Returns a BuildManager for an instrumented build of the same project
+        in its own directory (<build dir>-<name>), so both builds can coexist.
+        """
+        return BuildManager(self.src_path, f"{self.build_dir_name}-{name}", jobs=self.jobs,
+                            generator=self.generator, use_ccache=self.use_ccache,
+                            compile_flags=self.compile_flags + compile_flags)
 
     def clean_build(self):
         """
@@ -20,34 +66,135 @@ class BuildManager:
         if os.path.exists(self.build_path):
             print(f"Cleaning old build directory: {self.build_path}")
             shutil.rmtree(self.build_path)
+        self.configured = False
+        self._targets = None
 
-    def run_build(self) -> bool:
+    def _read_cmake_cache(self) -> dict:
         """
-        Runs the CMake build process.
+        Returns the entries of an existing CMakeCache.txt as {name: value}.
         """
-        print("\n--- Starting Build Process ---")
-        
-        # create new folder
-        os.makedirs(self.build_path, exist_ok=True)
+        cache_path = os.path.join(self.build_path, "CMakeCache.txt")
+        entries = {}
+        if not os.path.exists(cache_path):
+            return entries
+
+        with open(cache_path, 'r', errors='ignore') as f:
+            for line in f:
+                if line.startswith(("#", "//")) or "=" not in line:
+                    continue
+                name_type, value = line.rstrip("\n").split("=", 1)
+                entries[name_type.split(":", 1)[0]] = value
+        return entries
+
+    def _can_reuse_build_tree(self) -> bool:
+        """
+        An existing build tree can only be reused if it was configured
+        from the same source folder with the same generator.
+        """
+        cache = self._read_cmake_cache()
+        if not cache:
+            return True
+
+        same_source = os.path.realpath(cache.get("CMAKE_HOME_DIRECTORY", "")) == os.path.realpath(self.src_path)
+        same_generator = self._resolve_generator() in (None, cache.get("CMAKE_GENERATOR"))
+        same_flags = cache.get(FLAGS_CACHE_ENTRY, "") == " ".join(self.compile_flags)
+        return same_source and same_generator and same_flags
+
+    def _resolve_generator(self) -> Optional[str]:
+        if self.generator == "Ninja" and shutil.which("ninja") is None:
+            print("Warning: ninja not found, using CMake's default generator.")
+            self.generator = None
+        return self.generator
+
+    def _configure_command(self) -> List[str]:
+        # compile_commands.json lets analyzers see the real include paths and defines
+        command = ["cmake", "-S", self.src_path, "-B", self.build_path, "-DCMAKE_EXPORT_COMPILE_COMMANDS=ON"]
+
+        generator = self._resolve_generator()
+        if generator:
+            command += ["-G", generator]
+
+        if self.use_ccache and shutil.which("ccache"):
+            command += ["-DCMAKE_C_COMPILER_LAUNCHER=ccache", "-DCMAKE_CXX_COMPILER_LAUNCHER=ccache"]
+        else:
+            if self.use_ccache:
+                print("Warning: ccache not found, compiling without it.")
+            # a reused build tree keeps its cached launcher otherwise
+            command += ["-UCMAKE_C_COMPILER_LAUNCHER", "-UCMAKE_CXX_COMPILER_LAUNCHER"]
+
+        flags = " ".join(self.compile_flags)
+        command.append(f"-D{FLAGS_CACHE_ENTRY}:STRING={flags}")
+        if self.compile_flags:
+            command += [f"-DCMAKE_C_FLAGS={flags}", f"-DCMAKE_CXX_FLAGS={flags}", f"-DCMAKE_EXE_LINKER_FLAGS={flags}"]
+        return command
+
+    def _build_command(self) -> List[str]:
+        command = ["cmake", "--build", self.build_path]
+        if self.jobs is not None:
+            command += ["--parallel", str(self.jobs or os.cpu_count() or 1)]
+        return command
+
+    def configure(self) -> bool:
+        """
+        Runs the CMake configure step (also writes compile_commands.json).
+        An existing build tree is kept when it can be reused.
+        """
+        if not self._can_reuse_build_tree():
+            print("Existing build tree belongs to another source folder, generator or flag set.")
+            self.clean_build()
+
+        # create new folder, with the File API query CMake answers while configuring
+        query_path = os.path.join(self.file_api_path, "query", FILE_API_CLIENT)
+        os.makedirs(query_path, exist_ok=True)
+        open(os.path.join(query_path, "codemodel-v2"), "w").close()
+        self._targets = None
 
         try:
             # run CMake configuration
             print("Configuring project with CMake...")
-            subprocess.run(
-                ["cmake", "-S", self.src_path, "-B", self.build_path], 
-                check=True, 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE
-            )
+            with profiler.span("build", "configure", self.src_path):
+                profiler.run_process(
+                    self._configure_command(),
+                    check=True, 
+                    stdout=subprocess.PIPE, 
+                    stderr=subprocess.PIPE
+                )
+        except subprocess.CalledProcessError as e:
+            print(f"Configuration Failed!")
+            if e.stderr:
+                print(f"Error details:\n{e.stderr.decode()}")
+            return False
+
+        self.configured = True
+        return True
+
+    def run_build(self, on_target_built: Optional[Callable[[str, str], None]] = None) -> bool:
+        """
+        Runs the CMake build process.
+        An existing build tree is reused, so only changed sources are recompiled
+        (call clean_build() first for a full rebuild).
+        on_target_built(target, executable_path) is called as soon as an executable is linked,
+        while the rest of the project is still building.
+        """
+        print("\n--- Starting Build Process ---")
+
+        if not self.configured and not self.configure():
+            return False
 
+        if on_target_built is not None:
+            with profiler.span("build", "compile", self.build_path):
+                return self._run_streaming_build(on_target_built)
+
+        try:
             # compile
             print("Compiling project...")
-            subprocess.run(
-                ["cmake", "--build", self.build_path], 
-                check=True, 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE
-            )
+            with profiler.span("build", "compile", self.build_path):
+                profiler.run_process(
+                    self._build_command(),
+                    check=True, 
+                    stdout=subprocess.PIPE, 
+                    stderr=subprocess.PIPE
+                )
             
             print("Build completed successfully!")
             return True
@@ -58,7 +205,134 @@ class BuildManager:
                 print(f"Error details:\n{e.stderr.decode()}")
             return False
 
+    def _run_streaming_build(self, on_target_built: Callable[[str, str], None]) -> bool:
+        """
+        Compiles while reading the build output line by line, to report linked targets early.
+        """
+        print("Compiling project...")
+        # only the tail of the output is kept for the error report
+        tail = deque(maxlen=200)
+        reported = set()
+        try:
+            process = profiler.MeasuredPopen(
+                self._build_command(),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                errors='ignore'
+            )
+        except FileNotFoundError as e:
+            print(f"Build Failed!\nError details:\n{e}")
+            return False
+
+        with process.stdout:
+            for line in process.stdout:
+                tail.append(line)
+                for pattern in TARGET_BUILT_PATTERNS:
+                    match = pattern.search(line)
+                    if not match:
+                        continue
+                    executable = self._find_executable(match.group(1))
+                    if executable and executable not in reported:
+                        reported.add(executable)
+                        on_target_built(match.group(1), executable)
+                    break
+
+        returncode = process.wait()
+        profiler.note_process(process.rusage)
+        if returncode != 0:
+            print(f"Build Failed!")
+            print(f"Error details:\n{''.join(tail)}")
+            return False
+
+        print("Build completed successfully!")
+        return True
+
+    def get_targets(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Returns the EXECUTABLE targets of the last configure step, read from the
+        CMake File API codemodel reply: [{"name", "executable", "sources"}], with the
+        artifact as an absolute path and the sources relative to the source folder.
+        Returns None when there is no reply (tree not configured by this class, or CMake < 3.14).
+        """
+        if self._targets is None:
+            self._targets = self._read_codemodel()
+        return self._targets
+
+    def _read_codemodel(self) -> Optional[List[Dict[str, Any]]]:
+        reply_path = os.path.join(self.file_api_path, "reply")
+        # a newer reply gets a later index name
+        indexes = sorted(glob.glob(os.path.join(reply_path, "index-*.json")))
+        if not indexes:
+            return None
+
+        try:
+            with open(indexes[-1], "r") as f:
+                index = json.load(f)
+            codemodel_file = index["reply"][FILE_API_CLIENT]["codemodel-v2"]["jsonFile"]
+            with open(os.path.join(reply_path, codemodel_file), "r") as f:
+                codemodel = json.load(f)
+
+            targets = []
+            source_root = codemodel["paths"]["source"]
+            # single-config generators have exactly one configuration
+            for entry in codemodel["configurations"][0]["targets"]:
+                with open(os.path.join(reply_path, entry["jsonFile"]), "r") as f:
+                    target = json.load(f)
+                if target["type"] != "EXECUTABLE" or not target.get("artifacts"):
+                    continue
+                targets.append({
+                    "name": target["name"],
+                    "executable": os.path.join(self.build_path, target["artifacts"][0]["path"]),
+                    "sources": [self._source_name(source["path"], source_root)
+                                for source in target.get("sources", []) if not source.get("isGenerated")],
+                })
+        except (OSError, KeyError, IndexError, ValueError) as e:
+            print(f"Warning: could not read the CMake File API reply ({e}).")
+            return None
+        return targets
+
+    @staticmethod
+    def _source_name(path: str, source_root: str) -> str:
+        if os.path.isabs(path):
+            return os.path.relpath(path, source_root)
+        return path
+
+    def target_sources(self) -> Optional[Dict[str, List[str]]]:
+        """Returns {executable name: source files} of the executable targets, or None without a File API reply."""
+        targets = self.get_targets()
+        if targets is None:
+            return None
+        return {os.path.basename(target["executable"]): target["sources"] for target in targets}
+
+    def _find_executable(self, target: str) -> Optional[str]:
+        """
+        Returns the executable of a target name (Makefiles) or build-relative artifact path (Ninja),
+        or None if the target is not an executable.
+        """
+        for known in self.get_targets() or []:
+            if target in (known["name"], os.path.relpath(known["executable"], self.build_path)):
+                return known["executable"] if os.path.isfile(known["executable"]) else None
+
+        candidate = os.path.join(self.build_path, target)
+        if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+            return candidate
+        for executable in self.get_executables():
+            if os.path.basename(executable) == os.path.basename(target):
+                return executable
+        return None
+
     def get_executables(self) -> List[str]:
+        """
+        Returns the built executables: the artifacts of the EXECUTABLE targets
+        in the File API reply, or a scan of the build directory without one.
+        """
+        targets = self.get_targets()
+        if targets is None:
+            return self._scan_executables()
+        return [target["executable"] for target in targets if os.path.isfile(target["executable"])]
+
+    def _scan_executables(self) -> List[str]:
         """
         Scans the build directory and prints everything it finds (Debug Mode).
         """
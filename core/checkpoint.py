@@ -0,0 +1,71 @@
+import json
+import os
+from typing import Dict, Any, Optional
+from core.findings import json_default
+
+
+class RunJournal:
+    """
+    Append-only checkpoint of a benchmark run: one JSON line per finished (tool, target)
+    result. Every line is written with a single O_APPEND write and fsync'ed, so a crash
+    loses at most the line being written, which is skipped when the journal is read back.
+
+    resume=True keeps the results of an interrupted run with the same identity
+    (e.g. source folder and shard); otherwise the journal starts empty.
+    """
+    def __init__(self, path: str, identity: Dict[str, Any], resume: bool = False):
+        self.path = path
+        self.identity = identity
+        self._results = {}      # (tool, target) -> result, of the interrupted run
+
+        if resume and os.path.exists(path):
+            self._load()
+        else:
+            self._start()
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def _start(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "w") as f:
+            f.write(json.dumps({"identity": self.identity}) + "\n")
+
+    def _load(self):
+        with open(self.path, "r") as f:
+            content = f.read()
+        lines = content.splitlines()
+
+        try:
+            header = json.loads(lines[0]) if lines else {}
+        except ValueError:
+            header = {}
+        if header.get("identity") != self.identity:
+            print(f"Checkpoint {self.path} belongs to another run, starting from scratch.")
+            self._start()
+            return
+
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue        # torn write of the record in flight when the run died
+            self._results[(entry["tool"], entry["target"])] = entry["result"]
+        if not content.endswith("\n"):
+            # end the torn line, so the next record starts on a line of its own
+            with open(self.path, "a") as f:
+                f.write("\n")
+        print(f"Resuming: {len(self._results)} completed results in {self.path}")
+
+    def get(self, tool: str, target: str) -> Optional[Dict[str, Any]]:
+        """Result of (tool, target) from the interrupted run, or None if it has to run."""
+        return self._results.get((tool, target))
+
+    def record(self, tool: str, target: str, result: Dict[str, Any]):
+        line = json.dumps({"tool": tool, "target": target, "result": result}, default=json_default) + "\n"
+        os.write(self._fd, line.encode())
+        os.fsync(self._fd)
+
+    def close(self, completed: bool = False):
+        """Closes the journal; a completed run has nothing left to resume, so its journal is removed."""
+        os.close(self._fd)
+        if completed:
+            os.remove(self.path)
@@ -0,0 +1,113 @@
+import json
+import os
+import random
+from typing import Dict, Any, List, Optional
+
+# bug templates: lines of a function body ({n} = unique number); the line marked
+# with "// BUG" is the recorded line of the bug, the one the tools report
+BUG_TEMPLATES = {
+    # static tools report a leak where the pointer goes out of scope, dynamic ones where
+    # it was allocated: the block keeps both on one line
+    "memory_leak": [
+        "    {{ int* data_{n} = new int[8]; data_{n}[0] = {n}; sink += data_{n}[0]; }}  // BUG",
+    ],
+    "out_of_bounds": [
+        "    int* values_{n} = new int[8];",
+        "    values_{n}[8] = {n};  // BUG",
+        "    delete[] values_{n};",
+    ],
+    "uninitialized_variable": [
+        "    int value_{n};",
+        "    if (value_{n} > {n}) {{  // BUG",
+        "        sink += 1;",
+        "    }}",
+    ],
+    "mismatched_free": [
+        "    int* items_{n} = new int[4];",
+        "    items_{n}[0] = {n};",
+        "    sink += items_{n}[0];",
+        "    delete items_{n};  // BUG",
+    ],
+}
+
+SEVERITIES = {"uninitialized_variable": "warning"}
+
+
+class CorpusGenerator:
+    """
+    Writes a synthetic C++ project with known bugs: num_files source files, each with
+    bugs_per_file bugs of the classes in BUG_TEMPLATES at recorded lines, a
+    CMakeLists.txt with one executable per files_per_target files, and the
+    matching expected_results.json. The same seed always gives the same corpus.
+    """
+    def __init__(self, output_dir: str, num_files: int, bugs_per_file: int = 2, files_per_target: int = 10,
+                 seed: int = 0, bug_types: Optional[List[str]] = None):
+        self.output_dir = output_dir
+        self.num_files = num_files
+        self.bugs_per_file = bugs_per_file
+        self.files_per_target = max(1, files_per_target)
+        self.bug_types = bug_types or sorted(BUG_TEMPLATES)
+        self.random = random.Random(seed)
+
+    def generate(self) -> Dict[str, Any]:
+        """
+        Writes the corpus and returns its ground truth (the content of expected_results.json).
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        width = len(str(self.num_files))
+        names = [f"gen_{index:0{width}d}" for index in range(1, self.num_files + 1)]
+
+        ground_truth = {"files": []}
+        for name in names:
+            bugs = self._write_source(name)
+            ground_truth["files"].append({"filename": f"{name}.cpp", "bugs": bugs})
+
+        targets = []
+        for start in range(0, len(names), self.files_per_target):
+            group = names[start:start + self.files_per_target]
+            target = f"target_{start // self.files_per_target + 1:0{width}d}"
+            self._write_main(target, group)
+            targets.append((target, [f"{target}_main.cpp"] + [f"{name}.cpp" for name in group]))
+
+        self._write_cmake(targets)
+        with open(os.path.join(self.output_dir, "expected_results.json"), "w") as f:
+            json.dump(ground_truth, f, indent=2)
+        return ground_truth
+
+    def _write_source(self, name: str) -> List[Dict[str, Any]]:
+        """Writes one source file and returns its expected bugs."""
+        lines = [
+            f"// {name}.cpp - generated benchmark file, do not edit",
+            "",
+            f"int run_{name}() {{",
+            "    int sink = 0;",
+        ]
+        bugs = []
+        for number in range(1, self.bugs_per_file + 1):
+            bug_type = self.random.choice(self.bug_types)
+            for template_line in BUG_TEMPLATES[bug_type]:
+                lines.append(template_line.format(n=number))
+                if template_line.endswith("// BUG"):
+                    bugs.append({"line": len(lines), "type": bug_type,
+                                 "severity": SEVERITIES.get(bug_type, "error")})
+        lines += ["    return sink;", "}", ""]
+
+        with open(os.path.join(self.output_dir, f"{name}.cpp"), "w") as f:
+            f.write("\n".join(lines))
+        return bugs
+
+    def _write_main(self, target: str, names: List[str]):
+        lines = [f"// {target}_main.cpp - generated benchmark file, do not edit", "#include <iostream>", ""]
+        lines += [f"int run_{name}();" for name in names]
+        lines += ["", "int main() {", "    int total = 0;"]
+        lines += [f"    total += run_{name}();" for name in names]
+        lines += ["    std::cout << total << std::endl;", "    return 0;", "}", ""]
+        with open(os.path.join(self.output_dir, f"{target}_main.cpp"), "w") as f:
+            f.write("\n".join(lines))
+
+    def _write_cmake(self, targets: List[Any]):
+        lines = ["cmake_minimum_required(VERSION 3.10)", "project(GeneratedBenchmarkCorpus)", ""]
+        for target, sources in targets:
+            lines.append(f"add_executable({target} {' '.join(sources)})")
+        with open(os.path.join(self.output_dir, "CMakeLists.txt"), "w") as f:
+            f.write("\n".join(lines) + "\n")
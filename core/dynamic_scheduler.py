@@ -0,0 +1,144 @@
+import os
+import resource
+import shutil
+import tempfile
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from core.tool_runner import execute_tool_in_worker
+
+# no adaptive timeout is shorter than this: valgrind alone needs about a second to start
+MIN_TIMEOUT = 5.0
+
+
+class ResourceLimits:
+    """
+    Per-process limits applied to every dynamic analysis job (CPU seconds and address space).
+    """
+    def __init__(self, cpu_seconds: Optional[int] = None, memory_bytes: Optional[int] = None):
+        self.cpu_seconds = cpu_seconds
+        self.memory_bytes = memory_bytes
+
+    def apply(self):
+        """
+        Used as preexec_fn: runs in the forked child right before exec,
+        so it only makes setrlimit calls.
+        """
+        if self.cpu_seconds:
+            resource.setrlimit(resource.RLIMIT_CPU, (self.cpu_seconds, self.cpu_seconds))
+        if self.memory_bytes:
+            resource.setrlimit(resource.RLIMIT_AS, (self.memory_bytes, self.memory_bytes))
+
+
+def adaptive_timeouts(runtimes: Dict[Tuple[str, str], float], tools: List[Any], factor: float,
+                      minimum: float = MIN_TIMEOUT) -> Dict[Tuple[str, str], float]:
+    """
+    Per-job timeouts {(tool name, executable name): seconds} from the recorded runtimes of
+    the same jobs: factor times the tool's own runtime on the executable or, if it has none,
+    another tool's runtime scaled by the two tools' slowdown over the uninstrumented program.
+    Jobs without any history keep the tool's fixed timeout.
+    """
+    slowdowns = {tool.__class__.__name__: tool.slowdown for tool in tools}
+    native = {}
+    for (tool_name, target), seconds in runtimes.items():
+        if tool_name in slowdowns:
+            native[target] = max(native.get(target, 0.0), seconds / slowdowns[tool_name])
+
+    timeouts = {}
+    for target, native_seconds in native.items():
+        for tool_name, slowdown in slowdowns.items():
+            expected = runtimes.get((tool_name, target), native_seconds * slowdown)
+            timeouts[(tool_name, target)] = max(minimum, expected * factor)
+    return timeouts
+
+
+def _run_isolated_job(tool, path: str, limits: Optional[ResourceLimits],
+                      **run_options) -> Tuple[Optional[Dict[str, Any]], Optional[str], str]:
+    """
+    Pool worker entry point: runs the tool inside a private, temporary working directory
+    (files the program writes cannot collide with other jobs) and removes it afterwards.
+    """
+    work_dir = tempfile.mkdtemp(prefix=f"{os.path.basename(path)}-")
+    try:
+        return execute_tool_in_worker(tool, path, cwd=work_dir, limits=limits, **run_options)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+class DynamicScheduler:
+    """
+    Runs dynamic analysis jobs ((tool, executable) pairs) concurrently.
+    Every job gets its own working directory and the cpu_seconds / memory_bytes
+    rlimits. The number of simultaneous jobs is bounded by max_jobs and by
+    memory_budget // memory_bytes, so the jobs together never use more
+    than memory_budget bytes. Without a per-job memory limit, the budget is
+    split evenly between max_jobs jobs.
+
+    timeouts ({(tool name, executable name): seconds}, see adaptive_timeouts) override
+    the tools' fixed timeouts; with fast_fail, tools stop a program at its first definite
+    error, for runs where only pass/fail matters.
+    """
+    def __init__(self, max_jobs: int = 1, cpu_seconds: Optional[int] = None,
+                 memory_bytes: Optional[int] = None, memory_budget: Optional[int] = None,
+                 timeout_factor: float = 3.0, fast_fail: bool = False):
+        self.max_jobs = max(1, max_jobs)
+        self.limits = ResourceLimits(cpu_seconds, memory_bytes)
+        self.memory_budget = memory_budget
+        self.timeout_factor = timeout_factor
+        self.fast_fail = fast_fail
+        self.timeouts = {}
+        if self.memory_budget and not self.limits.memory_bytes:
+            self.limits.memory_bytes = self.memory_budget // self.max_jobs
+        self._pool = None
+
+    @property
+    def concurrency(self) -> int:
+        if self.memory_budget and self.limits.memory_bytes:
+            return max(1, min(self.max_jobs, self.memory_budget // self.limits.memory_bytes))
+        return self.max_jobs
+
+    def __enter__(self):
+        # every worker process runs one job at a time, which keeps preexec_fn safe
+        self._pool = ProcessPoolExecutor(max_workers=self.concurrency)
+        return self
+
+    def __exit__(self, *exc_info):
+        self._pool.shutdown()
+        self._pool = None
+
+    def submit(self, tool, path: str) -> Future:
+        """
+        Starts one job; the future resolves to (result, error, log).
+        Only valid inside a `with scheduler:` block.
+        """
+        return self._pool.submit(_run_isolated_job, tool, path, self.limits, **self._run_options(tool, path))
+
+    def _run_options(self, tool, path: str) -> Dict[str, Any]:
+        # only passed when set, so tools without timeout/fast_fail support keep working
+        run_options = {}
+        timeout = self.timeouts.get((tool.__class__.__name__, os.path.basename(path)))
+        if timeout is not None:
+            run_options["timeout"] = timeout
+        if self.fast_fail:
+            run_options["fast_fail"] = True
+        return run_options
+
+    def run(self, jobs: List[Tuple[Any, str]]) -> Iterator[Tuple[Optional[Dict[str, Any]], Optional[str], str]]:
+        """
+        Yields (result, error, log) for every (tool, path) job, in the order of jobs.
+        A failing job only affects its own result.
+        """
+        if not jobs:
+            return
+
+        with self:
+            futures = [self.submit(tool, path) for tool, path in jobs]
+            for future in futures:
+                yield self.outcome(future)
+
+    @staticmethod
+    def outcome(future: Future) -> Tuple[Optional[Dict[str, Any]], Optional[str], str]:
+        try:
+            return future.result()
+        except Exception as e:
+            # the worker itself died (or the job could not be pickled)
+            return None, str(e), ""
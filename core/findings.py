@@ -0,0 +1,165 @@
+import sys
+from array import array
+from collections import defaultdict
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+"""
+Compact container for the findings of a tool run. A finding used to be a dict of its own
+(several hundred bytes each); here every field is a column, and the often repeated
+strings (severity, type, file) are interned, so all findings share one copy of each.
+"""
+
+COLUMNS = ("message", "severity", "line", "file", "type")
+
+# message of the diagnostic a dynamic tool reports when it killed a program that ran too long
+TIMED_OUT = "Execution timed out"
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _compact(value: Any) -> Any:
+    """Extras are interned too; lists of strings (e.g. stack frames) become tuples of shared strings."""
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return tuple(sys.intern(item) for item in value)
+    return _intern(value)
+
+
+class Finding:
+    """
+    One finding of a Findings container, read like the bug dict it replaces
+    (finding["line"], finding.get("file"), "type" in finding ...). It holds no data itself.
+    """
+    __slots__ = ("_findings", "_index")
+
+    def __init__(self, findings: "Findings", index: int):
+        self._findings = findings
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        findings = self._findings
+        if key in findings._columns:
+            value = findings._columns[key][self._index]
+            if value is None:
+                raise KeyError(key)
+            return value
+        return findings._extra.get(self._index, {})[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def keys(self) -> List[str]:
+        findings = self._findings
+        keys = [name for name in COLUMNS if findings._columns[name][self._index] is not None]
+        return keys + list(findings._extra.get(self._index, {}))
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(key, self[key]) for key in self.keys()]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: list(value) if isinstance(value, tuple) else value for key, value in self.items()}
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Finding):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __repr__(self) -> str:
+        return f"Finding({self.to_dict()!r})"
+
+
+class Findings:
+    """
+    Column store of findings: one list per field of COLUMNS (the line numbers in an array),
+    plus a sparse dict for tool specific extras (e.g. valgrind's stack). Findings without
+    a type are tool diagnostics ("not installed" ...), as with the bug dicts.
+
+    Iterating yields Finding records; group_indices works on the columns without creating
+    records (as the MatchEngine groups them).
+    """
+    __slots__ = ("_columns", "_extra")
+
+    def __init__(self, bugs: Iterable[Dict[str, Any]] = ()):
+        self._columns = {"message": [], "severity": [], "line": array("l"), "file": [], "type": []}
+        self._extra: Dict[int, Dict[str, Any]] = {}
+        self.extend(bugs)
+
+    def append(self, bug: Dict[str, Any]):
+        columns = self._columns
+        extra = {sys.intern(key): _compact(value) for key, value in bug.items() if key not in columns}
+        if extra:
+            self._extra[len(self)] = extra
+        columns["message"].append(bug.get("message"))
+        columns["severity"].append(_intern(bug.get("severity")))
+        columns["line"].append(int(bug.get("line") or 0))
+        columns["file"].append(_intern(bug.get("file")))
+        columns["type"].append(_intern(bug.get("type")))
+
+    def extend(self, bugs: Iterable[Dict[str, Any]]):
+        for bug in bugs:
+            self.append(bug)
+
+    def __len__(self) -> int:
+        return len(self._columns["line"])
+
+    def __getitem__(self, index: int) -> Finding:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return Finding(self, index)
+
+    def __iter__(self) -> Iterator[Finding]:
+        return (Finding(self, index) for index in range(len(self)))
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Findings):
+            other = other.to_dicts()
+        return self.to_dicts() == other
+
+    def __repr__(self) -> str:
+        return f"Findings({len(self)} findings)"
+
+    def column(self, name: str):
+        """The column itself (not a copy)."""
+        return self._columns[name]
+
+    def group_indices(self, *names: str) -> Dict[Tuple[Any, ...], List[int]]:
+        """{(values of the named columns): indices}, the groups and their indices in row order."""
+        groups = defaultdict(list)
+        for index, key in enumerate(zip(*(self._columns[name] for name in names))):
+            groups[key].append(index)
+        return dict(groups)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [finding.to_dict() for finding in self]
+
+
+def has_diagnostics(bugs: Iterable[Any]) -> bool:
+    """
+    True if a tool reported a failure instead of (or next to) its findings: "not installed",
+    GENERAL_ERROR, a timeout ... Such results are not cached or checkpointed, since the
+    failure may be gone on the next run.
+    """
+    if isinstance(bugs, Findings):
+        return None in bugs.column("type")
+    return any(bug.get("type") is None for bug in bugs)
+
+
+def json_default(value: Any) -> Any:
+    """json.dump default= hook: findings are written as the list of bug dicts they replace."""
+    if isinstance(value, Findings):
+        return value.to_dicts()
+    if isinstance(value, Finding):
+        return value.to_dict()
+    raise TypeError(f"Object of type {value.__class__.__name__} is not JSON serializable")
@@ -0,0 +1,312 @@
+import gzip
+import json
+import os
+import re
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, Any, List, Optional, Tuple
+from core.build_manager import BuildManager, FILE_API_CLIENT
+from core.dynamic_scheduler import DynamicScheduler
+from core.pipeline import TaskGraph
+from core.verification import MatchEngine
+from tools.analysis_tool import AnalysisTool
+from tools.cppcheck_tool import CppcheckTool
+from tools.valgrind_tool import ValgrindTool
+
+"""
+Performance regression suite for the harness itself (not for the analyzed code).
+Every case runs offline on recorded tool output or generated data, so neither
+cppcheck nor valgrind has to be installed. cppcheck_corpus_500.xml.gz is cppcheck 2.22's
+report on a generated 500 file corpus (generate_corpus.py --files 500 --bugs-per-file 4).
+
+Absolute throughput depends on the machine, so the baseline is recorded locally and
+every throughput is compared relative to calibration samples taken right next to it.
+"""
+
+CALIBRATION = "calibration"
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "fixtures")
+
+
+class PerfCase:
+    """
+    One timed operation. setup(size) prepares the input, run(state) processes it and
+    returns the number of items it handled; throughput is items per second.
+    threshold overrides the allowed throughput drop of the case (see compare).
+    """
+    def __init__(self, name: str, size: int, setup: Callable[[int], Any], run: Callable[[Any], int],
+                 teardown: Optional[Callable[[Any], None]] = None, threshold: Optional[float] = None):
+        self.name = name
+        self.size = size
+        self.setup = setup
+        self.run = run
+        self.teardown = teardown
+        self.threshold = threshold
+
+
+class NoopTool(AnalysisTool):
+    """Tool that does nothing: a dynamic job of it is pure scheduling overhead."""
+
+    def run_analysis(self, file_path: str, **run_options) -> str:
+        return ""
+
+    def _parse_output(self, output: str) -> Dict[str, Any]:
+        return {"bugs": []}
+
+
+def _read_fixture(name: str) -> str:
+    path = os.path.join(FIXTURES, name)
+    with (gzip.open(path, "rt") if name.endswith(".gz") else open(path, "r")) as f:
+        return f.read()
+
+
+def _replicate_errors(text: str, pattern: str, count: int) -> str:
+    """Repeats the <error> elements of a recorded report until it has count errors."""
+    errors = re.findall(pattern, text, re.DOTALL)
+    first = text.index(errors[0])
+    last = text.rindex(errors[-1]) + len(errors[-1])
+    body = "\n".join(errors[i % len(errors)] for i in range(count))
+    return text[:first] + body + text[last:]
+
+
+def _cppcheck_report(size: int) -> str:
+    return _replicate_errors(_read_fixture("cppcheck_vulnerable.xml"), r"<error .*?</error>", size)
+
+
+def _cppcheck_corpus_report(size: int) -> str:
+    """The recorded corpus report; at scale 1 exactly as cppcheck wrote it (2050 errors)."""
+    return _replicate_errors(_read_fixture("cppcheck_corpus_500.xml.gz"), r"<error .*?</error>", size)
+
+
+def _valgrind_report(size: int) -> str:
+    return _replicate_errors(_read_fixture("valgrind_vulnerable.xml"), r"<error>.*?</error>", size)
+
+
+def _verification_data(size: int):
+    """size files with 4 expected bugs each, found with some line drift, misses and false positives."""
+    types = ["memory_leak", "out_of_bounds", "uninitialized_variable", "mismatched_free"]
+    ground_truth = {"files": []}
+    found = {}
+    for index in range(size):
+        filename = f"gen_{index}.cpp"
+        bugs = [{"line": 10 * (i + 1), "type": bug_type, "severity": "error"} for i, bug_type in enumerate(types)]
+        ground_truth["files"].append({"filename": filename, "bugs": bugs})
+        found[filename] = [{"line": bug["line"] + index % 2, "type": bug["type"], "message": "m", "severity": "error"}
+                           for bug in bugs[index % 2:]]
+        found[filename].append({"line": 99, "type": "nullPointer", "message": "m", "severity": "error"})
+    return ground_truth, found
+
+
+def _match_all(data) -> int:
+    ground_truth, found = data
+    engine = MatchEngine(ground_truth)
+    for filename, bugs in found.items():
+        engine.match("PerfTool", filename, [filename], bugs)
+    return sum(len(bugs) for bugs in found.values())
+
+
+def _file_api_tree(size: int) -> str:
+    """A build tree with a File API codemodel reply of size executable targets."""
+    root = tempfile.mkdtemp(prefix="perf-file-api-")
+    build_path = os.path.join(root, "build")
+    reply_path = os.path.join(build_path, ".cmake", "api", "v1", "reply")
+    os.makedirs(reply_path)
+
+    targets = []
+    for index in range(size):
+        name = f"target_{index}"
+        target_file = f"target-{name}.json"
+        with open(os.path.join(reply_path, target_file), "w") as f:
+            json.dump({"name": name, "type": "EXECUTABLE", "artifacts": [{"path": name}],
+                       "sources": [{"path": f"gen_{index}.cpp"}]}, f)
+        open(os.path.join(build_path, name), "w").close()
+        targets.append({"name": name, "jsonFile": target_file})
+
+    with open(os.path.join(reply_path, "codemodel-v2.json"), "w") as f:
+        json.dump({"paths": {"source": os.path.join(root, "src"), "build": build_path},
+                   "configurations": [{"targets": targets}]}, f)
+    with open(os.path.join(reply_path, "index-perf.json"), "w") as f:
+        json.dump({"reply": {FILE_API_CLIENT: {"codemodel-v2": {"jsonFile": "codemodel-v2.json"}}}}, f)
+    return root
+
+
+def _discover(root: str) -> int:
+    return len(BuildManager(os.path.join(root, "src")).get_executables())
+
+
+def _run_task_graph(size: int) -> int:
+    graph = TaskGraph(max_workers=4)
+    for index in range(size):
+        # chains of 10 tasks
+        graph.add(f"task{index}", lambda: None, deps=[f"task{index - 1}"] if index % 10 else [])
+    graph.run()
+    return size
+
+
+def _calibration_data(size: int) -> str:
+    return json.dumps([{"file": f"gen_{index}.cpp", "line": index, "type": "memory_leak"} for index in range(size)])
+
+
+def _calibrate(text: str) -> int:
+    """Plain interpreter work (JSON, dicts, sorting), the reference the other cases are measured against."""
+    bugs = json.loads(text)
+    groups = {}
+    for bug in bugs:
+        groups.setdefault((bug["file"][-5:], bug["type"]), []).append(bug["line"])
+    return sum(len(sorted(lines, reverse=True)) for lines in groups.values())
+
+
+def _run_dynamic_jobs(size: int) -> int:
+    jobs = [(NoopTool(), f"/bin/true_{index}") for index in range(size)]
+    return len(list(DynamicScheduler(max_jobs=2).run(jobs)))
+
+
+def default_cases(scale: float = 1.0) -> List[PerfCase]:
+    def size(base: int) -> int:
+        return max(1, int(base * scale))
+
+    return [
+        PerfCase(CALIBRATION, size(20000), _calibration_data, _calibrate),
+        PerfCase("parse/cppcheck", size(20000), _cppcheck_report,
+                 lambda text: len(CppcheckTool()._parse_output(text)["bugs"])),
+        PerfCase("parse/cppcheck_corpus", size(2050), _cppcheck_corpus_report,
+                 lambda text: len(CppcheckTool()._parse_output(text)["bugs"])),
+        PerfCase("parse/valgrind", size(5000), _valgrind_report,
+                 lambda text: len(ValgrindTool()._parse_output(text)["bugs"])),
+        PerfCase("verification/match", size(2000), _verification_data, _match_all),
+        PerfCase("discovery/file_api", size(1000), _file_api_tree, _discover,
+                 teardown=lambda root: shutil.rmtree(root, ignore_errors=True)),
+        PerfCase("scheduling/task_graph", size(2000), lambda n: n, _run_task_graph),
+        # process start and pipe costs follow the machine's load, not the interpreter's speed
+        PerfCase("scheduling/dynamic_jobs", size(200), lambda n: n, _run_dynamic_jobs, threshold=0.5),
+    ]
+
+
+def _sample(case: PerfCase, state: Any, min_time: float) -> Tuple[int, float]:
+    """Runs the case again until min_time seconds passed; returns (items of one run, throughput)."""
+    done = items = 0
+    start = time.perf_counter()
+    while True:
+        items = case.run(state)
+        done += items
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return items, done / elapsed if elapsed else 0.0
+
+
+def measure(case: PerfCase, repeat: int = 5, min_time: float = 0.2,
+            reference: Optional[Tuple[PerfCase, Any]] = None) -> Dict[str, Any]:
+    """
+    Takes repeat samples of a case and keeps the median throughput. A sample runs the
+    case again until min_time seconds passed, so short cases are not dominated by timer
+    and scheduling noise. With a reference (the calibration case and its input), each
+    sample is paired with a reference sample taken right before it, and the median of
+    their ratios is kept as "relative": the machine's speed changes alike for both.
+    The peak Python memory is measured in one extra run (tracing slows the code down).
+    """
+    state = case.setup(case.size)
+    try:
+        items = 0
+        samples, ratios = [], []
+        for _ in range(repeat):
+            if reference is not None:
+                _, reference_throughput = _sample(reference[0], reference[1], min_time)
+            items, throughput = _sample(case, state, min_time)
+            samples.append(throughput)
+            if reference is not None and reference_throughput:
+                ratios.append(throughput / reference_throughput)
+
+        tracemalloc.start()
+        try:
+            case.run(state)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    finally:
+        if case.teardown:
+            case.teardown(state)
+
+    result = {"items": items, "throughput": statistics.median(samples), "peak_kb": peak // 1024}
+    if ratios:
+        result["relative"] = statistics.median(ratios)
+    return result
+
+
+def run_suite(cases: List[PerfCase], repeat: int = 5, selected: Optional[List[str]] = None,
+              min_time: float = 0.2) -> Dict[str, Dict[str, Any]]:
+    """Measures the selected cases, each relative to the calibration case (when it is among cases)."""
+    calibration = next((case for case in cases if case.name == CALIBRATION), None)
+    reference = (calibration, calibration.setup(calibration.size)) if calibration else None
+    results = {}
+    for case in cases:
+        if selected and case.name != CALIBRATION and not any(case.name.startswith(prefix) for prefix in selected):
+            continue
+        print(f"Measuring {case.name} ({case.size} items) ...", end=" ", flush=True)
+        results[case.name] = measure(case, repeat, min_time, None if case is calibration else reference)
+        print(f"{results[case.name]['throughput']:.0f} items/s")
+    return results
+
+
+def load_baseline(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, results: Dict[str, Dict[str, Any]], scale: float):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"scale": scale, "cases": results}, f, indent=2, sort_keys=True)
+
+
+def compare(baseline: Dict[str, Any], results: Dict[str, Dict[str, Any]], threshold: float = 0.2,
+            memory_floor_kb: int = 256, case_thresholds: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+    """
+    Compares results with a baseline. A case regresses when its median throughput,
+    relative to the calibration samples taken next to it, drops by more than threshold, or its peak memory
+    grows by more than threshold (and by more than memory_floor_kb, so tiny allocations
+    do not count as noise). case_thresholds override the throughput threshold of single
+    cases. The calibration case itself is only shown.
+    """
+    case_thresholds = case_thresholds or {}
+    base_cases = baseline.get("cases", {})
+    rows = []
+    for name, current in results.items():
+        base = base_cases.get(name)
+        if base is None:
+            rows.append({"case": name, "metric": "throughput", "base": None, "current": current["throughput"],
+                         "change": None, "regressed": False})
+            continue
+
+        # relative to the calibration samples when both runs have them, absolute otherwise
+        metric = "relative" if base.get("relative") and current.get("relative") else "throughput"
+        throughput_change = current[metric] / base[metric] - 1 if base[metric] else 0.0
+        rows.append({"case": name, "metric": "throughput", "base": base["throughput"], "current": current["throughput"],
+                     "change": throughput_change, "regressed": name != CALIBRATION and
+                     throughput_change < -case_thresholds.get(name, threshold)})
+
+        memory_growth = current["peak_kb"] - base["peak_kb"]
+        memory_change = memory_growth / base["peak_kb"] if base["peak_kb"] else 0.0
+        rows.append({"case": name, "metric": "peak_kb", "base": base["peak_kb"], "current": current["peak_kb"],
+                     "change": memory_change,
+                     "regressed": memory_change > threshold and memory_growth > memory_floor_kb})
+    return rows
+
+
+def format_report(rows: List[Dict[str, Any]]) -> str:
+    def number(value: Optional[float]) -> str:
+        return "-" if value is None else f"{value:.0f}"
+
+    lines = [f"{'Case':<28}{'Metric':<12}{'Baseline':>14}{'Current':>14}{'Change':>10}  Status"]
+    for row in rows:
+        change = "-" if row["change"] is None else f"{row['change']:+.1%}"
+        status = "REGRESSION" if row["regressed"] else ("new" if row["base"] is None else "ok")
+        if row["case"] == CALIBRATION and row["metric"] == "throughput":
+            status = "reference"
+        lines.append(f"{row['case']:<28}{row['metric']:<12}{number(row['base']):>14}{number(row['current']):>14}"
+                     f"{change:>10}  {status}")
+    return "\n".join(lines)
@@ -0,0 +1,123 @@
+import io
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class _ThreadOutput(io.TextIOBase):
+    """
+    sys.stdout replacement while a TaskGraph runs: text printed by a task thread
+    goes to that task's log, everything else to the real stdout.
+    """
+    def __init__(self, real):
+        self.real = real
+        self.local = threading.local()
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self.local, "buffer", None)
+        return (buffer or self.real).write(text)
+
+    def flush(self):
+        if getattr(self.local, "buffer", None) is None:
+            self.real.flush()
+
+
+class TaskGraph:
+    """
+    Dependency-aware scheduler: every named task runs on a thread pool as soon as
+    all of its dependencies have succeeded. Tasks can add more tasks while the
+    graph is running (e.g. one task per linked build target).
+
+    run() returns {name: (result, error, log)}, where log is everything the task printed.
+    A task whose dependency failed is not run, and gets an error instead.
+    """
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self._tasks = {}        # name -> (fn, deps)
+        self._waiting = {}      # names not started yet, in the order they were added (dict as ordered set)
+        self._pending = {}      # name -> number of its dependencies without an outcome yet
+        self._dependents: Dict[str, List[str]] = {}    # dependency -> waiting tasks that need it
+        self._ready = deque()   # waiting names whose dependencies all have an outcome
+        self._outcomes = {}     # name -> (result, error, log)
+        self._running = 0
+        self._condition = threading.Condition()
+        self._pool = None
+        self._output = None
+
+    def add(self, name: str, fn: Callable[[], Any], deps: Iterable[str] = ()):
+        with self._condition:
+            if name in self._tasks:
+                raise ValueError(f"Task already exists: {name}")
+            deps = tuple(dict.fromkeys(deps))
+            self._tasks[name] = (fn, deps)
+            self._waiting[name] = None
+            unfinished = [dep for dep in deps if dep not in self._outcomes]
+            self._pending[name] = len(unfinished)
+            for dep in unfinished:
+                self._dependents.setdefault(dep, []).append(name)
+            if not unfinished:
+                self._ready.append(name)
+            if self._pool is not None:
+                self._start_ready_tasks()
+
+    def run(self) -> Dict[str, Tuple[Any, Optional[str], str]]:
+        real_stdout = sys.stdout
+        self._output = _ThreadOutput(real_stdout)
+        sys.stdout = self._output
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                with self._condition:
+                    self._pool = pool
+                    self._start_ready_tasks()
+                    while self._waiting or self._running:
+                        if not self._running:
+                            # nothing runs and nothing can start: the rest waits for tasks that were never added
+                            for name in self._waiting:
+                                missing = [dep for dep in self._tasks[name][1] if dep not in self._tasks]
+                                self._outcomes[name] = (None, f"missing dependency: {', '.join(missing)}", "")
+                            self._waiting = {}
+                            break
+                        self._condition.wait()
+                    self._pool = None
+        finally:
+            sys.stdout = real_stdout
+        return dict(self._outcomes)
+
+    def _start_ready_tasks(self):
+        """Called with the lock held."""
+        while self._ready:
+            name = self._ready.popleft()
+            del self._waiting[name]
+            fn, deps = self._tasks[name]
+            failed = [dep for dep in deps if self._outcomes[dep][1] is not None]
+            if failed:
+                self._finish(name, (None, f"dependency failed: {', '.join(failed)}", ""))
+                continue
+            self._running += 1
+            self._pool.submit(self._execute, name, fn)
+
+    def _finish(self, name: str, outcome: Tuple[Any, Optional[str], str]):
+        """Records the outcome of a task and queues the dependents it was the last dependency of (lock held)."""
+        self._outcomes[name] = outcome
+        for dependent in self._dependents.pop(name, ()):
+            self._pending[dependent] -= 1
+            if self._pending[dependent] == 0:
+                self._ready.append(dependent)
+
+    def _execute(self, name: str, fn: Callable[[], Any]):
+        log = io.StringIO()
+        self._output.local.buffer = log
+        try:
+            result, error = fn(), None
+        except Exception as e:
+            result, error = None, str(e)
+        finally:
+            self._output.local.buffer = None
+
+        with self._condition:
+            self._finish(name, (result, error, log.getvalue()))
+            self._running -= 1
+            self._start_ready_tasks()
+            self._condition.notify_all()
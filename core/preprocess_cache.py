@@ -0,0 +1,169 @@
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+from typing import Dict, Optional, Sequence
+from core import profiler
+from core.result_cache import hash_file
+
+# C sources are preprocessed as C, everything else as C++ (".C" is C++)
+C_EXTENSIONS = {".c"}
+
+
+def preprocessor_for(source_path: str) -> str:
+    return "gcc" if os.path.splitext(source_path)[1] in C_EXTENSIONS else "g++"
+
+
+class SourceDependencies:
+    """The project headers a source includes, as the preprocessor resolved them, with their hashes."""
+
+    def __init__(self, source: str, key: str, headers: Dict[str, str]):
+        self.source = source
+        self.key = key
+        self.headers = headers      # {absolute header path: sha256}
+
+
+class PreprocessCache:
+    """
+    Dependency scans that the result cache keys of all static tools share (kept between runs).
+
+    The preprocessor resolves the headers of every source once (-MM); a manifest keyed by
+    the source's content, the preprocessor and the flags records the hashes of those
+    headers, and is only scanned again when one of them changed (like ccache's direct
+    mode). The tools themselves still preprocess their sources on their own.
+
+    It also holds the --cppcheck-build-dir folders, where cppcheck keeps its own analyzer
+    information per file and configuration and skips files that did not change.
+    The least recently used manifests and build dirs are evicted once they grow beyond max_bytes.
+    """
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.join(self.cache_dir, "deps"), exist_ok=True)
+
+    def dependencies(self, source_path: str, flags: Sequence[str] = ()) -> Optional[SourceDependencies]:
+        """
+        Returns the dependencies of source_path, or None if the preprocessor cannot resolve
+        them (e.g. it is not installed, or a header is only found with flags not given here).
+        """
+        compiler = preprocessor_for(source_path)
+        if shutil.which(compiler) is None:
+            return None
+        source_path = os.path.abspath(source_path)
+        key_data = {"source": hash_file(source_path), "path": source_path, "flags": list(flags), "compiler": compiler}
+        key = hashlib.sha256(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
+        base = os.path.join(self.cache_dir, "deps", key)
+
+        # processes analyzing the same file wait for the first one instead of scanning it again
+        with open(base + ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            headers = self._valid_manifest(base)
+            if headers is None:
+                headers = self._scan(source_path, flags, compiler, base)
+                if headers is None:
+                    return None
+            else:
+                os.utime(base + ".json")    # mtime is the LRU clock
+        return SourceDependencies(source_path, key, headers)
+
+    def cppcheck_build_dir(self, name: str) -> str:
+        """
+        A --cppcheck-build-dir of its own for every analyzed file (or compile_commands.json),
+        so parallel runs never share one. name must be the same path in every run to be reused.
+        """
+        digest = hashlib.sha256(os.path.realpath(name).encode()).hexdigest()[:16]
+        path = os.path.join(self.cache_dir, "cppcheck", f"{os.path.basename(name)}-{digest}")
+        os.makedirs(path, exist_ok=True)
+        os.utime(path)      # mtime is the LRU clock
+        return path
+
+    @staticmethod
+    def _valid_manifest(base: str) -> Optional[Dict[str, str]]:
+        """The recorded headers with their current hashes, or None if any of them changed."""
+        try:
+            with open(base + ".json", "r") as f:
+                manifest = json.load(f)
+            headers = {}
+            for path, digest in manifest["headers"]:
+                if hash_file(path) != digest:
+                    return None
+                headers[path] = digest
+        except (OSError, ValueError, KeyError):
+            return None
+        return headers
+
+    def _scan(self, source_path: str, flags: Sequence[str], compiler: str, base: str) -> Optional[Dict[str, str]]:
+        tmp_path = f"{base}.{os.getpid()}.tmp"
+        # -MM lists the project headers; system headers are covered by the tool versions
+        command = [compiler, *flags, "-MM", "-MF", tmp_path + ".d", source_path]
+        try:
+            with profiler.span("preprocess", compiler, source_path):
+                result = profiler.run_process(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        except (FileNotFoundError, OSError):
+            return None
+        if result.returncode != 0:
+            if os.path.exists(tmp_path + ".d"):
+                os.remove(tmp_path + ".d")
+            return None
+
+        paths = self._read_depfile(tmp_path + ".d", source_path)
+        os.remove(tmp_path + ".d")
+        headers = {path: hash_file(path) for path in paths}
+        with open(tmp_path + ".json", "w") as f:
+            json.dump({"source": source_path, "headers": [[path, digest] for path, digest in headers.items()]}, f)
+        os.replace(tmp_path + ".json", base + ".json")
+        return headers
+
+    @staticmethod
+    def _read_depfile(path: str, source_path: str):
+        """Dependencies of a make rule written by -MM (the source itself excluded)."""
+        with open(path, "r") as f:
+            content = f.read().replace("\\\n", " ")
+        _, _, dependencies = content.partition(": ")
+        return sorted({os.path.abspath(dep) for dep in dependencies.split()} - {source_path})
+
+    def evict(self):
+        """
+        Deletes the least recently used manifests and build dirs until the cache is back
+        under 90% of its limit. Called between runs, never while a tool uses a build dir.
+        """
+        entries = []
+        deps_dir = os.path.join(self.cache_dir, "deps")
+        for name in os.listdir(deps_dir):
+            if name.endswith(".json"):
+                path = os.path.join(deps_dir, name)
+                try:
+                    entries.append((os.path.getmtime(path), os.path.getsize(path), path))
+                except OSError:
+                    continue
+        build_dirs = os.path.join(self.cache_dir, "cppcheck")
+        for name in os.listdir(build_dirs) if os.path.isdir(build_dirs) else []:
+            path = os.path.join(build_dirs, name)
+            try:
+                entries.append((os.path.getmtime(path), self._tree_size(path), path))
+            except OSError:
+                continue
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            if total <= int(self.max_bytes * 0.9):
+                break
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                os.remove(path)
+            total -= size
+
+    @staticmethod
+    def _tree_size(path: str) -> int:
+        total = 0
+        for root, _, files in os.walk(path):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    continue
+        return total
@@ -0,0 +1,173 @@
+import csv
+import json
+import os
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional
+
+FIELDS = ["category", "name", "target", "wall_s", "user_s", "sys_s", "max_rss_kb",
+          "output_bytes", "parse_s", "processes"]
+
+# the profiler spans are recorded into (one per process), and the open spans of each thread
+_active = None
+_local = threading.local()
+
+
+class MeasuredPopen(subprocess.Popen):
+    """
+    Popen whose wait() reaps the child with os.wait4, keeping the child's resource usage
+    (user/sys CPU time, peak RSS) in self.rusage. communicate() and the context manager
+    wait through it too. If the child was already reaped elsewhere (e.g. by poll()),
+    rusage stays None.
+    """
+    rusage = None
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        if self.returncode is None:
+            self._wait4(timeout)
+        return super().wait(timeout)
+
+    def _wait4(self, timeout: Optional[float]):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        delay = 0.0005
+        while True:
+            try:
+                pid, status, rusage = os.wait4(self.pid, 0 if deadline is None else os.WNOHANG)
+            except ChildProcessError:
+                return      # reaped elsewhere: Popen knows what to do
+            if pid == self.pid:
+                self.rusage = rusage
+                self.returncode = os.waitstatus_to_exitcode(status)
+                return
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired(self.args, timeout)
+            # same back-off as Popen's own wait with a timeout
+            delay = min(delay * 2, remaining, 0.05)
+            time.sleep(delay)
+
+
+class Profiler:
+    """
+    Collects one record per measured step (tool run, parse, build step, phase)
+    and writes them as the JSON/CSV profile of a run.
+    """
+    def __init__(self):
+        self.records = []
+        self._lock = threading.Lock()
+
+    def add(self, record: Dict[str, Any]):
+        with self._lock:
+            self.records.append(record)
+
+    def extend(self, records: List[Dict[str, Any]]):
+        with self._lock:
+            self.records.extend(records)
+
+    def write(self, reports_path: str, run_name: str) -> List[str]:
+        """Writes profile_<run_name>.json and .csv, returns their paths."""
+        os.makedirs(reports_path, exist_ok=True)
+        json_path = os.path.join(reports_path, f"profile_{run_name}.json")
+        csv_path = os.path.join(reports_path, f"profile_{run_name}.csv")
+
+        with open(json_path, 'w') as f:
+            json.dump({"run": run_name, "records": self.records}, f, indent=2)
+        with open(csv_path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(self.records)
+        return [json_path, csv_path]
+
+    def summary(self, top: int = 10) -> str:
+        """Per-tool totals and the slowest tool runs, as a text table."""
+        tool_records = [r for r in self.records if r["category"] == "tool"]
+        totals = {}
+        for record in tool_records:
+            total = totals.setdefault(record["name"], {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0,
+                                                       "parse_s": 0.0, "max_rss_kb": 0})
+            total["calls"] += 1
+            total["wall_s"] += record["wall_s"]
+            total["cpu_s"] += record["user_s"] + record["sys_s"]
+            total["parse_s"] += record["parse_s"]
+            total["max_rss_kb"] = max(total["max_rss_kb"], record["max_rss_kb"])
+
+        lines = [f"{'Tool':<24}{'Calls':>7}{'Wall [s]':>11}{'CPU [s]':>11}{'Parse [s]':>11}{'Max RSS [MB]':>14}"]
+        for name, total in sorted(totals.items(), key=lambda item: -item[1]["wall_s"]):
+            lines.append(f"{name:<24}{total['calls']:>7}{total['wall_s']:>11.2f}{total['cpu_s']:>11.2f}"
+                         f"{total['parse_s']:>11.2f}{total['max_rss_kb'] / 1024:>14.1f}")
+
+        other = [r for r in self.records if r["category"] in ("build", "manager")]
+        for record in other:
+            lines.append(f"{record['category'] + ':' + record['name']:<24}{'':>7}{record['wall_s']:>11.2f}"
+                         f"{record['user_s'] + record['sys_s']:>11.2f}{'':>11}{record['max_rss_kb'] / 1024:>14.1f}")
+
+        lines.append("")
+        lines.append(f"Slowest {top} tool runs:")
+        for record in sorted(tool_records, key=lambda r: -r["wall_s"])[:top]:
+            lines.append(f" {record['wall_s']:>9.2f}s  {record['name']:<20} {os.path.basename(record['target'])}")
+        return "\n".join(lines)
+
+
+def activate(profiler: Optional[Profiler]) -> Optional[Profiler]:
+    """Makes profiler the one spans are recorded into; returns the previous one."""
+    global _active
+    previous, _active = _active, profiler
+    return previous
+
+
+@contextmanager
+def span(category: str, name: str, target: str = "") -> Iterator[Dict[str, Any]]:
+    """
+    Measures the wall time of the enclosed block. Processes run through
+    run_process / MeasuredPopen inside it add their CPU time and peak RSS.
+    """
+    record = {"category": category, "name": name, "target": target, "wall_s": 0.0, "user_s": 0.0,
+              "sys_s": 0.0, "max_rss_kb": 0, "output_bytes": 0, "parse_s": 0.0, "processes": 0}
+    stack = _local.__dict__.setdefault("spans", [])
+    stack.append(record)
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["wall_s"] = time.perf_counter() - start
+        stack.pop()
+        if _active is not None:
+            _active.add(record)
+
+
+def note_process(rusage, output_bytes: int = 0):
+    """Adds a finished child process to the innermost open span of this thread."""
+    stack = _local.__dict__.get("spans")
+    if not stack:
+        return
+    record = stack[-1]
+    record["processes"] += 1
+    record["output_bytes"] += output_bytes
+    if rusage is not None:
+        record["user_s"] += rusage.ru_utime
+        record["sys_s"] += rusage.ru_stime
+        # ru_maxrss is in KB on Linux
+        record["max_rss_kb"] = max(record["max_rss_kb"], rusage.ru_maxrss)
+
+
+def run_process(command: List[str], check: bool = False, timeout: Optional[float] = None,
+                **popen_kwargs) -> subprocess.CompletedProcess:
+    """
+    subprocess.run replacement that records the child's resource usage
+    and output size in the current span.
+    """
+    with MeasuredPopen(command, **popen_kwargs) as process:
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            note_process(process.rusage)
+            raise
+    note_process(process.rusage, len(stdout or "") + len(stderr or ""))
+
+    if check and process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, command, stdout, stderr)
+    return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
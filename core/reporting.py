@@ -0,0 +1,198 @@
+import gzip
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from typing import Dict, Any, Iterator, List, Optional, Sequence, TextIO
+from xml.sax.saxutils import escape, quoteattr
+from core.findings import json_default
+from core.verification import TargetResult, VerificationReport
+
+REPORT_FORMATS = ("jsonl", "sarif", "junit")
+
+# cppcheck / clang-tidy / valgrind severities -> SARIF levels
+SARIF_LEVELS = {
+    "critical": "error",
+    "error": "error",
+    "warning": "warning",
+    "style": "note",
+    "performance": "note",
+    "portability": "note",
+    "information": "note",
+    "note": "note",
+}
+
+
+class ReportWriter:
+    """
+    Writes the verification of a run as consolidated report files: one JSON Lines file
+    with every finding, a SARIF log and a JUnit XML file (a test case per tool and target),
+    optionally gzip compressed. The results are already held in memory by the
+    VerificationReport, so each file is written in one go, with one open per file
+    instead of files per tool and source.
+    """
+    def __init__(self, reports_path: str, formats: Sequence[str] = REPORT_FORMATS, compress: bool = False):
+        unknown = [name for name in formats if name not in REPORT_FORMATS]
+        if unknown:
+            raise ValueError(f"unknown report formats: {', '.join(unknown)} (known: {', '.join(REPORT_FORMATS)})")
+        self.reports_path = reports_path
+        self.formats = list(formats)
+        self.compress = compress
+
+    def write(self, report: VerificationReport, run_name: str, log: Optional[str] = None) -> List[str]:
+        """Writes report_<run_name>.* (and the console log of the run, if given); returns their paths."""
+        writers = {"jsonl": ("jsonl", self._jsonl_lines), "sarif": ("sarif", self._sarif_lines),
+                   "junit": ("junit.xml", self._junit_lines)}
+        paths = []
+        for name in self.formats:
+            extension, lines = writers[name]
+            paths.append(self._write_file(f"report_{run_name}.{extension}", lines(report)))
+        if log:
+            paths.append(self._write_file(f"run_{run_name}.log", iter([log])))
+        return paths
+
+    def _write_file(self, file_name: str, chunks: Iterator[str]) -> str:
+        os.makedirs(self.reports_path, exist_ok=True)
+        path = os.path.join(self.reports_path, file_name + (".gz" if self.compress else ""))
+        if self.compress:
+            f = gzip.open(path, "wt", encoding="utf-8", compresslevel=6)
+        else:
+            f = open(path, "w", encoding="utf-8", buffering=1024 * 1024)
+        with f:
+            f.writelines(chunks)
+        return path
+
+    @staticmethod
+    def _verdicts(result: TargetResult) -> Iterator[Any]:
+        """(verdict, bug) of every finding, missed expected bug and tool diagnostic of a target."""
+        for bug, verdict in zip(result.findings, result.verdicts()):
+            yield verdict, bug
+        for bug in result.false_negatives:
+            yield "false_negative", bug
+        for bug in result.notes:
+            yield "note", bug
+
+    def _jsonl_lines(self, report: VerificationReport) -> Iterator[str]:
+        for result in report.results:
+            for verdict, bug in self._verdicts(result):
+                record = {"tool": result.tool, "target": result.target, "verdict": verdict}
+                record.update(bug.items())
+                yield json.dumps(record, default=json_default) + "\n"
+
+    def _sarif_lines(self, report: VerificationReport) -> Iterator[str]:
+        runs: Dict[str, Dict[str, Any]] = {}
+        for result in report.results:
+            run = runs.setdefault(result.tool, {"rules": {}, "results": [], "notifications": []})
+            for verdict, bug in self._verdicts(result):
+                if verdict == "note":
+                    run["notifications"].append({"level": SARIF_LEVELS.get(bug.get("severity"), "warning"),
+                                                 "message": {"text": f"{result.target}: {bug.get('message')}"}})
+                    continue
+                if verdict == "false_negative":
+                    continue        # expected bugs the tool did not report are not results of the tool
+                run["rules"].setdefault(bug["type"], {"id": bug["type"]})
+                run["results"].append(self._sarif_result(result, bug, verdict))
+
+        log = {
+            "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+            "version": "2.1.0",
+            "runs": [{
+                "tool": {"driver": {"name": tool, "rules": list(run["rules"].values())}},
+                "invocations": [{"executionSuccessful": True,
+                                 "toolExecutionNotifications": run["notifications"]}],
+                "results": run["results"],
+            } for tool, run in runs.items()],
+        }
+        yield json.dumps(log, default=json_default)
+        yield "\n"
+
+    @staticmethod
+    def _sarif_result(result: TargetResult, bug: Any, verdict: str) -> Dict[str, Any]:
+        location: Dict[str, Any] = {"artifactLocation": {"uri": bug.get("file") or result.finding_file(bug)}}
+        if bug.get("line"):
+            location["region"] = {"startLine": bug["line"]}
+        return {
+            "ruleId": bug["type"],
+            "level": SARIF_LEVELS.get(bug.get("severity"), "warning"),
+            "message": {"text": bug.get("message") or bug["type"]},
+            "locations": [{"physicalLocation": location}],
+            "properties": {"target": result.target, "verdict": verdict},
+        }
+
+    def _junit_lines(self, report: VerificationReport) -> Iterator[str]:
+        """A test suite per tool; a target fails when the tool missed expected bugs."""
+        by_tool: Dict[str, List[TargetResult]] = {}
+        for result in report.results:
+            by_tool.setdefault(result.tool, []).append(result)
+
+        yield '<?xml version="1.0" encoding="UTF-8"?>\n<testsuites>\n'
+        for tool, results in by_tool.items():
+            failures = sum(1 for result in results if result.false_negatives)
+            yield f'  <testsuite name={quoteattr(tool)} tests="{len(results)}" failures="{failures}">\n'
+            for result in results:
+                total = result.total
+                yield f'    <testcase classname={quoteattr(tool)} name={quoteattr(result.target)}>\n'
+                if result.false_negatives:
+                    missed = "\n".join(f"{bug.get('file')}:{bug.get('line')} {bug.get('type')}"
+                                       for bug in result.false_negatives)
+                    message = quoteattr(f"missed {len(result.false_negatives)} expected bugs")
+                    yield f"      <failure message={message}>{escape(missed)}</failure>\n"
+                out = f"TP: {total.tp}, FP: {total.fp}, FN: {total.fn}"
+                notes = "".join(f"\nNote: {bug.get('message')}" for bug in result.notes)
+                yield f"      <system-out>{escape(out + notes)}</system-out>\n"
+                yield "    </testcase>\n"
+            yield "  </testsuite>\n"
+        yield "</testsuites>\n"
+
+
+class ProgressBar:
+    """
+    Compact console progress of a run: a single line redrawn in place on a terminal
+    (at most every interval seconds), or a line every 10% when the output is a log file.
+    The total grows as the phases of the run are planned.
+    """
+    def __init__(self, stream: Optional[TextIO] = None, width: int = 30, interval: float = 0.1):
+        self.stream = stream or sys.stdout
+        self.width = width
+        self.interval = interval
+        self.total = 0
+        self.done = 0
+        self._tty = hasattr(self.stream, "isatty") and self.stream.isatty()
+        self._last_draw = 0.0
+        self._last_step = 0
+        self._lock = threading.Lock()
+
+    def add_total(self, count: int):
+        with self._lock:
+            self.total += count
+            if self.total:
+                self._last_step = self.done * 10 // self.total
+
+    def advance(self, label: str = ""):
+        with self._lock:
+            self.done += 1
+            if self._tty:
+                now = time.monotonic()
+                if now - self._last_draw >= self.interval or self.done >= self.total:
+                    self._last_draw = now
+                    self._draw(label)
+            elif self.total:
+                step = self.done * 10 // self.total
+                if step > self._last_step:
+                    self._last_step = step
+                    self.stream.write(f"Progress: {self.done}/{self.total} ({self.done * 100 // self.total}%)\n")
+                    self.stream.flush()
+
+    def _draw(self, label: str):
+        filled = self.width * self.done // self.total if self.total else 0
+        line = f"[{'#' * filled}{'-' * (self.width - filled)}] {self.done}/{self.total} {label}"
+        columns = shutil.get_terminal_size().columns
+        self.stream.write("\r" + line[:columns - 1].ljust(columns - 1))
+        self.stream.flush()
+
+    def close(self):
+        if self._tty and self.done:
+            self.stream.write("\n")
+            self.stream.flush()
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import re
+from typing import Dict, Any, List, Optional
+from core.findings import json_default
+
+# only project headers are followed; system headers are covered by the tool version
+INCLUDE_PATTERN = re.compile(r'^\s*#\s*include\s*"([^"]+)"', re.MULTILINE)
+
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def collect_local_includes(file_path: str, include_dirs: Optional[List[str]] = None) -> List[str]:
+    """
+    Returns every project header reachable from file_path through #include "..." lines.
+    Headers are looked up next to the including file first, then in include_dirs.
+    """
+    include_dirs = include_dirs or []
+    found = []
+    seen = set()
+    pending = [os.path.abspath(file_path)]
+
+    while pending:
+        current = pending.pop()
+        try:
+            with open(current, 'r', errors='ignore') as f:
+                content = f.read()
+        except OSError:
+            continue
+
+        for name in INCLUDE_PATTERN.findall(content):
+            for base in [os.path.dirname(current)] + include_dirs:
+                candidate = os.path.abspath(os.path.join(base, name))
+                if os.path.isfile(candidate):
+                    if candidate not in seen:
+                        seen.add(candidate)
+                        found.append(candidate)
+                        pending.append(candidate)
+                    break
+
+    return sorted(found)
+
+
+class ResultCache:
+    """
+    Persistent on-disk cache of parsed tool results ({"bugs": [...]}).
+    Entries are keyed by the content of the analyzed file and its project headers,
+    plus the tool name, version and command line. Headers are identified by their path
+    relative to source_root (or to the analyzed file), so two headers of the same name in
+    different folders never share a key. The least recently used entries are evicted once
+    the cache grows beyond max_bytes.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024, source_root: Optional[str] = None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.source_root = os.path.abspath(source_root) if source_root else None
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.total_bytes = sum(os.path.getsize(path) for path in self._entries())
+
+    def make_key(self, tool, file_path: str, extra: Any = None,
+                 headers: Optional[Dict[str, str]] = None) -> Optional[str]:
+        """
+        Returns the cache key of running tool on file_path,
+        or None when the result must not be cached (e.g. the tool is not installed).
+        extra is any other JSON data the result depends on (e.g. the compile command).
+        headers ({path: sha256}) are the file's project headers as the preprocessor resolved
+        them (see PreprocessCache); without them, the #include "..." lines are followed.
+        """
+        version = tool.get_version()
+        if version is None:
+            return None
+
+        if headers is None:
+            include_dirs = [os.path.dirname(os.path.abspath(file_path))]
+            headers = {path: hash_file(path) for path in collect_local_includes(file_path, include_dirs)}
+        root = self.source_root or os.path.dirname(os.path.abspath(file_path))
+        key_data = {
+            "tool": tool.__class__.__name__,
+            "version": version,
+            "command": tool.get_command(file_path),
+            "source": hash_file(file_path),
+            "headers": [[os.path.relpath(path, root), digest] for path, digest in sorted(headers.items())],
+            "extra": extra,
+        }
+        return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r') as f:
+                result = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+        # mtime is the LRU clock
+        os.utime(path)
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]):
+        path = self._entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        old_size = os.path.getsize(path) if os.path.exists(path) else 0
+
+        # write + rename so a crash never leaves a half-written entry
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(result, f, default=json_default)
+        os.replace(tmp_path, path)
+
+        self.total_bytes += os.path.getsize(path) - old_size
+        if self.total_bytes > self.max_bytes:
+            self._evict()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _entries(self) -> List[str]:
+        entries = []
+        for root, dirs, files in os.walk(self.cache_dir):
+            entries.extend(os.path.join(root, name) for name in files if name.endswith(".json"))
+        return entries
+
+    def _evict(self):
+        """Deletes the least recently used entries until the cache is back under 90% of its limit."""
+        target = int(self.max_bytes * 0.9)
+        entries = sorted(self._entries(), key=os.path.getmtime)
+        for path in entries:
+            if self.total_bytes <= target:
+                break
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+            except OSError:
+                continue
+            self.total_bytes -= size
@@ -0,0 +1,208 @@
+import json
+import os
+import sqlite3
+import statistics
+import time
+from typing import Dict, Any, List, Optional, Tuple
+from core import profiler
+from core.findings import TIMED_OUT
+from core.verification import Counts, VerificationReport
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    config TEXT
+);
+CREATE TABLE IF NOT EXISTS findings (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    tool TEXT NOT NULL,
+    target TEXT NOT NULL,
+    file TEXT,
+    type TEXT,
+    line INTEGER,
+    severity TEXT,
+    message TEXT,
+    status TEXT NOT NULL            -- 'matched', 'fp' or 'note' (a tool diagnostic, e.g. a timeout)
+);
+CREATE TABLE IF NOT EXISTS missed (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    tool TEXT NOT NULL,
+    target TEXT NOT NULL,
+    file TEXT,
+    type TEXT,
+    line INTEGER
+);
+CREATE TABLE IF NOT EXISTS outcomes (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    tool TEXT NOT NULL,
+    target TEXT NOT NULL,
+    file TEXT,
+    type TEXT,
+    tp INTEGER, fp INTEGER, fn INTEGER, duplicates INTEGER
+);
+CREATE TABLE IF NOT EXISTS timings (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    category TEXT, name TEXT, target TEXT,
+    wall_s REAL, user_s REAL, sys_s REAL, max_rss_kb INTEGER,
+    output_bytes INTEGER, parse_s REAL, processes INTEGER
+);
+CREATE INDEX IF NOT EXISTS findings_run ON findings(run_id, tool, file, type);
+CREATE INDEX IF NOT EXISTS missed_run ON missed(run_id, tool, file, type);
+CREATE INDEX IF NOT EXISTS outcomes_run ON outcomes(run_id, tool, file, type);
+CREATE INDEX IF NOT EXISTS timings_run ON timings(run_id, name, target);
+"""
+
+
+class ResultsStore:
+    """
+    SQLite store of benchmark runs: findings, missed bugs, verification outcomes and timings.
+    Every run is written in one transaction; WAL mode lets several runs write concurrently
+    while others read.
+    """
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def save_run(self, report: VerificationReport, timings: List[Dict[str, Any]],
+                 config: Optional[Dict[str, Any]] = None) -> int:
+        """Bulk-inserts everything of one run and returns its id."""
+        findings, missed, outcomes = [], [], []
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (started_at, config) VALUES (?, ?)",
+                (time.strftime("%Y-%m-%d %H:%M:%S"), json.dumps(config or {}, sort_keys=True)))
+            run_id = cursor.lastrowid
+
+            for result in report.results:
+                for bug, verdict in zip(result.findings, result.verdicts()):
+                    findings.append((run_id, result.tool, result.target, result.finding_file(bug),
+                                     bug.get("type"), bug.get("line", 0), bug.get("severity"),
+                                     bug.get("message"), "fp" if verdict == "false_positive" else "matched"))
+                for note in result.notes:
+                    findings.append((run_id, result.tool, result.target, note.get("file"), None,
+                                     note.get("line", 0), note.get("severity"), note.get("message"), "note"))
+                for bug in result.false_negatives:
+                    missed.append((run_id, result.tool, result.target, bug["file"], bug.get("type"), bug.get("line", 0)))
+                for (filename, bug_type), counts in result.counts.items():
+                    outcomes.append((run_id, result.tool, result.target, filename, bug_type,
+                                     counts.tp, counts.fp, counts.fn, counts.duplicates))
+
+            self.connection.executemany("INSERT INTO findings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", findings)
+            self.connection.executemany("INSERT INTO missed VALUES (?, ?, ?, ?, ?, ?)", missed)
+            self.connection.executemany("INSERT INTO outcomes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", outcomes)
+            self.connection.executemany(
+                "INSERT INTO timings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id,) + tuple(t.get(field) for field in profiler.FIELDS) for t in timings])
+        return run_id
+
+    def list_runs(self) -> List[Dict[str, Any]]:
+        rows = self.connection.execute("SELECT id, started_at, config FROM runs ORDER BY id").fetchall()
+        return [{"id": run_id, "started_at": started_at, "config": json.loads(config or "{}")}
+                for run_id, started_at, config in rows]
+
+    def latest_run(self) -> Optional[int]:
+        return self.connection.execute("SELECT MAX(id) FROM runs").fetchone()[0]
+
+    def tool_counts(self, run_id: int) -> Dict[str, Counts]:
+        rows = self.connection.execute(
+            "SELECT tool, SUM(tp), SUM(fp), SUM(fn), SUM(duplicates) FROM outcomes WHERE run_id = ? GROUP BY tool",
+            (run_id,)).fetchall()
+        return {tool: Counts(tp, fp, fn, duplicates) for tool, tp, fp, fn, duplicates in rows}
+
+    def target_costs(self, last_runs: int = 5) -> Dict[str, float]:
+        """
+        Average tool time (all tools together) per target over the last runs,
+        keyed by the target's base name so it applies to checkouts in other folders.
+        """
+        rows = self.connection.execute(
+            "SELECT target, SUM(wall_s) FROM timings "
+            "WHERE category = 'tool' AND run_id IN (SELECT id FROM runs ORDER BY id DESC LIMIT ?) "
+            "GROUP BY run_id, target", (last_runs,)).fetchall()
+        totals = {}
+        for target, wall_s in rows:
+            totals.setdefault(os.path.basename(target), []).append(wall_s or 0.0)
+        return {name: sum(values) / len(values) for name, values in totals.items()}
+
+    def tool_runtimes(self, last_runs: int = 5) -> Dict[Tuple[str, str], float]:
+        """
+        Median runtime of every (tool, target base name) over the last runs that ran it to
+        the end: runs with fast_fail stopped programs at their first error, and runs that
+        timed out were killed, so neither is the time the program really needs.
+        """
+        runs = self.connection.execute("SELECT id, config FROM runs ORDER BY id DESC LIMIT ?",
+                                       (last_runs,)).fetchall()
+        run_ids = [run_id for run_id, config in runs if not json.loads(config or "{}").get("fast_fail")]
+        if not run_ids:
+            return {}
+        placeholders = ", ".join("?" * len(run_ids))
+        timed_out = {(run_id, tool, os.path.basename(target)) for run_id, tool, target in self.connection.execute(
+            f"SELECT run_id, tool, target FROM findings WHERE status = 'note' AND message = ? "
+            f"AND run_id IN ({placeholders})", (TIMED_OUT, *run_ids))}
+        rows = self.connection.execute(
+            f"SELECT run_id, name, target, wall_s FROM timings "
+            f"WHERE category = 'tool' AND wall_s IS NOT NULL AND run_id IN ({placeholders})", run_ids).fetchall()
+        samples = {}
+        for run_id, tool, target, wall_s in rows:
+            key = (tool, os.path.basename(target))
+            if (run_id,) + key not in timed_out:
+                samples.setdefault(key, []).append(wall_s)
+        return {key: statistics.median(values) for key, values in samples.items()}
+
+    def diff_runs(self, base: int, head: int) -> Dict[str, Any]:
+        """
+        Compares two stored runs without re-running any tool:
+        false positives and missed bugs that appeared or disappeared, and the
+        precision/recall of every tool in both runs.
+        """
+        return {
+            "base": base,
+            "head": head,
+            "new_false_positives": self._difference("findings", head, base, "status = 'fp'"),
+            "fixed_false_positives": self._difference("findings", base, head, "status = 'fp'"),
+            "new_misses": self._difference("missed", head, base),
+            "fixed_misses": self._difference("missed", base, head),
+            "tools": {tool: {"base": counts, "head": self.tool_counts(head).get(tool, Counts())}
+                      for tool, counts in self._all_tool_counts(base, head).items()},
+        }
+
+    def _all_tool_counts(self, base: int, head: int) -> Dict[str, Counts]:
+        counts = {tool: Counts() for tool in self.tool_counts(head)}
+        counts.update(self.tool_counts(base))
+        return counts
+
+    def _difference(self, table: str, run_a: int, run_b: int, condition: str = "1") -> List[Dict[str, Any]]:
+        """Rows of run_a (tool, file, type, line) that run_b does not have."""
+        rows = self.connection.execute(
+            f"SELECT DISTINCT tool, file, type, line FROM {table} WHERE run_id = ? AND {condition} "
+            f"EXCEPT SELECT tool, file, type, line FROM {table} WHERE run_id = ? AND {condition} "
+            f"ORDER BY tool, file, line",
+            (run_a, run_b)).fetchall()
+        return [{"tool": tool, "file": file, "type": bug_type, "line": line} for tool, file, bug_type, line in rows]
+
+
+def format_diff(diff: Dict[str, Any]) -> str:
+    def ratio(value: Optional[float]) -> str:
+        return f"{value:.2f}" if value is not None else "-"
+
+    lines = [f"--- Run #{diff['base']} -> Run #{diff['head']} ---",
+             f"{'Tool':<24}{'Precision':>20}{'Recall':>20}"]
+    for tool, counts in sorted(diff["tools"].items()):
+        base, head = counts["base"], counts["head"]
+        marker = "  <-- recall regression" if (head.recall or 0) < (base.recall or 0) else ""
+        lines.append(f"{tool:<24}{ratio(base.precision) + ' -> ' + ratio(head.precision):>20}"
+                     f"{ratio(base.recall) + ' -> ' + ratio(head.recall):>20}{marker}")
+
+    sections = [("New false positives", "new_false_positives"), ("Fixed false positives", "fixed_false_positives"),
+                ("New misses", "new_misses"), ("Fixed misses", "fixed_misses")]
+    for title, key in sections:
+        lines.append(f"{title}: {len(diff[key])}")
+        for row in diff[key]:
+            lines.append(f" - [{row['tool']}] {row['file']}:{row['line']} {row['type']}")
+    return "\n".join(lines)
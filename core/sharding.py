@@ -0,0 +1,93 @@
+import glob
+import json
+import os
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from core.findings import json_default
+from core.verification import TargetResult, VerificationReport
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """
+    Parses "i/N" (1 <= i <= N) into (i, N).
+    """
+    try:
+        index, count = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"invalid shard '{spec}', expected i/N (e.g. 2/4)")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"invalid shard '{spec}', i must be between 1 and N")
+    return index, count
+
+
+def partition(names: Sequence[str], count: int, costs: Optional[Dict[str, float]] = None) -> List[List[str]]:
+    """
+    Splits names into count shards of about equal total cost (longest processing time first:
+    the most expensive name goes to the least loaded shard). Names without a cost
+    get the average known cost. The result only depends on the names and costs,
+    so every shard process computes the same partition.
+    """
+    costs = costs or {}
+    known = [costs[name] for name in names if name in costs]
+    default = sum(known) / len(known) if known else 1.0
+
+    shards = [[] for _ in range(count)]
+    loads = [0.0] * count
+    for name in sorted(names, key=lambda name: (-costs.get(name, default), name)):
+        lightest = min(range(count), key=lambda i: (loads[i], i))
+        shards[lightest].append(name)
+        loads[lightest] += costs.get(name, default)
+    return shards
+
+
+def shard_file_name(index: int, count: int) -> str:
+    return f"shard_{index}_of_{count}.json"
+
+
+def write_shard_file(path: str, index: int, count: int, report: VerificationReport,
+                     timings: List[Dict[str, Any]], config: Dict[str, Any]):
+    """
+    Writes the partial result of one shard: its verification results and timings.
+    """
+    data = {
+        "shard": [index, count],
+        "config": config,
+        "results": [result.to_dict() for result in report.results],
+        "timings": timings,
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, default=json_default)
+    os.replace(tmp_path, path)
+
+
+def merge_shard_files(paths: List[str]) -> Tuple[VerificationReport, List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Combines the partial result files of all shards of a run into one report.
+    paths may contain glob patterns. Raises ValueError if shards are missing or
+    belong to runs with a different shard count.
+    """
+    files = sorted({match for path in paths for match in (glob.glob(path) or [path])})
+    report = VerificationReport()
+    timings = []
+    config = {}
+    seen = {}
+    for path in files:
+        with open(path, "r") as f:
+            data = json.load(f)
+        index, count = data["shard"]
+        if index in seen:
+            raise ValueError(f"shard {index}/{count} appears twice ({seen[index]} and {path})")
+        seen[index] = path
+        if config and config.get("shards") != count:
+            raise ValueError(f"{path} belongs to a run with {count} shards, not {config['shards']}")
+        config = dict(data["config"], shards=count)
+
+        for result in data["results"]:
+            report.add(TargetResult.from_dict(result))
+        timings.extend(data["timings"])
+
+    missing = [str(i) for i in range(1, config.get("shards", 0) + 1) if i not in seen]
+    if not files or missing:
+        raise ValueError(f"missing shards: {', '.join(missing) or 'all'}")
+    config.pop("shard", None)
+    return report, timings, config
@@ -0,0 +1,194 @@
+import importlib
+import json
+import os
+import shutil
+import subprocess
+from importlib import metadata
+from typing import Dict, Any, List, Optional, Sequence
+
+# other packages register their AnalysisTool subclasses under this entry point group,
+# e.g. in pyproject.toml: [project.entry-points."cpp_analysis_benchmark.tools"] mytool = "pkg.mod:MyTool"
+ENTRY_POINT_GROUP = "cpp_analysis_benchmark.tools"
+
+
+class ToolSpec:
+    """
+    A registered tool: where to import it from ("module:Class"), whether it is a static
+    or a dynamic tool, and the command that tells whether it is installed. Built-in tools
+    declare all of it here; a plugin's kind and probe_command are read from its class,
+    which is only imported once one of them is needed.
+    """
+    def __init__(self, name: str, target: str, kind: Optional[str] = None,
+                 probe_command: Optional[Sequence[str]] = None):
+        self.name = name
+        self.target = target
+        self._kind = kind
+        self._probe_command = list(probe_command) if probe_command else None
+        self.error: Optional[str] = None       # why a plugin could not be imported
+
+    @property
+    def kind(self) -> Optional[str]:
+        self._resolve()
+        return self._kind
+
+    @property
+    def probe_command(self) -> Optional[List[str]]:
+        self._resolve()
+        return self._probe_command
+
+    def _resolve(self):
+        if self._kind is not None or self.error is not None:
+            return
+        try:
+            tool_class = self.load()
+        except Exception as e:
+            self.error = str(e)
+            print(f"Cannot load tool plugin '{self.name}' ({self.target}): {e}")
+            return
+        self._kind = tool_class.kind
+        self._probe_command = list(tool_class.probe_command) if tool_class.probe_command else None
+
+    def load(self) -> type:
+        module_name, _, class_name = self.target.partition(":")
+        return getattr(importlib.import_module(module_name), class_name)
+
+
+class ToolStatus:
+    def __init__(self, available: bool, version: Optional[str] = None, reason: str = ""):
+        self.available = available
+        self.version = version
+        self.reason = reason
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"available": self.available, "version": self.version, "reason": self.reason}
+
+
+BUILTIN_TOOLS = [
+    ToolSpec("cppcheck", "tools.cppcheck_tool:CppcheckTool", "static", ["cppcheck", "--version"]),
+    ToolSpec("clang-tidy", "tools.clang_tidy_tool:ClangTidyTool", "static", ["clang-tidy", "--version"]),
+    ToolSpec("valgrind", "tools.valgrind_tool:ValgrindTool", "dynamic", ["valgrind", "--version"]),
+    # the sanitizer build uses the system C++ compiler
+    ToolSpec("sanitizer", "tools.sanitizer_tool:SanitizerTool", "dynamic", ["c++", "--version"]),
+]
+
+DEFAULT_STATIC_TOOLS = ["cppcheck", "clang-tidy"]
+
+
+class ToolRegistry:
+    """
+    Tools by name: the built-in ones plus those of installed packages (ENTRY_POINT_GROUP).
+    Tool modules are only imported when a tool is probed or created (or filtered by kind). Whether a tool is installed is
+    probed once per binary: the outcome is kept in probe_cache_path and only probed again
+    when the binary changes, so neither listing nor startup runs any tool.
+    """
+    def __init__(self, probe_cache_path: Optional[str] = None):
+        self.specs: Dict[str, ToolSpec] = {spec.name: spec for spec in BUILTIN_TOOLS}
+        self.probe_cache_path = probe_cache_path
+        self._plugins_loaded = False
+        self._probe_cache = None
+        self._statuses: Dict[str, ToolStatus] = {}
+
+    def _load_plugins(self):
+        """Adds the tools of the entry point group, without importing them (see ToolSpec)."""
+        if self._plugins_loaded:
+            return
+        self._plugins_loaded = True
+        for entry_point in metadata.entry_points(group=ENTRY_POINT_GROUP):
+            if entry_point.name not in self.specs:
+                self.specs[entry_point.name] = ToolSpec(entry_point.name, entry_point.value)
+
+    def names(self, kind: Optional[str] = None) -> List[str]:
+        self._load_plugins()
+        return [name for name, spec in self.specs.items() if kind is None or spec.kind == kind]
+
+    def spec(self, name: str) -> ToolSpec:
+        if name not in self.specs:
+            self._load_plugins()
+        if name not in self.specs:
+            raise ValueError(f"unknown tool '{name}' (known tools: {', '.join(self.names())})")
+        return self.specs[name]
+
+    def probe(self, name: str) -> ToolStatus:
+        """Whether the tool is installed, and its version."""
+        if name in self._statuses:
+            return self._statuses[name]
+        spec = self.spec(name)
+        command = spec.probe_command
+        if spec.error is not None:
+            status = ToolStatus(False, reason=f"cannot import {spec.target}")
+        elif not command:
+            status = ToolStatus(True)
+        else:
+            status = self._probe_command(command)
+        self._statuses[name] = status
+        return status
+
+    def _probe_command(self, command: List[str]) -> ToolStatus:
+        path = shutil.which(command[0])
+        if path is None:
+            return ToolStatus(False, reason=f"{command[0]} not found on PATH")
+
+        # a new or updated binary has another key, so it is probed again
+        real_path = os.path.realpath(path)
+        info = os.stat(real_path)
+        key = f"{real_path}:{info.st_mtime_ns}:{info.st_size}:{' '.join(command[1:])}"
+        cache = self._load_probe_cache()
+        if key in cache:
+            return ToolStatus(**cache[key])
+
+        try:
+            result = subprocess.run([path] + command[1:], capture_output=True, text=True, timeout=30)
+            output = (result.stdout or result.stderr).strip()
+            if result.returncode == 0:
+                status = ToolStatus(True, output.splitlines()[0] if output else None)
+            else:
+                status = ToolStatus(False, reason=f"'{' '.join(command)}' exited with {result.returncode}")
+        except (OSError, subprocess.TimeoutExpired) as e:
+            status = ToolStatus(False, reason=str(e))
+
+        cache[key] = status.to_dict()
+        self._save_probe_cache(cache)
+        return status
+
+    def _load_probe_cache(self) -> Dict[str, Dict[str, Any]]:
+        if self._probe_cache is None:
+            self._probe_cache = {}
+            if self.probe_cache_path and os.path.exists(self.probe_cache_path):
+                try:
+                    with open(self.probe_cache_path, "r") as f:
+                        self._probe_cache = json.load(f)
+                except (OSError, ValueError):
+                    pass
+        return self._probe_cache
+
+    def _save_probe_cache(self, cache: Dict[str, Dict[str, Any]]):
+        if not self.probe_cache_path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.probe_cache_path)), exist_ok=True)
+        tmp_path = f"{self.probe_cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.probe_cache_path)
+
+    def create(self, names: Sequence[str]) -> List[Any]:
+        """
+        Instances of the named tools, in order. Tools that are not installed are skipped
+        here, with one message each, instead of failing on every file later.
+        """
+        tools = []
+        for name in names:
+            status = self.probe(name)
+            if not status.available:
+                print(f"Skipping {name}: {status.reason}.")
+                continue
+            tools.append(self.spec(name).load()())
+        return tools
+
+    def format_table(self) -> str:
+        lines = [f"{'Tool':<14}{'Kind':<10}{'Status':<14}Version"]
+        for name in self.names():
+            status = self.probe(name)
+            state = "available" if status.available else "missing"
+            detail = status.version if status.available else status.reason
+            lines.append(f"{name:<14}{self.specs[name].kind or '-':<10}{state:<14}{detail or '-'}")
+        return "\n".join(lines)
@@ -0,0 +1,34 @@
+import contextlib
+import io
+from typing import Dict, Any, Optional, Tuple
+from core import profiler
+
+
+def execute_tool(tool, path: str, **run_options) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Runs a single tool and returns (result, error) instead of raising.
+    """
+    try:
+        return tool.run(path, **run_options), None
+    except Exception as e:
+        return None, str(e)
+
+
+def execute_tool_in_worker(tool, path: str, **run_options) -> Tuple[Optional[Dict[str, Any]], Optional[str], str]:
+    """
+    Pool worker entry point. The tool's own prints are captured and sent back
+    so the parent can replay them in task order. Profile records of the run are
+    sent back in result["profile"].
+    """
+    log = io.StringIO()
+    worker_profiler = profiler.Profiler()
+    previous = profiler.activate(worker_profiler)
+    try:
+        with contextlib.redirect_stdout(log):
+            result, error = execute_tool(tool, path, **run_options)
+    finally:
+        profiler.activate(previous)
+
+    if isinstance(result, dict) and worker_profiler.records:
+        result["profile"] = worker_profiler.records
+    return result, error, log.getvalue()
@@ -0,0 +1,131 @@
+import fcntl
+import hashlib
+import os
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+
+"""
+Run-wide view of valgrind's errors: errors with the same stack signature are grouped
+across all executables, and the suppressions valgrind generated (--gen-suppressions)
+for third-party noise are kept in a suppression file that later runs pass back to it.
+"""
+
+
+def stack_signature(kind: str, stack: Iterable[str]) -> str:
+    """Identifies an error by its kind and call stack, whichever executable reported it."""
+    return hashlib.sha1("\n".join([kind, *stack]).encode()).hexdigest()[:16]
+
+
+class ErrorGroup:
+    def __init__(self, signature: str, bug: Any):
+        self.signature = signature
+        self.type = bug.get("type")
+        self.message = bug.get("message")
+        self.location = f"{bug.get('file')}:{bug.get('line')}" if bug.get("file") else "(third-party)"
+        self.suppression = bug.get("suppression")
+        self.executables: Set[str] = set()
+        self.count = 0
+        self.bytes = 0
+
+
+class ErrorGroups:
+    """Groups the errors of all executables of a run by their stack signature."""
+    def __init__(self):
+        self.groups: Dict[str, ErrorGroup] = {}
+
+    def add(self, executable: str, bugs: Iterable[Any]):
+        for bug in bugs:
+            signature = bug.get("signature")
+            if signature is None:
+                continue        # diagnostics, or findings of other tools
+            group = self.groups.get(signature)
+            if group is None:
+                group = self.groups[signature] = ErrorGroup(signature, bug)
+            group.executables.add(executable)
+            group.count += 1
+            group.bytes += bug.get("bytes") or 0
+
+    def __len__(self) -> int:
+        return len(self.groups)
+
+    def noise(self) -> List[ErrorGroup]:
+        """Groups whose whole stack is outside the program, with the suppression valgrind generated."""
+        return [group for group in self.groups.values() if group.suppression]
+
+    def summary(self, limit: int = 10) -> str:
+        groups = sorted(self.groups.values(), key=lambda group: (-len(group.executables), -group.count))
+        executables = set().union(*(group.executables for group in groups))
+        lines = [f"{sum(group.count for group in groups)} errors in {len(groups)} groups across "
+                 f"{len(executables)} executables ({len(self.noise())} of them third-party noise)"]
+        for group in groups[:limit]:
+            size = f"{group.bytes} bytes" if group.bytes else ""
+            lines.append(f"  {group.count:>4}x in {len(group.executables):>3} executables  {group.type:<24}"
+                         f"{size:>12}  {group.location}  {group.message}")
+        if len(groups) > limit:
+            lines.append(f"  ... and {len(groups) - limit} more groups")
+        return "\n".join(lines)
+
+
+class SuppressionFile:
+    """
+    Persistent valgrind suppression file of known third-party noise. Suppressions are added
+    as valgrind generated them (named after their content, so each is only added once) and
+    the file is passed to later runs with --suppressions, where valgrind no longer reports them.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._known: Set[Tuple[str, ...]] = set()
+        self._pending: List[str] = []
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                for body in self._parse(f.read()):
+                    self._known.add(body)
+
+    def __len__(self) -> int:
+        return len(self._known)
+
+    @staticmethod
+    def _parse(text: str) -> List[Tuple[str, ...]]:
+        """The suppressions of a file, each as its lines without the braces and the name."""
+        suppressions = []
+        current: Optional[List[str]] = None
+        for line in text.splitlines():
+            line = line.strip()
+            if line == "{":
+                current = []
+            elif line == "}" and current is not None:
+                suppressions.append(tuple(current[1:]))
+                current = None
+            elif current is not None and line and not line.startswith("#"):
+                current.append(line)
+        return suppressions
+
+    def add(self, text: str) -> bool:
+        """Adds a suppression valgrind generated; False if it is malformed or already known."""
+        parsed = self._parse(text)
+        if not parsed or not parsed[0] or parsed[0] in self._known:
+            return False
+        body = parsed[0]
+        self._known.add(body)
+        name = "noise-" + hashlib.sha1("\n".join(body).encode()).hexdigest()[:12]
+        self._pending.append("{\n   " + "\n   ".join((name,) + body) + "\n}\n")
+        return True
+
+    def save(self) -> int:
+        """
+        Appends the new suppressions to the file; returns how many were added. Runs sharing
+        the file (shards, watch sessions) take turns: under the lock the file is read again,
+        so a suppression another run added in the meantime is not appended twice.
+        """
+        if not self._pending:
+            return 0
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            f.seek(0)
+            on_disk = set(self._parse(f.read()))
+            new = [text for text in self._pending if self._parse(text)[0] not in on_disk]
+            f.writelines(new)
+            f.flush()
+            self._known.update(on_disk)
+        self._pending = []
+        return len(new)
@@ -0,0 +1,275 @@
+import os
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from core.findings import Findings
+
+# tool specific bug ids -> bug types used in expected_results.json
+TYPE_ALIASES = {
+    # cppcheck
+    "memleak": "memory_leak",
+    "memleakOnRealloc": "memory_leak",
+    "leakReturnValNotUsed": "memory_leak",
+    "leakNoVarFunctionCall": "memory_leak",
+    "leakUnsafeArgAlloc": "memory_leak",
+    "resourceLeak": "memory_leak",
+    "arrayIndexOutOfBounds": "out_of_bounds",
+    "arrayIndexOutOfBoundsCond": "out_of_bounds",
+    "bufferAccessOutOfBounds": "out_of_bounds",
+    "negativeIndex": "out_of_bounds",
+    "outOfBounds": "out_of_bounds",
+    "pointerOutOfBounds": "out_of_bounds",
+    "uninitvar": "uninitialized_variable",
+    "uninitdata": "uninitialized_variable",
+    "uninitStructMember": "uninitialized_variable",
+    "legacyUninitvar": "uninitialized_variable",
+    "mismatchAllocDealloc": "mismatched_free",
+    "doubleFree": "invalid_free",
+    "deallocDealloc": "invalid_free",
+    "deallocuse": "use_after_free",
+    # clang-tidy
+    "clang-analyzer-cplusplus.NewDeleteLeaks": "memory_leak",
+    "clang-analyzer-unix.Malloc": "memory_leak",
+    "clang-analyzer-cplusplus.NewDelete": "use_after_free",
+    "clang-analyzer-unix.MismatchedDeallocator": "mismatched_free",
+    "clang-analyzer-core.uninitialized.Assign": "uninitialized_variable",
+    "clang-analyzer-core.uninitialized.Branch": "uninitialized_variable",
+    "clang-analyzer-core.uninitialized.UndefReturn": "uninitialized_variable",
+    "clang-analyzer-core.UndefinedBinaryOperatorResult": "uninitialized_variable",
+    "clang-analyzer-core.CallAndMessage": "uninitialized_variable",
+    "clang-analyzer-alpha.security.ArrayBound": "out_of_bounds",
+    "clang-analyzer-alpha.security.ArrayBoundV2": "out_of_bounds",
+    "clang-analyzer-security.insecureAPI.strcpy": "out_of_bounds",
+    "bugprone-not-null-terminated-result": "out_of_bounds",
+}
+
+
+def normalize_type(bug_type: str) -> str:
+    return TYPE_ALIASES.get(bug_type, bug_type)
+
+
+@dataclass
+class Counts:
+    tp: int = 0
+    fp: int = 0
+    fn: int = 0
+    duplicates: int = 0     # extra findings of an already matched bug (neither TP nor FP)
+
+    def add(self, other: "Counts"):
+        self.tp += other.tp
+        self.fp += other.fp
+        self.fn += other.fn
+        self.duplicates += other.duplicates
+
+    @property
+    def precision(self) -> Optional[float]:
+        found = self.tp + self.fp
+        return self.tp / found if found else None
+
+    @property
+    def recall(self) -> Optional[float]:
+        expected = self.tp + self.fn
+        return self.tp / expected if expected else None
+
+
+@dataclass
+class TargetResult:
+    """
+    Verification of one tool run on one target (a source file or an executable).
+    counts are kept per (file, bug type); the unmatched bugs are listed for reporting
+    (false negatives are copies of the expected bugs, with their 'file').
+    """
+    tool: str
+    target: str
+    files: List[str]
+    counts: Dict[Tuple[str, str], Counts] = field(default_factory=dict)
+    findings: List[Dict[str, Any]] = field(default_factory=list)
+    false_positives: List[Dict[str, Any]] = field(default_factory=list)
+    false_negatives: List[Dict[str, Any]] = field(default_factory=list)
+    notes: List[Dict[str, Any]] = field(default_factory=list)      # tool diagnostics, e.g. "not installed"
+
+    def finding_file(self, bug: Dict[str, Any]) -> str:
+        """File name a finding is scored under; findings without a 'file' belong to the target's only source."""
+        if bug.get("file"):
+            return os.path.basename(bug["file"])
+        return self.files[0] if len(self.files) == 1 else ""
+
+    def verdicts(self) -> List[str]:
+        """Verdict of every finding, in findings order: 'matched' or 'false_positive'."""
+        false_positives = {id(bug) for bug in self.false_positives}
+        return ["false_positive" if id(bug) in false_positives else "matched" for bug in self.findings]
+
+    @property
+    def total(self) -> Counts:
+        total = Counts()
+        for counts in self.counts.values():
+            total.add(counts)
+        return total
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form (used by the partial result files of shard runs)."""
+        return {
+            "tool": self.tool,
+            "target": self.target,
+            "files": self.files,
+            "counts": [[filename, bug_type, c.tp, c.fp, c.fn, c.duplicates]
+                       for (filename, bug_type), c in self.counts.items()],
+            "findings": self.findings,
+            # indices into findings: object identity does not survive JSON
+            "false_positives": [index for index, verdict in enumerate(self.verdicts()) if verdict == "false_positive"],
+            "false_negatives": self.false_negatives,
+            "notes": self.notes,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TargetResult":
+        result = cls(data["tool"], data["target"], data["files"])
+        for filename, bug_type, tp, fp, fn, duplicates in data["counts"]:
+            result.counts[(filename, bug_type)] = Counts(tp, fp, fn, duplicates)
+        result.findings = data["findings"]
+        result.false_positives = [result.findings[index] for index in data["false_positives"]]
+        result.false_negatives = data["false_negatives"]
+        result.notes = data["notes"]
+        return result
+
+
+class MatchEngine:
+    """
+    Matches found bugs against expected_results.json.
+    Expected bugs are indexed by (file, type) with sorted line numbers; a found bug
+    matches an expected bug of the same file and type at most line_tolerance lines away.
+    Each group is matched with one sorted two-pointer pass, so the cost is
+    O(n log n) in the number of findings.
+    """
+    def __init__(self, ground_truth: Dict[str, Any], line_tolerance: int = 1):
+        self.line_tolerance = line_tolerance
+        self.index = defaultdict(list)      # (file, type) -> sorted expected bugs
+        for item in ground_truth.get("files", []):
+            filename = os.path.basename(item["filename"])
+            for bug in item.get("bugs", []):
+                self.index[(filename, normalize_type(bug.get("type", "unknown")))].append(bug)
+        for bugs in self.index.values():
+            bugs.sort(key=lambda bug: bug.get("line", 0))
+
+        self.types_by_file = defaultdict(list)
+        for filename, bug_type in self.index:
+            self.types_by_file[filename].append(bug_type)
+
+    def match(self, tool: str, target: str, files: List[str], found_bugs: Iterable[Dict[str, Any]]) -> TargetResult:
+        """
+        Verifies the findings of one tool run. files are the source files the target
+        covers: their expected bugs that were not found are false negatives.
+        """
+        files = [os.path.basename(f) for f in files]
+        result = TargetResult(tool, target, files)
+
+        found_groups = defaultdict(list)
+        if isinstance(found_bugs, Findings):
+            self._group_findings(found_bugs, result, found_groups)
+        else:
+            for bug in found_bugs:
+                if "type" not in bug:
+                    result.notes.append(bug)
+                    continue
+                result.findings.append(bug)
+                found_groups[(result.finding_file(bug), normalize_type(bug["type"]))].append(bug)
+
+        keys = set(found_groups)
+        for filename in files:
+            keys.update((filename, bug_type) for bug_type in self.types_by_file.get(filename, []))
+
+        for key in sorted(keys):
+            # expected bugs of files outside the target are not its false negatives
+            expected = self.index.get(key, []) if key[0] in files else []
+            result.counts[key] = self._match_group(key[0], expected, found_groups.get(key, []), result)
+        return result
+
+    @staticmethod
+    def _group_findings(findings: Findings, result: TargetResult, found_groups: Dict[Tuple[str, str], List]):
+        """
+        Same grouping as for bug dicts, done on the columns: the file name and type of
+        each distinct (file, type) pair are resolved once instead of once per finding.
+        """
+        records = list(findings)
+        types = findings.column("type")
+        for (filename, bug_type), indices in findings.group_indices("file", "type").items():
+            if bug_type is not None:
+                key = (result.finding_file({"file": filename}), normalize_type(bug_type))
+                found_groups[key].extend(records[index] for index in indices)
+        for record, bug_type in zip(records, types):
+            (result.notes if bug_type is None else result.findings).append(record)
+
+    def _match_group(self, filename: str, expected: List[Dict[str, Any]], found: List[Dict[str, Any]],
+                     result: TargetResult) -> Counts:
+        counts = Counts()
+        found = sorted(found, key=lambda bug: bug.get("line", 0))
+        tolerance = self.line_tolerance
+        i = j = 0
+        last_matched_line = None
+
+        while j < len(found):
+            line = found[j].get("line", 0)
+            if i < len(expected) and expected[i].get("line", 0) + tolerance < line:
+                # no remaining finding can reach this expected bug
+                result.false_negatives.append(dict(expected[i], file=filename))
+                counts.fn += 1
+                i += 1
+            elif i < len(expected) and abs(expected[i].get("line", 0) - line) <= tolerance:
+                counts.tp += 1
+                last_matched_line = expected[i].get("line", 0)
+                i += 1
+                j += 1
+            elif last_matched_line is not None and abs(line - last_matched_line) <= tolerance:
+                counts.duplicates += 1
+                j += 1
+            else:
+                result.false_positives.append(found[j])
+                counts.fp += 1
+                j += 1
+
+        for bug in expected[i:]:
+            result.false_negatives.append(dict(bug, file=filename))
+            counts.fn += 1
+        return counts
+
+
+class VerificationReport:
+    """
+    All TargetResults of a run, with TP/FP/FN, precision and recall per tool, file and bug type.
+    """
+    def __init__(self):
+        self.results = []
+
+    def add(self, result: TargetResult):
+        self.results.append(result)
+
+    def by_tool(self) -> Dict[str, Counts]:
+        return self._group(lambda result, key: result.tool)
+
+    def by_file(self) -> Dict[Tuple[str, str], Counts]:
+        return self._group(lambda result, key: (result.tool, key[0]))
+
+    def by_type(self) -> Dict[Tuple[str, str], Counts]:
+        return self._group(lambda result, key: (result.tool, key[1]))
+
+    def _group(self, group_key) -> Dict[Any, Counts]:
+        groups = defaultdict(Counts)
+        for result in self.results:
+            for key, counts in result.counts.items():
+                groups[group_key(result, key)].add(counts)
+        return dict(groups)
+
+    def summary(self) -> str:
+        def ratio(value: Optional[float]) -> str:
+            return f"{value:.2f}" if value is not None else "-"
+
+        lines = [f"{'Tool':<24}{'Type':<26}{'TP':>5}{'FP':>5}{'FN':>5}{'Precision':>11}{'Recall':>8}"]
+        by_type = self.by_type()
+        for tool, counts in sorted(self.by_tool().items()):
+            lines.append(f"{tool:<24}{'(all)':<26}{counts.tp:>5}{counts.fp:>5}{counts.fn:>5}"
+                         f"{ratio(counts.precision):>11}{ratio(counts.recall):>8}")
+            for (type_tool, bug_type), type_counts in sorted(by_type.items()):
+                if type_tool == tool:
+                    lines.append(f"{'':<24}{bug_type:<26}{type_counts.tp:>5}{type_counts.fp:>5}{type_counts.fn:>5}"
+                                 f"{ratio(type_counts.precision):>11}{ratio(type_counts.recall):>8}")
+        return "\n".join(lines)
@@ -0,0 +1,299 @@
+import ctypes
+import ctypes.util
+import os
+import re
+import select
+import struct
+import time
+from typing import Dict, List, Optional, Set, Tuple
+from core.verification import TargetResult, VerificationReport
+
+"""
+Watch mode: re-runs only the tool invocations affected by the files saved in the source folder.
+"""
+
+SOURCE_EXTENSIONS = (".c", ".cc", ".cpp", ".cxx", ".h", ".hh", ".hpp", ".hxx")
+INCLUDE = re.compile(r'^\s*#\s*include\s*"([^"]+)"', re.MULTILINE)
+
+# inotify event masks (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")     # wd, mask, cookie, name length
+
+
+class InotifyWatcher:
+    """
+    Reports changed files under root through Linux inotify (via libc, no extra package).
+    Directories created later are watched as well.
+    """
+    def __init__(self, root: str):
+        libc_name = ctypes.util.find_library("c")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.root = root
+        self._fd = self._libc.inotify_init1(os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs = {}     # watch descriptor -> directory
+        for dir_path, _, _ in os.walk(root):
+            self._watch(dir_path)
+
+    def _watch(self, dir_path: str):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dir_path), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"cannot watch {dir_path}")
+        self._dirs[wd] = dir_path
+
+    def _watch_new_dir(self, dir_path: str) -> Set[str]:
+        """
+        Watches a directory created (or moved in) after the start, with its subdirectories.
+        Files written into it before its watch was added raise no event: they are returned as changed.
+        """
+        files = set()
+        for current, _, file_names in os.walk(dir_path):
+            try:
+                self._watch(current)
+            except OSError:
+                continue        # removed again already
+            files.update(os.path.join(current, name) for name in file_names)
+        return files
+
+    def poll(self, timeout: Optional[float]) -> Set[str]:
+        """Paths changed within timeout seconds (None: wait for the first change)."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        data = os.read(self._fd, 64 * 1024)
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                changed.add(self.root)      # events were lost: everything may have changed
+                continue
+            if wd not in self._dirs or not name:
+                continue
+            path = os.path.join(self._dirs[wd], name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    changed |= self._watch_new_dir(path)
+                continue
+            changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    """Reports changed files under root by comparing modification times every interval seconds."""
+
+    def __init__(self, root: str, interval: float = 0.5):
+        self.root = root
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for dir_path, _, file_names in os.walk(self.root):
+            for name in file_names:
+                path = os.path.join(dir_path, name)
+                try:
+                    info = os.stat(path)
+                except OSError:
+                    continue        # removed while scanning
+                snapshot[path] = (info.st_mtime_ns, info.st_size)
+        return snapshot
+
+    def poll(self, timeout: Optional[float]) -> Set[str]:
+        """Paths changed within timeout seconds (None: wait for the first change)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.interval if deadline is None else max(0.0, min(self.interval, deadline - time.monotonic()))
+            time.sleep(wait)
+            snapshot = self._scan()
+            changed = {path for path in snapshot.keys() | self._snapshot.keys()
+                       if snapshot.get(path) != self._snapshot.get(path)}
+            self._snapshot = snapshot
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+
+def create_watcher(root: str, poll_interval: float = 0.5):
+    """inotify where the kernel has it, polling otherwise."""
+    try:
+        return InotifyWatcher(root)
+    except (OSError, AttributeError, TypeError) as e:
+        print(f"inotify is not available ({e}), polling every {poll_interval}s.")
+        return PollingWatcher(root, poll_interval)
+
+
+def wait_for_changes(watcher, debounce: float) -> Set[str]:
+    """
+    Waits for a change and keeps collecting until no file changed for debounce seconds,
+    so an editor's save (or a `git checkout`) becomes a single re-run.
+    """
+    changed = set()
+    while not changed:
+        changed = watcher.poll(None)
+    while True:
+        more = watcher.poll(debounce)
+        if not more:
+            return changed
+        changed |= more
+
+
+class WatchSession:
+    """
+    Keeps a BenchmarkManager's results up to date while the sources change: every
+    batch of saved files re-runs the static tools on the affected sources (sources
+    including a changed header too), rebuilds incrementally and re-runs the dynamic
+    tools on the executables whose target sources were affected.
+    """
+    def __init__(self, manager, debounce: float = 0.5, watcher=None):
+        self.manager = manager
+        self.debounce = debounce
+        self.watcher = watcher
+        self.results: Dict[Tuple[str, str], TargetResult] = {}     # (tool, target) -> latest result
+        manager.incremental = True      # rebuild only what changed
+
+    def run(self):
+        print(f"\n=== Watch mode: {self.manager.src_path} ===")
+        self.manager.dynamic_scheduler.timeouts = self.manager._adaptive_timeouts()
+        # watching starts before the first run, so files saved during it are not missed
+        self.watcher = self.watcher or create_watcher(self.manager.src_path)
+        try:
+            self.run_cycle(None)
+            while True:
+                print(f"\nWatching for changes (Ctrl+C to stop) ...")
+                changed = wait_for_changes(self.watcher, self.debounce)
+                self.run_cycle(changed)
+        except KeyboardInterrupt:
+            print("\nWatch mode stopped.")
+        finally:
+            self.watcher.close()
+
+    def run_cycle(self, changed: Optional[Set[str]]):
+        """Re-runs the work affected by the changed paths (None: everything)."""
+        start = time.perf_counter()
+        manager = self.manager
+        changed_names = None if changed is None else {os.path.basename(path) for path in changed}
+        if changed_names is not None:
+            print(f"\nChanged: {', '.join(sorted(changed_names))}")
+            if os.path.basename(manager.config_path) in changed_names:
+                manager.reload_ground_truth()
+                self.results.clear()
+                changed_names = None        # every verification depends on the ground truth
+            elif changed and manager.src_path in changed:
+                changed_names = None        # the watcher lost events
+            elif "CMakeLists.txt" not in changed_names and not any(
+                    name.endswith(SOURCE_EXTENSIONS) for name in changed_names):
+                print("No sources changed.")
+                return
+
+        files_data = manager.get_files_to_test()
+        affected = self.affected_sources(
+            None if changed_names is None else {self._relative(path) for path in changed})
+        manager.verification = VerificationReport()
+
+        static_files = [item for item in files_data if affected is None or self._relative(item["path"]) in affected]
+        if static_files:
+            print(f"\n=== Static Analysis ({len(static_files)} files) ===")
+            manager._run_static_phase(static_files)
+
+        print(f"\n=== Building Project ===")
+        try:
+            executables = manager.build_project()
+            variant_executables = {name: manager.build_variant(name) for name in manager._variant_names()}
+        except RuntimeError as e:
+            print(e)
+            executables, variant_executables = [], {}
+
+        executables = self.affected_executables(executables, affected)
+        if executables:
+            print(f"\n=== Dynamic Analysis ({len(executables)} executables) ===")
+            manager._run_dynamic_phase(executables, variant_executables)
+
+        self._update_results(manager.verification, files_data)
+        report = VerificationReport()
+        report.results = list(self.results.values())
+        print(f"\n=== Verification Summary ===")
+        print(report.summary())
+        print(f"Updated in {time.perf_counter() - start:.1f}s.")
+
+    def affected_sources(self, changed: Optional[Set[str]]) -> Optional[Set[str]]:
+        """
+        Paths (relative to the source folder) of the source files to re-analyze: the changed ones
+        and those including a changed header (directly or through other headers). None means all of them.
+        """
+        if changed is None or any(os.path.basename(path) == "CMakeLists.txt" for path in changed):
+            return None
+
+        sources = {}        # relative path -> the names of its #include "..." lines
+        for dir_path, _, file_names in os.walk(self.manager.src_path):
+            for name in file_names:
+                if name.endswith(SOURCE_EXTENSIONS):
+                    path = os.path.join(dir_path, name)
+                    try:
+                        with open(path, "r", errors="ignore") as f:
+                            sources[self._relative(path)] = INCLUDE.findall(f.read())
+                    except OSError:
+                        continue
+
+        by_name = {}
+        for path in sources:
+            by_name.setdefault(os.path.basename(path), []).append(path)
+        includes = {}       # relative path -> relative paths of the files it includes
+        for path, headers in sources.items():
+            includes[path] = set()
+            for header in headers:
+                # next to the including file first; found through an include directory otherwise
+                candidate = os.path.normpath(os.path.join(os.path.dirname(path), header))
+                if candidate in sources or not by_name.get(os.path.basename(header)):
+                    includes[path].add(candidate)
+                else:
+                    includes[path].update(by_name[os.path.basename(header)])
+
+        affected = {os.path.normpath(path) for path in changed}
+        while True:
+            more = {name for name, headers in includes.items() if name not in affected and headers & affected}
+            if not more:
+                break
+            affected |= more
+        return affected
+
+    def affected_executables(self, executables: List[str], affected: Optional[Set[str]]) -> List[str]:
+        if affected is None:
+            return executables
+        target_sources = self.manager.builder.target_sources()
+        if target_sources is None:
+            target_sources = self.manager._parse_cmake_targets()
+        return [exe_path for exe_path in executables
+                if {self._relative(source) for source in target_sources.get(os.path.basename(exe_path), [])} & affected]
+
+    def _relative(self, path: str) -> str:
+        """A path of the source folder as affected_sources names it (sources of the build are relative to it)."""
+        if os.path.isabs(path):
+            path = os.path.relpath(path, self.manager.src_path)
+        return os.path.normpath(path)
+
+    def _update_results(self, cycle: VerificationReport, files_data: List[Dict]):
+        for result in cycle.results:
+            self.results[(result.tool, result.target)] = result
+        # results of deleted sources are dropped
+        existing = {item["filename"] for item in files_data}
+        for key, result in list(self.results.items()):
+            if result.target.endswith(SOURCE_EXTENSIONS) and result.target not in existing:
+                del self.results[key]
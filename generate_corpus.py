@@ -0,0 +1,38 @@
+import argparse
+import os
+import sys
+
+sys.path.append(os.getcwd())
+
+from core.corpus_generator import BUG_TEMPLATES, CorpusGenerator
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate a synthetic C++ benchmark corpus with known bugs.")
+    parser.add_argument("--files", type=int, required=True, metavar="N", help="number of source files")
+    parser.add_argument("--output", default=None, metavar="DIR",
+                        help="output folder, inside the project root (default: corpus_<N>)")
+    parser.add_argument("--bugs-per-file", type=int, default=2, metavar="N", help="seeded bugs per file (default: 2)")
+    parser.add_argument("--files-per-target", type=int, default=10, metavar="N",
+                        help="source files linked into each executable (default: 10)")
+    parser.add_argument("--bug-types", default=",".join(sorted(BUG_TEMPLATES)), metavar="TYPES",
+                        help="comma separated bug classes to seed (default: all)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    output = args.output or f"corpus_{args.files}"
+    bug_types = [name.strip() for name in args.bug_types.split(",") if name.strip()]
+    unknown = [name for name in bug_types if name not in BUG_TEMPLATES]
+    if unknown:
+        print(f"Critical Error - unknown bug types: {', '.join(unknown)}")
+        sys.exit(1)
+
+    generator = CorpusGenerator(output, args.files, bugs_per_file=args.bugs_per_file,
+                                files_per_target=args.files_per_target, seed=args.seed, bug_types=bug_types)
+    ground_truth = generator.generate()
+    total_bugs = sum(len(item["bugs"]) for item in ground_truth["files"])
+    print(f"Generated {args.files} files with {total_bugs} bugs in {output}")
+    print(f"Run it with: python run_benchmark.py --src {output}")
@@ -1,17 +1,182 @@
+import argparse
+import json
 import sys
 import os
+import time
 
 sys.path.append(os.getcwd())
 
 from core.benchmark_manager import BenchmarkManager
+from core.reporting import REPORT_FORMATS, ReportWriter
+from core.results_store import ResultsStore, format_diff
+from core.sharding import merge_shard_files, parse_shard
+from core.tool_registry import ToolRegistry
+from core.watch import WatchSession
+
+# the manager keeps its reports and results database here, wherever the script is run from
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_STORE = os.path.join(PROJECT_ROOT, "reports", "results.db")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the C++ analysis tools benchmark.")
+    parser.add_argument("--src", default="src", metavar="DIR",
+                        help="project folder with CMakeLists.txt and expected_results.json (default: src)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of processes for the static analysis phase (default: 1)")
+    parser.add_argument("--project", action="store_true",
+                        help="run static tools once over compile_commands.json instead of once per file")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="build during static analysis and analyze each executable as soon as it is linked")
+    parser.add_argument("--line-tolerance", type=int, default=1, metavar="LINES",
+                        help="how far a finding may be from the expected line and still match (default: 1)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="re-run static tools even on files whose results are cached (and do not share dependency scans)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="reuse the existing build tree instead of a clean rebuild")
+    parser.add_argument("--parallel", type=int, nargs="?", const=0, default=None, metavar="N",
+                        help="parallel build jobs (no value = one per CPU)")
+    parser.add_argument("--ninja", action="store_true", help="build with the Ninja generator")
+    parser.add_argument("--ccache", action="store_true", help="compile through ccache")
+    parser.add_argument("--dynamic-jobs", type=int, default=1, metavar="N",
+                        help="dynamic analysis jobs running at once (default: 1)")
+    parser.add_argument("--job-cpu", type=int, default=None, metavar="SECONDS",
+                        help="CPU time limit of every dynamic analysis job")
+    parser.add_argument("--job-memory", type=int, default=None, metavar="MB",
+                        help="address space limit of every dynamic analysis job")
+    parser.add_argument("--memory-budget", type=int, default=None, metavar="MB",
+                        help="total memory all dynamic analysis jobs may use together")
+    parser.add_argument("--timeout-factor", type=float, default=3.0, metavar="X",
+                        help="dynamic jobs time out after X times their fastest recorded runtime (default: 3)")
+    parser.add_argument("--fast-fail", action="store_true",
+                        help="stop every program at its first definite error (pass/fail runs)")
+    parser.add_argument("--dynamic-tools", default="valgrind", metavar="NAMES",
+                        help="comma separated dynamic tools to run (valgrind, sanitizer); "
+                             "sanitizer runs a separate -fsanitize=address,undefined build")
+    parser.add_argument("--tools", default=None, metavar="NAMES",
+                        help="comma separated tools to run, static and dynamic (overrides --dynamic-tools; "
+                             "see --list-tools)")
+    parser.add_argument("--list-tools", action="store_true",
+                        help="list the registered tools, whether they are installed and their versions, and exit")
+    parser.add_argument("--store", default=None, metavar="PATH",
+                        help="SQLite results database (default: reports/results.db)")
+    parser.add_argument("--no-store", action="store_true", help="do not save this run to the results database")
+    parser.add_argument("--list-runs", action="store_true", help="list the stored runs and exit")
+    parser.add_argument("--diff", nargs=2, type=int, metavar=("BASE", "HEAD"),
+                        help="compare two stored runs and exit")
+    parser.add_argument("--shard", type=parse_shard, default=None, metavar="I/N",
+                        help="analyze only the I-th of N parts of the work and write partial results")
+    parser.add_argument("--merge", nargs="+", default=None, metavar="FILE",
+                        help="combine the partial result files of all shards into one report and exit")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and re-analyze only what each change in the sources affects")
+    parser.add_argument("--debounce", type=float, default=0.5, metavar="SECONDS",
+                        help="watch mode waits until no file changed for this long (default: 0.5)")
+    parser.add_argument("--verbose", action="store_true",
+                        help="print every tool run and its verification instead of a progress bar")
+    parser.add_argument("--report-formats", default=",".join(REPORT_FORMATS), metavar="NAMES",
+                        help=f"comma separated reports written to reports/ after each run "
+                             f"(default: {','.join(REPORT_FORMATS)}; empty for none)")
+    parser.add_argument("--gzip-reports", action="store_true", help="gzip compress the report files")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue an interrupted run from its checkpoint (implies --incremental)")
+    return parser.parse_args()
+
+
+def split_names(value: str):
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def merge_shards(args) -> bool:
+    """Handles --merge; returns False when a benchmark should run instead."""
+    if not args.merge:
+        return False
+
+    report, timings, config = merge_shard_files(args.merge)
+    print(f"=== Verification Summary ({config['shards']} shards) ===")
+    print(report.summary())
+    writer = ReportWriter(os.path.join(PROJECT_ROOT, "reports"), split_names(args.report_formats), args.gzip_reports)
+    paths = writer.write(report, time.strftime("%Y%m%d_%H%M%S") + "_merged")
+    if paths:
+        print(f"Reports: {', '.join(paths)}")
+    if not args.no_store:
+        store_path = args.store or DEFAULT_STORE
+        store = ResultsStore(store_path)
+        try:
+            run_id = store.save_run(report, timings, config)
+        finally:
+            store.close()
+        print(f"Results stored as run #{run_id} in {store_path}")
+    return True
+
+
+def list_tools(args, registry: ToolRegistry) -> bool:
+    """Handles --list-tools; returns False when a benchmark should run instead."""
+    if not args.list_tools:
+        return False
+    print(registry.format_table())
+    return True
+
+
+def query_store(args) -> bool:
+    """Handles the stored-results queries; returns False when a benchmark should run instead."""
+    if not args.list_runs and not args.diff:
+        return False
+
+    store = ResultsStore(args.store or DEFAULT_STORE)
+    try:
+        if args.list_runs:
+            for run in store.list_runs():
+                print(f"#{run['id']}  {run['started_at']}  {json.dumps(run['config'], sort_keys=True)}")
+        if args.diff:
+            print(format_diff(store.diff_runs(*args.diff)))
+    finally:
+        store.close()
+    return True
+
 
 if __name__ == "__main__":
+    args = parse_args()
     try:
-        manager = BenchmarkManager()
+        registry = ToolRegistry(os.path.join(PROJECT_ROOT, ".cache", "tool_probe.json"))
+        if list_tools(args, registry) or query_store(args) or merge_shards(args):
+            sys.exit(0)
+
+        dynamic_tool_names = split_names(args.dynamic_tools)
+        unknown = [name for name in dynamic_tool_names if registry.spec(name).kind != "dynamic"]
+        if unknown:
+            raise ValueError(f"not dynamic tools: {', '.join(unknown)}")
+        tool_names = split_names(args.tools) if args.tools else None
+
+        build_options = {
+            "jobs": args.parallel,
+            "generator": "Ninja" if args.ninja else None,
+            "use_ccache": args.ccache,
+        }
+        dynamic_options = {
+            "max_jobs": args.dynamic_jobs,
+            "cpu_seconds": args.job_cpu,
+            "memory_bytes": args.job_memory * 1024 * 1024 if args.job_memory else None,
+            "memory_budget": args.memory_budget * 1024 * 1024 if args.memory_budget else None,
+            "timeout_factor": args.timeout_factor,
+            "fast_fail": args.fast_fail,
+        }
+        manager = BenchmarkManager(input_dir_name=args.src, workers=args.workers, use_cache=not args.no_cache,
+                                   incremental=args.incremental or args.watch, build_options=build_options,
+                                   dynamic_options=dynamic_options, project_mode=args.project,
+                                   pipelined=args.pipeline, line_tolerance=args.line_tolerance,
+                                   store_path="" if args.no_store else args.store,
+                                   dynamic_tool_names=dynamic_tool_names, shard=args.shard,
+                                   resume=args.resume, tool_names=tool_names, registry=registry,
+                                   verbose=args.verbose or args.watch,
+                                   report_formats=split_names(args.report_formats),
+                                   compress_reports=args.gzip_reports)
         print(f"Project Root detected as: {manager.project_root}")
 
-        manager.run_all_tests()
+        if args.watch:
+            WatchSession(manager, debounce=args.debounce).run()
+        else:
+            manager.run_all_tests()
 
     except Exception as e:
         print(f"Critical Error - {e}")
-
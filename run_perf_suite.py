@@ -0,0 +1,58 @@
+import argparse
+import os
+import sys
+
+sys.path.append(os.getcwd())
+
+from core.perf_suite import compare, default_cases, format_report, load_baseline, run_suite, save_baseline
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+# machine specific: recorded locally with --update-baseline, not part of the repository
+DEFAULT_BASELINE = os.path.join(PROJECT_ROOT, "reports", "perf_baseline.json")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Performance regression suite of the benchmark harness (offline).")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, metavar="PATH",
+                        help="baseline file, recorded on this machine (default: reports/perf_baseline.json)")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed drop of the median throughput (relative to calibration samples) "
+                             "/ growth of peak memory, as a fraction (default: 0.2)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplies the size of every case (default: 1)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="timed samples per case, the median counts (default: 5)")
+    parser.add_argument("--min-time", type=float, default=0.2, metavar="SECONDS",
+                        help="a sample repeats the case for at least this long (default: 0.2)")
+    parser.add_argument("--case", action="append", default=None, metavar="PREFIX",
+                        help="only run cases whose name starts with PREFIX (repeatable)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    cases = default_cases(args.scale)
+    results = run_suite(cases, repeat=args.repeat, selected=args.case, min_time=args.min_time)
+
+    baseline = load_baseline(args.baseline)
+    if baseline is not None and baseline.get("scale") != args.scale:
+        print(f"Baseline was recorded with --scale {baseline.get('scale')}, not comparing.")
+        baseline = None
+
+    regressed = False
+    if baseline is not None:
+        rows = compare(baseline, results, args.threshold,
+                       case_thresholds={case.name: case.threshold for case in cases if case.threshold})
+        print(f"\n=== Performance vs. baseline (threshold {args.threshold:.0%}, "
+              f"throughput changes relative to calibration samples) ===")
+        print(format_report(rows))
+        regressed = any(row["regressed"] for row in rows)
+    elif not args.update_baseline:
+        print(f"\nNo baseline at {args.baseline}; record one with --update-baseline.")
+
+    if args.update_baseline:
+        save_baseline(args.baseline, results, args.scale)
+        print(f"Baseline written to {args.baseline}")
+    elif regressed:
+        print("\nPerformance regression detected.")
+        sys.exit(1)
@@ -0,0 +1,62 @@
+import os
+from core.benchmark_manager import BenchmarkManager
+from tools.analysis_tool import AnalysisTool
+
+"""
+Checks the static analysis phase scheduling of BenchmarkManager with fake tools,
+so no real analyzer has to be installed.
+"""
+
+
+class FakeTool(AnalysisTool):
+    """Reports one bug per file, named after the file."""
+
+    def run_analysis(self, file_path):
+        print(f"[Fake] Analyzing: {os.path.basename(file_path)}")
+        return os.path.basename(file_path)
+
+    def _parse_output(self, output):
+        return {"bugs": [{"message": output, "severity": "error", "line": 1}]}
+
+
+class BrokenTool(AnalysisTool):
+    """Always fails, to check that one failing task does not stop the run."""
+
+    def run_analysis(self, file_path):
+        raise RuntimeError(f"cannot analyze {os.path.basename(file_path)}")
+
+    def _parse_output(self, output):
+        return {"bugs": []}
+
+
+def _static_phase_output(capsys, workers):
+    manager = BenchmarkManager(workers=workers, use_cache=False)
+    manager.static_tools = [FakeTool(), BrokenTool()]
+    manager._run_static_phase(manager.get_files_to_test())
+    return capsys.readouterr().out
+
+
+def test_parallel_output_matches_serial(capsys):
+    """
+    Test scenario: the same tools run with 1 and with 4 workers.
+    Expected Result: identical, ordered console output.
+    """
+    serial = _static_phase_output(capsys, workers=1)
+    parallel = _static_phase_output(capsys, workers=4)
+
+    assert "Using 4 workers." in parallel
+    assert parallel.replace("Using 4 workers.\n", "") == serial
+
+
+def test_failed_task_does_not_abort_run(capsys):
+    """
+    Test scenario: one of the tools raises on every file.
+    Expected Result: the other tool still reports on every file.
+    """
+    output = _static_phase_output(capsys, workers=2)
+    files = BenchmarkManager(use_cache=False).get_files_to_test()
+
+    assert output.count("FAILED.") == len(files)
+    assert output.count("DONE.") == len(files)
+    for file_info in files:
+        assert f"cannot analyze {file_info['filename']}" in output
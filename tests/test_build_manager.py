@@ -0,0 +1,167 @@
+import os
+import shutil
+import pytest
+from core.build_manager import TARGET_BUILT_PATTERNS, BuildManager
+
+"""
+Tests for the incremental / parallel build options of BuildManager.
+The build tests need cmake and a C++ compiler and are skipped without them.
+"""
+
+needs_cmake = pytest.mark.skipif(shutil.which("cmake") is None or shutil.which("c++") is None,
+                                 reason="cmake or a C++ compiler is not installed")
+
+PROJECT_SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+
+def _copy_project(tmp_path):
+    src = tmp_path / "src"
+    shutil.copytree(PROJECT_SRC, src)
+    return str(src)
+
+
+def test_build_command_parallel_jobs(tmp_path):
+    builder = BuildManager(str(tmp_path / "src"), jobs=8)
+    assert builder._build_command()[-2:] == ["--parallel", "8"]
+
+    builder = BuildManager(str(tmp_path / "src"), jobs=0)
+    assert builder._build_command()[-1] == str(os.cpu_count())
+
+    builder = BuildManager(str(tmp_path / "src"))
+    assert "--parallel" not in builder._build_command()
+
+
+def test_variant_uses_own_build_dir_and_flags(tmp_path):
+    """
+    Test scenario: a sanitizer variant of a Ninja build.
+    Expected Result: the variant builds in build-sanitize, keeps the options and adds the flags.
+    """
+    builder = BuildManager(str(tmp_path / "src"), jobs=4)
+    variant = builder.variant("sanitize", ["-fsanitize=address", "-g"])
+
+    assert variant.build_path == str(tmp_path / "build-sanitize")
+    assert variant.jobs == 4
+    assert "-DCMAKE_CXX_FLAGS=-fsanitize=address -g" in variant._configure_command()
+    assert not any("CMAKE_CXX_FLAGS" in arg for arg in builder._configure_command())
+
+
+def test_ccache_launcher_is_removed_when_off(tmp_path, monkeypatch):
+    """
+    Test scenario: a build tree configured with ccache is configured again without it.
+    Expected Result: the launchers are removed from the cache, so the compiler runs directly.
+    """
+    monkeypatch.setattr(shutil, "which", lambda name: "/usr/bin/" + name)
+    launcher = "-DCMAKE_CXX_COMPILER_LAUNCHER=ccache"
+
+    assert launcher in BuildManager(str(tmp_path / "src"), use_ccache=True)._configure_command()
+    command = BuildManager(str(tmp_path / "src"))._configure_command()
+    assert launcher not in command
+    assert {"-UCMAKE_C_COMPILER_LAUNCHER", "-UCMAKE_CXX_COMPILER_LAUNCHER"} <= set(command)
+
+
+def test_stale_build_tree_is_not_reused(tmp_path):
+    """
+    Test scenario: build/CMakeCache.txt was configured from another source folder.
+    Expected Result: the tree cannot be reused.
+    """
+    builder = BuildManager(str(tmp_path / "src"))
+    os.makedirs(builder.build_path)
+    with open(os.path.join(builder.build_path, "CMakeCache.txt"), "w") as f:
+        f.write("CMAKE_HOME_DIRECTORY:INTERNAL=/somewhere/else/src\n")
+        f.write("CMAKE_GENERATOR:INTERNAL=Unix Makefiles\n")
+
+    assert builder._can_reuse_build_tree() is False
+
+
+def test_environment_flags_do_not_invalidate_the_tree(tmp_path):
+    """
+    Test scenario: CMAKE_CXX_FLAGS was seeded from $CXXFLAGS; the harness added no flags of its own.
+    Expected Result: the tree is reused by the plain build, not by an instrumented one.
+    """
+    builder = BuildManager(str(tmp_path / "src"))
+    os.makedirs(builder.build_path)
+    with open(os.path.join(builder.build_path, "CMakeCache.txt"), "w") as f:
+        f.write(f"CMAKE_HOME_DIRECTORY:INTERNAL={tmp_path / 'src'}\n")
+        f.write("CMAKE_CXX_FLAGS:STRING=-O2 -pipe\n")
+        f.write("BENCHMARK_COMPILE_FLAGS:STRING=\n")
+
+    assert builder._can_reuse_build_tree() is True
+    assert BuildManager(str(tmp_path / "src"), compile_flags=["-g"])._can_reuse_build_tree() is False
+
+
+@needs_cmake
+def test_incremental_build_reuses_objects(tmp_path):
+    """
+    Test scenario: the project is built twice in incremental mode, touching one source in between.
+    Expected Result: only the touched source is recompiled.
+    """
+    builder = BuildManager(_copy_project(tmp_path), jobs=2)
+    assert builder.run_build()
+    assert os.path.exists(builder.compile_commands_path)
+
+    objects = {}
+    for root, dirs, files in os.walk(builder.build_path):
+        for name in files:
+            if name.endswith(".o"):
+                objects[name] = os.path.join(root, name)
+    assert set(objects) == {"simple_leak.cpp.o", "vulnerable.cpp.o"}
+    built_at = {name: os.path.getmtime(path) for name, path in objects.items()}
+
+    leak_source = os.path.join(builder.src_path, "simple_leak.cpp")
+    newer = built_at["simple_leak.cpp.o"] + 10
+    os.utime(leak_source, (newer, newer))
+    builder.configured = False      # a new run
+    assert builder.run_build()
+
+    assert os.path.getmtime(objects["vulnerable.cpp.o"]) == built_at["vulnerable.cpp.o"]
+    assert os.path.getmtime(objects["simple_leak.cpp.o"]) != built_at["simple_leak.cpp.o"]
+    assert len(builder.get_executables()) == 2
+
+
+def test_targets_are_only_reported_once_linked():
+    """
+    Test scenario: progress lines of Make and Ninja builds.
+    Expected Result: Make's "Linking" line (printed before the link) is not a built target.
+    """
+    def built(line):
+        matches = [pattern.search(line) for pattern in TARGET_BUILT_PATTERNS]
+        return next((match.group(1) for match in matches if match), None)
+
+    assert built("[ 50%] Linking CXX executable leak_test") is None
+    assert built("[100%] Built target leak_test") == "leak_test"
+    assert built("[3/4] Linking CXX executable leak_test") == "leak_test"
+
+
+@needs_cmake
+def test_linked_targets_are_reported_during_build(tmp_path):
+    """
+    Test scenario: the build is run with an on_target_built callback.
+    Expected Result: the callback gets every executable, which already exists when it is called.
+    """
+    builder = BuildManager(_copy_project(tmp_path))
+    linked = {}
+
+    def on_target_built(target, executable):
+        linked[target] = os.path.isfile(executable)
+
+    assert builder.run_build(on_target_built)
+    assert linked == {"leak_test": True, "vulnerable_test": True}
+
+
+@needs_cmake
+def test_executables_come_from_file_api(tmp_path):
+    """
+    Test scenario: an executable script is left in the build tree next to the real targets.
+    Expected Result: only the EXECUTABLE targets are returned, with their sources.
+    """
+    builder = BuildManager(_copy_project(tmp_path))
+    assert builder.run_build()
+
+    stray = os.path.join(builder.build_path, "helper.sh")
+    with open(stray, "w") as f:
+        f.write("#!/bin/sh\n")
+    os.chmod(stray, 0o755)
+
+    executables = builder.get_executables()
+    assert sorted(os.path.basename(path) for path in executables) == ["leak_test", "vulnerable_test"]
+    assert builder.target_sources() == {"leak_test": ["simple_leak.cpp"], "vulnerable_test": ["vulnerable.cpp"]}
@@ -0,0 +1,66 @@
+import os
+from core.benchmark_manager import BenchmarkManager
+from core.checkpoint import RunJournal
+from tests.test_benchmark_manager import FakeTool
+
+"""
+Tests for the checkpoint journal of interrupted runs and resuming from it.
+"""
+
+IDENTITY = {"src": "/project/src", "shard": None}
+
+
+def test_torn_record_is_skipped(tmp_path):
+    """
+    Test scenario: the run died while writing its third record.
+    Expected Result: the two complete records are resumed, new records still read back.
+    """
+    path = str(tmp_path / "checkpoint.jsonl")
+    journal = RunJournal(path, IDENTITY)
+    journal.record("FakeTool", "a.cpp", {"bugs": []})
+    journal.record("FakeTool", "b.cpp", {"bugs": [{"line": 3}]})
+    journal.close()
+    with open(path, "a") as f:
+        f.write('{"tool": "FakeTool", "target": "c.c')
+
+    journal = RunJournal(path, IDENTITY, resume=True)
+    journal.record("FakeTool", "c.cpp", {"bugs": []})
+    journal.close()
+
+    assert journal.get("FakeTool", "b.cpp") == {"bugs": [{"line": 3}]}
+    assert journal.get("FakeTool", "c.cpp") is None
+    assert RunJournal(path, IDENTITY, resume=True).get("FakeTool", "c.cpp") == {"bugs": []}
+
+
+def test_checkpoint_of_another_run_is_ignored(tmp_path):
+    path = str(tmp_path / "checkpoint.jsonl")
+    journal = RunJournal(path, IDENTITY)
+    journal.record("FakeTool", "a.cpp", {"bugs": []})
+    journal.close()
+
+    assert RunJournal(path, {"src": "/other/src", "shard": None}, resume=True).get("FakeTool", "a.cpp") is None
+    assert RunJournal(path, IDENTITY, resume=True).get("FakeTool", "a.cpp") is None
+
+
+def test_resumed_results_are_not_run_again(tmp_path, capsys):
+    """
+    Test scenario: the checkpoint holds the result of the first file only.
+    Expected Result: the first file is reported from the checkpoint, all others run.
+    """
+    manager = BenchmarkManager(use_cache=False, store_path="")
+    manager.static_tools = [FakeTool()]
+    files = manager.get_files_to_test()
+    path = str(tmp_path / "checkpoint.jsonl")
+    journal = RunJournal(path, IDENTITY)
+    journal.record("FakeTool", files[0]["filename"], {"bugs": []})
+    journal.close()
+
+    manager.journal = RunJournal(path, IDENTITY, resume=True)
+    manager._run_static_phase(files)
+    manager.journal.close(completed=True)
+    output = capsys.readouterr().out
+
+    assert output.count("DONE (resumed).") == 1
+    assert output.count("DONE.") == len(files) - 1
+    assert f"[Fake] Analyzing: {files[0]['filename']}" not in output
+    assert not os.path.exists(path)
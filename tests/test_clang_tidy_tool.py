@@ -0,0 +1,80 @@
+import os
+import stat
+import sys
+from core.benchmark_manager import BenchmarkManager
+from tools.clang_tidy_tool import ClangTidyTool
+
+"""
+Tests for ClangTidyTool. A fake 'clang-tidy' script reports a leak in the analyzed
+file and a warning in a header every file includes, so clang-tidy does not need to be installed.
+"""
+
+FAKE_CLANG_TIDY = f"""#!{sys.executable}
+import os, sys
+source = [arg for arg in sys.argv[1:] if arg.endswith(".cpp")][0]
+header = os.path.join(os.path.dirname(source), "common.h")
+print(f"{{source}}:19:5: warning: Potential leak of memory pointed to by 'ptr' [clang-analyzer-cplusplus.NewDeleteLeaks]")
+print(f"{{source}}:15:16: note: Memory is allocated")
+print(f"{{header}}:3:9: warning: The left operand of '+' is a garbage value [clang-analyzer-core.UndefinedBinaryOperatorResult]")
+print("2 warnings generated.")
+"""
+
+
+def _install_fake_clang_tidy(tmp_path, monkeypatch):
+    script = tmp_path / "bin" / "clang-tidy"
+    script.parent.mkdir()
+    script.write_text(FAKE_CLANG_TIDY)
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{script.parent}{os.pathsep}{os.environ['PATH']}")
+
+
+def test_parse_diagnostics():
+    output = ("/app/src/vulnerable.cpp:9:5: warning: Call to function 'strcpy' is insecure "
+              "[clang-analyzer-security.insecureAPI.strcpy]\n"
+              "    strcpy(buffer, \"ThisStringIsTooLongForBuffer\");\n"
+              "/app/src/vulnerable.cpp:7:1: note: declared here\n"
+              "/app/src/broken.cpp:3:1: error: unknown type name 'foo'\n")
+
+    bugs = ClangTidyTool()._parse_output(output)["bugs"]
+
+    assert [(bug["file"], bug["line"], bug["type"]) for bug in bugs] == [
+        ("vulnerable.cpp", 9, "clang-analyzer-security.insecureAPI.strcpy"),
+        ("broken.cpp", 3, "clang-diagnostic-error"),
+    ]
+
+
+def test_project_mode_tags_header_diagnostics(tmp_path, monkeypatch):
+    """
+    Test scenario: three files including the same header are analyzed with 3 jobs.
+    Expected Result: every file keeps its own leak and the header warning, tagged with the header's path.
+    """
+    _install_fake_clang_tidy(tmp_path, monkeypatch)
+    files = []
+    for name in ["a.cpp", "b.cpp", "c.cpp"]:
+        (tmp_path / name).write_text('#include "common.h"\n')
+        files.append(str(tmp_path / name))
+    (tmp_path / "common.h").write_text("int f();\n")
+
+    results = ClangTidyTool().run_project(str(tmp_path / "build" / "compile_commands.json"), files, jobs=3)
+
+    header = os.path.realpath(str(tmp_path / "common.h"))
+    for path in files:
+        assert [(bug["file"], bug["line"], bug.get("header")) for bug in results[path]["bugs"]] == [
+            (os.path.basename(path), 19, None), ("common.h", 3, header)]
+
+
+def test_header_diagnostics_are_reported_once_with_cached_results():
+    """
+    Test scenario: the results of three files, cached or fresh, all hold the same header warning.
+    Expected Result: the header warning is only reported for the first file, the leaks for every file.
+    """
+    def result(name):
+        return {"bugs": [{"file": name, "line": 19, "type": "leak"},
+                         {"file": "common.h", "line": 3, "type": "garbage", "header": "/src/common.h"}]}
+
+    reported = set()
+    results = [BenchmarkManager._without_repeated_headers(result(name), reported)
+               for name in ["a.cpp", "b.cpp", "c.cpp"]]
+
+    assert [len(item["bugs"]) for item in results] == [2, 1, 1]
+    assert all(item["bugs"][0]["type"] == "leak" for item in results)
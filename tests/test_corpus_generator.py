@@ -0,0 +1,77 @@
+import gzip
+import json
+import os
+import shutil
+import subprocess
+import pytest
+from core.corpus_generator import CorpusGenerator
+from core.verification import MatchEngine, VerificationReport
+from tools.cppcheck_tool import CppcheckTool
+
+"""
+Tests for the synthetic benchmark corpus generator.
+"""
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def test_corpus_matches_its_ground_truth(tmp_path):
+    """
+    Test scenario: a corpus of 25 files with 3 bugs each, 10 files per executable.
+    Expected Result: every recorded bug line holds a seeded bug and every file is in an executable.
+    """
+    output = tmp_path / "corpus"
+    ground_truth = CorpusGenerator(str(output), 25, bugs_per_file=3, files_per_target=10, seed=7).generate()
+
+    with open(output / "expected_results.json") as f:
+        assert json.load(f) == ground_truth
+    assert len(ground_truth["files"]) == 25
+
+    for item in ground_truth["files"]:
+        lines = (output / item["filename"]).read_text().splitlines()
+        assert len(item["bugs"]) == 3
+        for bug in item["bugs"]:
+            assert lines[bug["line"] - 1].endswith("// BUG")
+
+    cmake = (output / "CMakeLists.txt").read_text()
+    assert cmake.count("add_executable(") == 3
+    assert all(item["filename"] in cmake for item in ground_truth["files"])
+
+
+def test_recorded_cppcheck_report_scores_every_seeded_bug(tmp_path):
+    """
+    Test scenario: cppcheck's recorded report on the 500 file corpus (seed 0, 4 bugs per file) is scored
+    against the regenerated ground truth.
+    Expected Result: every seeded bug is found at its recorded line; nothing is a false positive.
+    """
+    ground_truth = CorpusGenerator(str(tmp_path / "corpus_500"), 500, bugs_per_file=4).generate()
+    with gzip.open(os.path.join(FIXTURES, "cppcheck_corpus_500.xml.gz"), "rt") as f:
+        bugs = CppcheckTool()._parse_output(f.read())["bugs"]
+
+    files = [item["filename"] for item in ground_truth["files"]]
+    report = VerificationReport()
+    report.add(MatchEngine(ground_truth).match("CppcheckTool", "corpus_500", files, bugs))
+
+    total = report.by_tool()["CppcheckTool"]
+    assert (total.tp, total.fp, total.fn) == (2000, 0, 0)
+    assert report.by_type()[("CppcheckTool", "memory_leak")].tp > 0
+
+
+def test_same_seed_gives_same_corpus(tmp_path):
+    first = CorpusGenerator(str(tmp_path / "a"), 10, seed=3).generate()
+    second = CorpusGenerator(str(tmp_path / "b"), 10, seed=3).generate()
+    other = CorpusGenerator(str(tmp_path / "c"), 10, seed=4).generate()
+
+    assert first == second
+    assert first != other
+
+
+@pytest.mark.skipif(shutil.which("g++") is None, reason="g++ is not installed")
+def test_generated_sources_compile(tmp_path):
+    output = tmp_path / "corpus"
+    CorpusGenerator(str(output), 4, files_per_target=4).generate()
+    sources = sorted(str(path) for path in output.glob("*.cpp"))
+
+    result = subprocess.run(["g++", "-fsyntax-only", *sources], capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,77 @@
+import json
+import os
+import stat
+import sys
+from tools.cppcheck_tool import CppcheckTool
+
+"""
+Tests for the compile_commands.json project mode of CppcheckTool.
+A fake 'cppcheck' script reports errors for every file of the project it is given,
+so CppCheck does not need to be installed.
+"""
+
+FAKE_CPPCHECK = f"""#!{sys.executable}
+import json, sys
+project = [arg for arg in sys.argv if arg.startswith("--project=")][0].split("=", 1)[1]
+entries = json.load(open(project))
+sys.stderr.write('<?xml version="1.0" encoding="UTF-8"?>\\n<results version="2">\\n<cppcheck version="2.7"/>\\n<errors>\\n')
+for entry in entries:
+    source = entry["file"]
+    header = source.replace(".cpp", ".h")
+    sys.stderr.write(f'<error id="memleak" severity="error" msg="Memory leak: ptr" file0="{{source}}">'
+                     f'<location file="{{source}}" line="19" column="5"/></error>\\n')
+    sys.stderr.write(f'<error id="uninitvar" severity="error" msg="Uninitialized variable: x" file0="{{source}}">'
+                     f'<location file="{{header}}" line="3" column="1"/></error>\\n')
+    sys.stderr.write(f'<error id="missingIncludeSystem" severity="information" msg="Include not found"/>\\n')
+sys.stderr.write('</errors>\\n</results>\\n')
+"""
+
+
+def _setup_project(tmp_path, monkeypatch):
+    script = tmp_path / "bin" / "cppcheck"
+    script.parent.mkdir()
+    script.write_text(FAKE_CPPCHECK)
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{script.parent}{os.pathsep}{os.environ['PATH']}")
+
+    entries = []
+    for name in ["a.cpp", "b.cpp", "c.cpp"]:
+        (tmp_path / name).write_text("int main() { return 0; }\n")
+        entries.append({"directory": str(tmp_path / "build"), "file": str(tmp_path / name),
+                        "command": f"c++ -I/opt/include -c {tmp_path / name}"})
+    compile_commands = tmp_path / "compile_commands.json"
+    compile_commands.write_text(json.dumps(entries))
+    return str(compile_commands)
+
+
+def test_project_results_are_split_per_file(tmp_path, monkeypatch):
+    """
+    Test scenario: two of the three files of the project are analyzed in one invocation.
+    Expected Result: one result per requested file, header findings go to the file they were found through.
+    """
+    compile_commands = _setup_project(tmp_path, monkeypatch)
+    files = [str(tmp_path / "a.cpp"), str(tmp_path / "b.cpp")]
+
+    results = CppcheckTool().run_project(compile_commands, files, jobs=4)
+
+    assert sorted(results) == sorted(files)
+    for path in files:
+        bugs = results[path]["bugs"]
+        assert [(bug["type"], bug["line"]) for bug in bugs] == [("memleak", 19), ("uninitvar", 3)]
+        assert bugs[1]["file"] == path.replace(".cpp", ".h")
+
+
+def test_project_command_uses_jobs():
+    command = CppcheckTool().get_project_command("/tmp/compile_commands.json", 8)
+
+    assert "--project=/tmp/compile_commands.json" in command
+    assert "-j8" in command
+
+
+def test_project_mode_without_cppcheck(tmp_path, monkeypatch):
+    compile_commands = _setup_project(tmp_path, monkeypatch)
+    monkeypatch.setenv("PATH", str(tmp_path / "empty"))
+
+    results = CppcheckTool().run_project(compile_commands, [str(tmp_path / "a.cpp")])
+
+    assert results[str(tmp_path / "a.cpp")]["bugs"][0]["message"] == "Cppcheck not installed"
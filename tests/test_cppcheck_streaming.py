@@ -0,0 +1,75 @@
+import io
+import os
+import stat
+import sys
+from tools.cppcheck_tool import CppcheckTool
+
+"""
+Tests for the incremental parsing of cppcheck's XML report.
+A fake 'cppcheck' script writes a large report, so CppCheck does not need to be installed.
+"""
+
+HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n<results version="2">\n<cppcheck version="2.7"/>\n<errors>\n'
+FOOTER = '</errors>\n</results>\n'
+
+
+def _error(line):
+    return (f'<error id="memleak" severity="error" msg="Memory leak: ptr{line}">'
+            f'<location file="big.cpp" line="{line}" column="5"/></error>\n')
+
+
+FAKE_CPPCHECK = f"""#!{sys.executable}
+import sys
+sys.stderr.write({HEADER!r})
+for line in range(1, 20001):
+    sys.stderr.write('<error id="memleak" severity="error" msg="Memory leak">'
+                     f'<location file="big.cpp" line="{{line}}" column="5"/></error>\\n')
+sys.stderr.write({FOOTER!r})
+"""
+
+
+class CountingStream(io.BytesIO):
+    def __init__(self, data):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def test_bugs_are_yielded_before_the_report_is_read():
+    """
+    Test scenario: a report with many errors is parsed from a stream.
+    Expected Result: the first bug is available after reading only the start of the stream.
+    """
+    report = (HEADER + "".join(_error(line) for line in range(1, 5001)) + FOOTER).encode()
+    stream = CountingStream(report)
+
+    bugs = CppcheckTool().iter_bugs(stream)
+    first = next(bugs)
+
+    assert (first["file"], first["line"], first["type"]) == ("big.cpp", 1, "memleak")
+    assert stream.bytes_read < len(report) // 2
+    assert len(list(bugs)) == 4999
+
+
+def test_truncated_report_keeps_parsed_errors():
+    text = HEADER + _error(3) + _error(7) + '<error id="memleak" severity="err'
+
+    bugs = CppcheckTool()._parse_output(text)["bugs"]
+
+    assert [bug["line"] for bug in bugs] == [3, 7]
+
+
+def test_run_streams_report_from_process(tmp_path, monkeypatch):
+    script = tmp_path / "cppcheck"
+    script.write_text(FAKE_CPPCHECK)
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+
+    bugs = CppcheckTool().run(str(tmp_path / "big.cpp"))["bugs"]
+
+    assert len(bugs) == 20000
+    assert bugs[-1]["line"] == 20000
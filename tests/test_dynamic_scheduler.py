@@ -0,0 +1,86 @@
+import os
+import subprocess
+from core.dynamic_scheduler import DynamicScheduler, adaptive_timeouts
+from tools.analysis_tool import AnalysisTool
+from tools.sanitizer_tool import SanitizerTool
+from tools.valgrind_tool import ValgrindTool
+
+"""
+Tests for the concurrent dynamic analysis scheduler, using a shell command instead of Valgrind.
+"""
+
+
+class ShellTool(AnalysisTool):
+    """Reports the working directory and the limits its child process ran with."""
+
+    def run_analysis(self, path, cwd=None, limits=None):
+        result = subprocess.run(["sh", "-c", "pwd; ulimit -t; ulimit -v; touch out.txt"],
+                                capture_output=True, text=True, cwd=cwd,
+                                preexec_fn=limits.apply if limits else None)
+        return result.stdout
+
+    def _parse_output(self, output):
+        work_dir, cpu, memory = output.split()
+        return {"bugs": [], "work_dir": work_dir, "cpu": cpu, "memory": memory}
+
+
+class FailingTool(AnalysisTool):
+    def run_analysis(self, path, cwd=None, limits=None):
+        raise RuntimeError(f"{path} crashed")
+
+    def _parse_output(self, output):
+        return {"bugs": []}
+
+
+def test_jobs_are_isolated_and_limited():
+    """
+    Test scenario: four jobs run two at a time with CPU and memory limits.
+    Expected Result: each job ran in its own (removed) directory with the limits applied.
+    """
+    scheduler = DynamicScheduler(max_jobs=2, cpu_seconds=30, memory_bytes=512 * 1024 * 1024)
+    jobs = [(ShellTool(), f"/bin/target_{i}") for i in range(4)]
+
+    outcomes = list(scheduler.run(jobs))
+
+    assert [error for _, error, _ in outcomes] == [None] * 4
+    work_dirs = [result["work_dir"] for result, _, _ in outcomes]
+    assert len(set(work_dirs)) == 4
+    for i, work_dir in enumerate(work_dirs):
+        assert os.path.basename(work_dir).startswith(f"target_{i}-")
+        assert not os.path.exists(work_dir)
+    assert {result["cpu"] for result, _, _ in outcomes} == {"30"}
+    assert {result["memory"] for result, _, _ in outcomes} == {str(512 * 1024)}
+
+
+def test_memory_budget_bounds_concurrency():
+    assert DynamicScheduler(max_jobs=16, memory_bytes=4 << 30, memory_budget=16 << 30).concurrency == 4
+    assert DynamicScheduler(max_jobs=2, memory_bytes=4 << 30, memory_budget=64 << 30).concurrency == 2
+    assert DynamicScheduler(max_jobs=8, memory_budget=16 << 30).limits.memory_bytes == 2 << 30
+
+
+def test_failing_job_keeps_order():
+    jobs = [(ShellTool(), "/bin/a"), (FailingTool(), "/bin/b"), (ShellTool(), "/bin/c")]
+
+    outcomes = list(DynamicScheduler(max_jobs=3).run(jobs))
+
+    assert outcomes[1][1] == "/bin/b crashed"
+    assert outcomes[0][1] is None and outcomes[2][1] is None
+    assert os.path.basename(outcomes[2][0]["work_dir"]).startswith("c-")
+
+
+def test_adaptive_timeouts_from_history():
+    """
+    Test scenario: valgrind ran app_a before, only the (2x slower) sanitizer ran app_b.
+    Expected Result: app_a times out at 3x its runtime; app_b's valgrind timeout is scaled by
+    the slowdowns; very short runs get the minimum; unknown executables keep the fixed timeout.
+    """
+    runtimes = {("ValgrindTool", "app_a"): 4.0, ("SanitizerTool", "app_b"): 1.0,
+                ("ValgrindTool", "app_c"): 0.1, ("CppcheckTool", "a.cpp"): 2.0}
+
+    timeouts = adaptive_timeouts(runtimes, [ValgrindTool(), SanitizerTool()], factor=3.0)
+
+    assert timeouts[("ValgrindTool", "app_a")] == 12.0
+    assert timeouts[("ValgrindTool", "app_b")] == 1.0 / 2 * 30 * 3
+    assert timeouts[("SanitizerTool", "app_b")] == 5.0
+    assert timeouts[("ValgrindTool", "app_c")] == 5.0
+    assert not any(target == "a.cpp" for _, target in timeouts)
@@ -0,0 +1,60 @@
+import json
+import pickle
+from core.findings import Findings, json_default
+from core.verification import MatchEngine
+
+"""
+Tests for the compact findings container.
+"""
+
+BUGS = [
+    {"message": "Memory leak: ptr", "severity": "error", "line": 19, "file": "src/a.cpp", "type": "memleak"},
+    {"message": "Array index out of bounds", "severity": "error", "line": 9, "file": "src/a.cpp",
+     "type": "arrayIndexOutOfBounds"},
+    {"message": "Unused variable", "severity": "style", "line": 4, "file": "src/b.cpp", "type": "unusedVariable",
+     "stack": ["main (b.cpp:4)"]},
+    {"message": "Cppcheck not installed", "severity": "critical", "line": 0},
+]
+
+
+def test_records_read_like_bug_dicts():
+    findings = Findings(BUGS)
+
+    assert len(findings) == 4
+    assert findings == BUGS
+    assert findings[0]["line"] == 19 and findings[-1].get("type") is None
+    assert "type" not in findings[3] and "stack" in findings[2]
+    # repeated strings are shared between the findings, not copied
+    assert findings.column("file")[0] is findings.column("file")[1]
+
+
+def test_group_on_columns():
+    findings = Findings(BUGS)
+
+    assert findings.group_indices("file")[("src/a.cpp",)] == [0, 1]
+    assert findings.group_indices("file", "type")[("src/b.cpp", "unusedVariable")] == [2]
+    assert findings[2]["stack"] == ("main (b.cpp:4)",)
+
+
+def test_serialized_as_bug_lists():
+    findings = Findings(BUGS)
+
+    assert json.loads(json.dumps({"bugs": findings}, default=json_default)) == {"bugs": BUGS}
+    assert pickle.loads(pickle.dumps(findings)) == BUGS
+
+
+def test_matching_is_the_same_for_dicts_and_findings():
+    """
+    Test scenario: the same findings are verified as bug dicts and as a Findings container.
+    Expected Result: identical counts, false positives and notes.
+    """
+    ground_truth = {"files": [{"filename": "a.cpp", "bugs": [{"line": 19, "type": "memory_leak"},
+                                                             {"line": 30, "type": "out_of_bounds"}]}]}
+    engine = MatchEngine(ground_truth)
+
+    from_dicts = engine.match("CppcheckTool", "a.cpp", ["a.cpp"], BUGS)
+    from_findings = engine.match("CppcheckTool", "a.cpp", ["a.cpp"], Findings(BUGS))
+
+    assert from_findings.counts == from_dicts.counts
+    assert from_findings.false_positives == from_dicts.false_positives
+    assert from_findings.notes == from_dicts.notes
@@ -0,0 +1,59 @@
+from core.perf_suite import compare, default_cases, format_report, run_suite, save_baseline, load_baseline
+
+"""
+Tests for the performance regression suite: the cases run offline at a tiny scale,
+and the comparison flags throughput and memory regressions.
+"""
+
+
+def test_all_cases_run_offline():
+    results = run_suite(default_cases(scale=0.01), repeat=1, min_time=0)
+
+    assert set(results) == {"calibration", "parse/cppcheck", "parse/cppcheck_corpus", "parse/valgrind", "verification/match",
+                            "discovery/file_api", "scheduling/task_graph", "scheduling/dynamic_jobs"}
+    # 200 replicated errors, the recorded report has 1 information message per 4 errors
+    assert results["parse/cppcheck"]["items"] == 150
+    assert all(result["throughput"] > 0 for result in results.values())
+    assert all(result["relative"] > 0 for name, result in results.items() if name != "calibration")
+
+
+def test_regressions_beyond_threshold_are_reported(tmp_path):
+    """
+    Test scenario: one case got 50% slower, another uses 2 MB more memory, a third is 10% slower.
+    Expected Result: the first two are regressions, the third is within the 20% threshold.
+    """
+    baseline_path = str(tmp_path / "baseline.json")
+    save_baseline(baseline_path, {
+        "parse/cppcheck": {"throughput": 1000.0, "peak_kb": 1000},
+        "parse/valgrind": {"throughput": 1000.0, "peak_kb": 1000},
+        "verification/match": {"throughput": 1000.0, "peak_kb": 1000},
+    }, scale=1.0)
+    results = {
+        "parse/cppcheck": {"throughput": 500.0, "peak_kb": 1000},
+        "parse/valgrind": {"throughput": 1000.0, "peak_kb": 3048},
+        "verification/match": {"throughput": 900.0, "peak_kb": 1000},
+    }
+
+    rows = compare(load_baseline(baseline_path), results, threshold=0.2)
+
+    regressed = {(row["case"], row["metric"]) for row in rows if row["regressed"]}
+    assert regressed == {("parse/cppcheck", "throughput"), ("parse/valgrind", "peak_kb")}
+    assert format_report(rows).count("REGRESSION") == 2
+
+
+def test_throughput_is_compared_relative_to_the_calibration_case():
+    """
+    Test scenario: the whole run is twice as slow (another machine); then only one case is.
+    Expected Result: the uniform slowdown is no regression, the slower case is.
+    """
+    baseline = {"cases": {"calibration": {"throughput": 1000.0, "peak_kb": 100},
+                          "parse/cppcheck": {"throughput": 1000.0, "relative": 1.0, "peak_kb": 1000},
+                          "verification/match": {"throughput": 1000.0, "relative": 1.0, "peak_kb": 1000}}}
+    slower_machine = {"calibration": {"throughput": 500.0, "peak_kb": 100},
+                      "parse/cppcheck": {"throughput": 500.0, "relative": 1.0, "peak_kb": 1000},
+                      "verification/match": {"throughput": 500.0, "relative": 1.0, "peak_kb": 1000}}
+    slower_case = dict(slower_machine, **{"parse/cppcheck": {"throughput": 250.0, "relative": 0.5, "peak_kb": 1000}})
+
+    assert not any(row["regressed"] for row in compare(baseline, slower_machine))
+    regressed = [(row["case"], row["metric"]) for row in compare(baseline, slower_case) if row["regressed"]]
+    assert regressed == [("parse/cppcheck", "throughput")]
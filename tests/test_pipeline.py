@@ -0,0 +1,104 @@
+import threading
+import time
+from core.pipeline import TaskGraph
+
+"""
+Tests for the dependency-aware TaskGraph used by the pipelined benchmark run.
+"""
+
+
+def test_dependencies_run_first_and_independent_tasks_overlap():
+    """
+    Test scenario: 'build' depends on 'configure', 'static' depends on nothing.
+    Expected Result: 'static' runs while 'configure' and 'build' run, 'build' starts after 'configure'.
+    """
+    events = []
+    static_started = threading.Event()
+
+    def configure():
+        static_started.wait(timeout=5)
+        events.append("configure")
+
+    def build():
+        events.append("build")
+        return ["exe"]
+
+    graph = TaskGraph(max_workers=4)
+    graph.add("configure", configure)
+    graph.add("build", build, deps=["configure"])
+    graph.add("static", lambda: static_started.set())
+
+    outcomes = graph.run()
+
+    assert static_started.is_set()
+    assert events == ["configure", "build"]
+    assert outcomes["build"] == (["exe"], None, "")
+
+
+def test_tasks_added_while_running():
+    graph = TaskGraph(max_workers=2)
+
+    def build():
+        for name in ["a", "b"]:
+            graph.add(f"dynamic:{name}", lambda name=name: name.upper())
+            time.sleep(0.01)
+        return "built"
+
+    graph.add("build", build)
+    outcomes = graph.run()
+
+    assert outcomes["dynamic:a"][0] == "A"
+    assert outcomes["dynamic:b"][0] == "B"
+
+
+def test_failure_skips_dependents_only():
+    def fail():
+        raise RuntimeError("configure failed")
+
+    graph = TaskGraph()
+    graph.add("configure", fail)
+    graph.add("build", lambda: "built", deps=["configure"])
+    graph.add("link", lambda: "linked", deps=["build"])
+    graph.add("static", lambda: "analyzed")
+    graph.add("orphan", lambda: None, deps=["never-added"])
+
+    outcomes = graph.run()
+
+    assert outcomes["configure"][1] == "configure failed"
+    assert outcomes["build"][1] == "dependency failed: configure"
+    assert outcomes["link"][1] == "dependency failed: build"
+    assert outcomes["static"] == ("analyzed", None, "")
+    assert outcomes["orphan"][1] == "missing dependency: never-added"
+
+
+def test_task_output_is_captured_per_task(capsys):
+    graph = TaskGraph(max_workers=2)
+    graph.add("one", lambda: print("from one"))
+    graph.add("two", lambda: print("from two"))
+    print("from main")
+
+    outcomes = graph.run()
+
+    assert outcomes["one"][2] == "from one\n"
+    assert outcomes["two"][2] == "from two\n"
+    assert capsys.readouterr().out == "from main\n"
+
+
+def test_long_chain_added_in_reverse_runs_in_order():
+    """
+    Test scenario: a chain of 2000 tasks is added last task first, plus one task that needs all of them
+    (one dependency listed twice).
+    Expected Result: every task runs exactly once, after its dependency; the final task runs last.
+    """
+    order = []
+    graph = TaskGraph(max_workers=4)
+    size = 2000
+    for index in reversed(range(size)):
+        graph.add(f"step{index}", lambda index=index: order.append(index),
+                  deps=[f"step{index - 1}"] if index else [])
+    graph.add("report", lambda: order.append("report"), deps=[f"step{index}" for index in range(size)] + ["step0"])
+
+    outcomes = graph.run()
+
+    assert order == list(range(size)) + ["report"]
+    assert all(error is None for _, error, _ in outcomes.values())
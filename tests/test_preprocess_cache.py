@@ -0,0 +1,152 @@
+import os
+import shutil
+import pytest
+from core.benchmark_manager import BenchmarkManager
+from core.preprocess_cache import PreprocessCache, preprocessor_for
+from core.result_cache import ResultCache
+from tests.test_result_cache import CountingTool
+from tools.cppcheck_tool import CppcheckTool
+
+"""
+Tests for the dependency scans and build dirs the static tools share.
+"""
+
+needs_gxx = pytest.mark.skipif(shutil.which("g++") is None, reason="g++ is not installed")
+
+
+def _write_sources(src):
+    src.mkdir()
+    (src / "util.h").write_text("inline int twice(int x) { return 2 * x; }\n")
+    (src / "a.cpp").write_text('#include "util.h"\nint main() {\n    int* p = new int[4];\n    return twice(p[0]);\n}\n')
+
+
+def test_preprocessor_follows_the_language():
+    assert preprocessor_for("/src/a.c") == "gcc"
+    assert [preprocessor_for(f"/src/a.{ext}") for ext in ["cpp", "cc", "cxx", "C"]] == ["g++"] * 4
+
+
+@needs_gxx
+def test_dependencies_are_reused_until_a_header_changes(tmp_path):
+    """
+    Test scenario: the same file is scanned twice, then its header changes.
+    Expected Result: the second request reuses the manifest; after the change, the new header hash is recorded.
+    """
+    _write_sources(tmp_path / "src")
+    source = str(tmp_path / "src" / "a.cpp")
+    header = str(tmp_path / "src" / "util.h")
+    cache = PreprocessCache(str(tmp_path / "cache"))
+
+    first = cache.dependencies(source)
+    manifest = os.path.join(str(tmp_path / "cache"), "deps", first.key + ".json")
+    mtime = os.stat(manifest).st_mtime_ns
+    second = cache.dependencies(source)
+
+    assert list(first.headers) == [header]
+    assert second.headers == first.headers and os.stat(manifest).st_mtime_ns >= mtime
+
+    (tmp_path / "src" / "util.h").write_text("inline int twice(int x) { return x + x; }\n")
+    assert cache._valid_manifest(manifest[:-len(".json")]) is None
+    assert cache.dependencies(source).headers[header] != first.headers[header]
+
+
+@needs_gxx
+def test_result_cache_keys_use_the_shared_scan(tmp_path):
+    """
+    Test scenario: a header is included through an include directory the #include scan does not know.
+    Expected Result: with the preprocessor's dependencies, changing the header changes the cache key.
+    """
+    (tmp_path / "include").mkdir()
+    (tmp_path / "include" / "util.h").write_text("#define SIZE 4\n")
+    (tmp_path / "a.cpp").write_text('#include "util.h"\nint data[SIZE];\n')
+    source = str(tmp_path / "a.cpp")
+    flags = [f"-I{tmp_path / 'include'}"]
+    cache = PreprocessCache(str(tmp_path / "cache"))
+    results = ResultCache(str(tmp_path / "results"))
+
+    key = results.make_key(CountingTool(), source, headers=cache.dependencies(source, flags).headers)
+    (tmp_path / "include" / "util.h").write_text("#define SIZE 8\n")
+
+    assert results.make_key(CountingTool(), source, headers=cache.dependencies(source, flags).headers) != key
+
+
+def test_failed_scan_falls_back_to_the_include_lines(tmp_path, monkeypatch):
+    (tmp_path / "a.cpp").write_text('#include "missing.h"\nint main() { return 0; }\n')
+    monkeypatch.setenv("PATH", str(tmp_path / "no-bin"))
+
+    assert PreprocessCache(str(tmp_path / "cache")).dependencies(str(tmp_path / "a.cpp")) is None
+
+
+def test_cppcheck_gets_a_build_dir_per_file(tmp_path):
+    tool = CppcheckTool()
+    assert not any(arg.startswith("--cppcheck-build-dir") for arg in tool.get_command("/src/a.cpp"))
+
+    tool.preprocess_cache = PreprocessCache(str(tmp_path / "cache"))
+    build_dirs = {arg for path in ["/src/a.cpp", "/other/a.cpp"] for arg in tool.get_command(path)
+                  if arg.startswith("--cppcheck-build-dir=")}
+
+    assert len(build_dirs) == 2
+    assert all(os.path.isdir(arg.split("=", 1)[1]) for arg in build_dirs)
+
+
+def test_project_build_dir_follows_the_real_compile_commands(tmp_path, monkeypatch):
+    """
+    Test scenario: cppcheck analyzes two different subsets of the same project.
+    Expected Result: both runs use the build dir of the real compile_commands.json, not of the filtered copy.
+    """
+    compile_commands = tmp_path / "build" / "compile_commands.json"
+    compile_commands.parent.mkdir()
+    compile_commands.write_text('[{"directory": "/src", "file": "a.cpp"}, {"directory": "/src", "file": "b.cpp"}]')
+    commands = []
+
+    def fake_popen(command, **kwargs):
+        commands.append(command)
+        raise FileNotFoundError
+
+    monkeypatch.setattr("core.profiler.MeasuredPopen", fake_popen)
+    tool = CppcheckTool()
+    tool.preprocess_cache = PreprocessCache(str(tmp_path / "cache"))
+    tool.run_project(str(compile_commands), ["/src/a.cpp"])
+    tool.run_project(str(compile_commands), ["/src/b.cpp"])
+
+    build_dirs = [arg for command in commands for arg in command if arg.startswith("--cppcheck-build-dir=")]
+    assert len(build_dirs) == 2 and build_dirs[0] == build_dirs[1]
+    assert build_dirs[0] == f"--cppcheck-build-dir={tool.preprocess_cache.cppcheck_build_dir(str(compile_commands))}"
+
+
+def test_eviction_includes_the_build_dirs(tmp_path):
+    """
+    Test scenario: the cppcheck build dirs of three files outgrow the cache limit.
+    Expected Result: the least recently used build dir is deleted until the cache is under 90% of its limit.
+    """
+    cache = PreprocessCache(str(tmp_path / "cache"), max_bytes=2500)
+    build_dirs = []
+    for index, name in enumerate(["/src/a.cpp", "/src/b.cpp", "/src/c.cpp"]):
+        path = cache.cppcheck_build_dir(name)
+        with open(os.path.join(path, "a.a1"), "w") as f:
+            f.write("x" * 1000)
+        os.utime(path, (index, index))
+        build_dirs.append(path)
+
+    cache.evict()
+
+    assert [os.path.isdir(path) for path in build_dirs] == [False, True, True]
+
+
+@needs_gxx
+def test_dependency_scans_run_on_the_workers(tmp_path):
+    """
+    Test scenario: the static phase of a parallel run looks up the cache of several files.
+    Expected Result: the -MM scans ran on the pool, so the lookups in this process find them done.
+    """
+    _write_sources(tmp_path / "src")
+    (tmp_path / "src" / "b.cpp").write_text('#include "util.h"\nint main() { return twice(1); }\n')
+    (tmp_path / "src" / "expected_results.json").write_text('{"files": []}')
+    manager = BenchmarkManager(input_dir_name=str(tmp_path / "src"), workers=2, use_cache=False, store_path="")
+    manager.cache = ResultCache(str(tmp_path / "results"))
+    manager.preprocess_cache = PreprocessCache(str(tmp_path / "cache"))
+    files = [{"path": str(tmp_path / "src" / name), "filename": name} for name in ["a.cpp", "b.cpp"]]
+
+    manager._scan_dependencies(files)
+
+    assert sorted(manager._dependencies) == sorted(file_info["path"] for file_info in files)
+    assert all(list(deps.headers) == [str(tmp_path / "src" / "util.h")] for deps in manager._dependencies.values())
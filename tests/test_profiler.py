@@ -0,0 +1,100 @@
+import csv
+import json
+import subprocess
+import sys
+import pytest
+from core import profiler
+from core.tool_runner import execute_tool_in_worker
+from tools.analysis_tool import AnalysisTool
+
+"""
+Tests for the run profiler: per-process resource usage, spans and the written profile.
+"""
+
+BUSY_LOOP = [sys.executable, "-c", "sum(range(3_000_000)); print('x' * 100)"]
+
+
+class BusyTool(AnalysisTool):
+    """Fake tool whose 'analysis' is a short CPU-bound child process."""
+
+    def run_analysis(self, file_path):
+        return profiler.run_process(BUSY_LOOP, stdout=subprocess.PIPE, text=True).stdout
+
+    def _parse_output(self, output):
+        return {"bugs": []}
+
+
+def test_run_process_records_child_usage():
+    """
+    Test scenario: a CPU-bound child process runs inside a span.
+    Expected Result: its CPU time, peak RSS and output size are added to the span.
+    """
+    with profiler.span("tool", "busy") as record:
+        result = profiler.run_process(BUSY_LOOP, stdout=subprocess.PIPE, text=True)
+
+    assert result.returncode == 0
+    assert record["processes"] == 1
+    assert record["user_s"] > 0
+    assert record["max_rss_kb"] > 1000
+    assert record["output_bytes"] == 101
+    assert record["wall_s"] > 0
+
+
+def test_wait_with_timeout_keeps_child_usage():
+    """
+    Test scenario: waiting for a child times out once, then the child is waited for until it exits.
+    Expected Result: the timeout is raised as with Popen; the exit code and resource usage are kept.
+    """
+    process = profiler.MeasuredPopen([sys.executable, "-c", "import time; time.sleep(0.3); sum(range(10**6))"])
+    with pytest.raises(subprocess.TimeoutExpired):
+        process.wait(timeout=0.01)
+
+    assert process.wait(timeout=10) == 0
+    assert process.rusage is not None and process.rusage.ru_utime > 0
+
+
+def test_processes_go_to_innermost_span():
+    run_profile = profiler.Profiler()
+    previous = profiler.activate(run_profile)
+    try:
+        with profiler.span("manager", "phase") as outer:
+            with profiler.span("tool", "inner") as inner:
+                profiler.run_process(["true"])
+    finally:
+        profiler.activate(previous)
+
+    assert inner["processes"] == 1 and outer["processes"] == 0
+    assert [r["name"] for r in run_profile.records] == ["inner", "phase"]
+
+
+def test_worker_ships_profile_with_result():
+    result, error, log = execute_tool_in_worker(BusyTool(), "src/simple_leak.cpp")
+
+    assert error is None
+    records = result["profile"]
+    assert len(records) == 1
+    assert records[0]["name"] == "BusyTool"
+    assert records[0]["target"] == "src/simple_leak.cpp"
+    assert records[0]["user_s"] > 0
+
+
+def test_profile_files_and_summary(tmp_path):
+    run_profile = profiler.Profiler()
+    previous = profiler.activate(run_profile)
+    try:
+        for target in ["a.cpp", "b.cpp"]:
+            BusyTool().run(target)
+    finally:
+        profiler.activate(previous)
+
+    json_path, csv_path = run_profile.write(str(tmp_path), "test")
+
+    with open(json_path) as f:
+        assert len(json.load(f)["records"]) == 2
+    with open(csv_path) as f:
+        rows = list(csv.DictReader(f))
+    assert [row["target"] for row in rows] == ["a.cpp", "b.cpp"]
+
+    summary = run_profile.summary()
+    assert "BusyTool" in summary
+    assert "Slowest 10 tool runs:" in summary
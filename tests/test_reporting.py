@@ -0,0 +1,99 @@
+import gzip
+import io
+import json
+import xml.etree.ElementTree as ET
+from core.benchmark_manager import BenchmarkManager
+from core.findings import Findings
+from core.reporting import ProgressBar, ReportWriter
+from core.verification import MatchEngine, VerificationReport
+from tests.test_benchmark_manager import FakeTool
+
+"""
+Tests for the consolidated report files and the compact console output.
+"""
+
+GROUND_TRUTH = {"files": [{"filename": "a.cpp", "bugs": [{"line": 9, "type": "out_of_bounds"},
+                                                         {"line": 15, "type": "memory_leak"}]}]}
+
+BUGS = [
+    {"message": "Array index out of bounds", "severity": "error", "line": 9, "file": "a.cpp",
+     "type": "arrayIndexOutOfBounds"},
+    {"message": "Unused variable", "severity": "style", "line": 4, "file": "a.cpp", "type": "unusedVariable"},
+    {"message": "Checker crashed", "severity": "critical", "line": 0},
+]
+
+
+def _report() -> VerificationReport:
+    report = VerificationReport()
+    report.add(MatchEngine(GROUND_TRUTH).match("CppcheckTool", "a.cpp", ["a.cpp"], Findings(BUGS)))
+    return report
+
+
+def test_reports_hold_every_verdict(tmp_path):
+    """
+    Test scenario: one target with a matched finding, a false positive, a missed bug and a tool note.
+    Expected Result: JSONL has one record per verdict, SARIF the two findings, JUnit one failed test case.
+    """
+    paths = ReportWriter(str(tmp_path)).write(_report(), "run1", log="full output\n")
+
+    assert [path.rsplit("/", 1)[1] for path in paths] == [
+        "report_run1.jsonl", "report_run1.sarif", "report_run1.junit.xml", "run_run1.log"]
+
+    with open(paths[0]) as f:
+        records = [json.loads(line) for line in f]
+    assert [(record["verdict"], record["line"]) for record in records] == [
+        ("matched", 9), ("false_positive", 4), ("false_negative", 15), ("note", 0)]
+    assert all(record["tool"] == "CppcheckTool" and record["target"] == "a.cpp" for record in records)
+
+    with open(paths[1]) as f:
+        run = json.load(f)["runs"][0]
+    assert [result["ruleId"] for result in run["results"]] == ["arrayIndexOutOfBounds", "unusedVariable"]
+    assert [result["level"] for result in run["results"]] == ["error", "note"]
+    assert run["results"][0]["locations"][0]["physicalLocation"]["region"] == {"startLine": 9}
+    assert len(run["invocations"][0]["toolExecutionNotifications"]) == 1
+
+    suite = ET.parse(paths[2]).getroot().find("testsuite")
+    assert (suite.get("name"), suite.get("tests"), suite.get("failures")) == ("CppcheckTool", "1", "1")
+    assert "a.cpp:15 memory_leak" in suite.find("testcase/failure").text
+
+
+def test_compressed_reports(tmp_path):
+    paths = ReportWriter(str(tmp_path), formats=["jsonl"], compress=True).write(_report(), "run1")
+
+    assert paths == [str(tmp_path / "report_run1.jsonl.gz")]
+    with gzip.open(paths[0], "rt") as f:
+        assert len(f.readlines()) == 4
+
+
+def test_progress_in_log_output_grows_with_the_phases():
+    stream = io.StringIO()
+    progress = ProgressBar(stream)
+    progress.add_total(4)
+    for _ in range(4):
+        progress.advance()
+    progress.add_total(2)
+    for _ in range(2):
+        progress.advance()
+
+    lines = stream.getvalue().splitlines()
+    assert lines[:4] == ["Progress: 1/4 (25%)", "Progress: 2/4 (50%)", "Progress: 3/4 (75%)", "Progress: 4/4 (100%)"]
+    assert lines[-1] == "Progress: 6/6 (100%)"
+
+
+def test_compact_console_keeps_the_output_in_the_log(capsys):
+    """
+    Test scenario: the static phase runs without verbose.
+    Expected Result: the console only gets progress lines; the tool output goes to the log.
+    """
+    manager = BenchmarkManager(use_cache=False, store_path="", verbose=False)
+    manager.static_tools = [FakeTool()]
+    files = manager.get_files_to_test()
+    log = io.StringIO()
+
+    with manager._console(log):
+        manager._run_static_phase(files)
+    output = capsys.readouterr().out
+
+    assert output.splitlines()[-1] == f"Progress: {len(files)}/{len(files)} (100%)"
+    assert "DONE." not in output
+    assert log.getvalue().count("DONE.") == len(files)
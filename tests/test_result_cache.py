@@ -0,0 +1,144 @@
+import os
+from core.benchmark_manager import BenchmarkManager
+from core.result_cache import ResultCache, collect_local_includes
+from tools.analysis_tool import AnalysisTool
+
+"""
+Tests for the content-hash result cache of static tools.
+"""
+
+
+class CountingTool(AnalysisTool):
+    """Fake static tool that counts how many times it really ran."""
+
+    def __init__(self, version="1.0"):
+        self.version = version
+        self.runs = 0
+
+    def get_version(self):
+        return self.version
+
+    def run_analysis(self, file_path):
+        self.runs += 1
+        return file_path
+
+    def _parse_output(self, output):
+        return {"bugs": [{"message": os.path.basename(output), "severity": "error", "line": 1,
+                          "type": "memleak"}]}
+
+
+def _write(path, content):
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def test_key_changes_with_source_header_and_version(tmp_path):
+    """
+    Test scenario: the source, an included header and the tool version change one at a time.
+    Expected Result: every change produces a new key, an unchanged tree the same key.
+    """
+    source = tmp_path / "main.cpp"
+    header = tmp_path / "util.h"
+    _write(source, '#include "util.h"\nint main() { return 0; }\n')
+    _write(header, "int f();\n")
+
+    cache = ResultCache(str(tmp_path / "cache"))
+    tool = CountingTool()
+    key = cache.make_key(tool, str(source))
+    assert cache.make_key(tool, str(source)) == key
+
+    _write(header, "int f(int);\n")
+    header_key = cache.make_key(tool, str(source))
+    assert header_key != key
+
+    _write(source, '#include "util.h"\nint main() { return 1; }\n')
+    source_key = cache.make_key(tool, str(source))
+    assert source_key not in (key, header_key)
+
+    assert cache.make_key(CountingTool(version="2.0"), str(source)) != source_key
+    assert cache.make_key(CountingTool(version=None), str(source)) is None
+
+
+def test_headers_of_the_same_name_get_different_keys(tmp_path):
+    """
+    Test scenario: the same source is keyed with a header of the same name and content from two folders.
+    Expected Result: the keys differ, since the header path relative to the source root is part of the key.
+    """
+    _write(tmp_path / "main.cpp", "int main() { return 0; }\n")
+    source = str(tmp_path / "main.cpp")
+    cache = ResultCache(str(tmp_path / "cache"), source_root=str(tmp_path))
+
+    keys = {cache.make_key(CountingTool(), source, headers={str(tmp_path / folder / "util.h"): "same"})
+            for folder in ["a", "b"]}
+
+    assert len(keys) == 2
+
+
+def test_collect_local_includes_is_recursive(tmp_path):
+    _write(tmp_path / "a.cpp", '#include "b.h"\n#include <vector>\n')
+    _write(tmp_path / "b.h", '#include "c.h"\n')
+    _write(tmp_path / "c.h", '#include "b.h"\n')
+
+    headers = collect_local_includes(str(tmp_path / "a.cpp"))
+
+    assert [os.path.basename(h) for h in headers] == ["b.h", "c.h"]
+
+
+def test_eviction_keeps_cache_under_limit(tmp_path):
+    """
+    Test scenario: more entries are stored than fit into the size limit.
+    Expected Result: the oldest entries are evicted, the newest one survives.
+    """
+    cache = ResultCache(str(tmp_path / "cache"), max_bytes=2000)
+    result = {"bugs": [{"message": "x" * 100, "severity": "error", "line": 1,
+                          "type": "memleak"}]}
+    keys = [f"{i:064x}" for i in range(40)]
+    for key in keys:
+        cache.put(key, result)
+
+    assert cache.total_bytes <= 2000
+    assert cache.get(keys[-1]) == result
+    assert cache.get(keys[0]) is None
+
+
+def test_manager_skips_unchanged_files(tmp_path, capsys):
+    """
+    Test scenario: the static phase runs twice over the same sources.
+    Expected Result: the second run is served from the cache only.
+    """
+    manager = BenchmarkManager(use_cache=False)
+    manager.cache = ResultCache(str(tmp_path / "cache"))
+    tool = CountingTool()
+    manager.static_tools = [tool]
+    files = manager.get_files_to_test()
+
+    manager._run_static_phase(files)
+    assert tool.runs == len(files)
+
+    manager._run_static_phase(files)
+    assert tool.runs == len(files)
+    assert capsys.readouterr().out.count("DONE (cached).") == len(files)
+
+
+class BrokenTool(CountingTool):
+    """Fake static tool that is not installed."""
+
+    def _parse_output(self, output):
+        return {"bugs": [{"message": "CppcheckTool not installed", "severity": "critical", "line": 0}]}
+
+
+def test_failed_runs_are_not_cached(tmp_path):
+    """
+    Test scenario: the tool only reports a diagnostic (not installed) instead of findings.
+    Expected Result: nothing is cached, so the tool runs again once it is installed.
+    """
+    manager = BenchmarkManager(use_cache=False)
+    manager.cache = ResultCache(str(tmp_path / "cache"))
+    tool = BrokenTool()
+    manager.static_tools = [tool]
+    files = manager.get_files_to_test()
+
+    manager._run_static_phase(files)
+    manager._run_static_phase(files)
+
+    assert tool.runs == 2 * len(files)
@@ -0,0 +1,78 @@
+from core.results_store import ResultsStore, format_diff
+from core.verification import MatchEngine, VerificationReport
+
+"""
+Tests for the SQLite results store and the comparison of two stored runs.
+"""
+
+GROUND_TRUTH = {
+    "files": [
+        {"filename": "vulnerable.cpp", "bugs": [
+            {"line": 9, "type": "out_of_bounds", "severity": "error"},
+            {"line": 19, "type": "memory_leak", "severity": "error"},
+        ]},
+    ]
+}
+
+
+def _report(found_bugs):
+    report = VerificationReport()
+    engine = MatchEngine(GROUND_TRUTH, line_tolerance=0)
+    report.add(engine.match("CppcheckTool", "vulnerable.cpp", ["vulnerable.cpp"], found_bugs))
+    return report
+
+
+def _bug(line, bug_type):
+    return {"message": "m", "severity": "error", "line": line, "type": bug_type}
+
+
+def test_save_and_diff_runs(tmp_path):
+    """
+    Test scenario: the first run finds the leak and reports a false positive,
+    the second run finds the out of bounds access instead and no false positive.
+    Expected Result: the diff shows the fixed false positive, the new miss and the fixed miss.
+    """
+    store = ResultsStore(str(tmp_path / "results.db"))
+    timings = [{"category": "tool", "name": "CppcheckTool", "target": "vulnerable.cpp", "wall_s": 0.5}]
+
+    base = store.save_run(_report([_bug(19, "memleak"), _bug(30, "nullPointer")]), timings, {"workers": 1})
+    head = store.save_run(_report([_bug(9, "arrayIndexOutOfBounds")]), timings, {"workers": 4})
+
+    assert [run["config"]["workers"] for run in store.list_runs()] == [1, 4]
+    assert store.latest_run() == head
+
+    diff = store.diff_runs(base, head)
+    assert [row["line"] for row in diff["fixed_false_positives"]] == [30]
+    assert diff["new_false_positives"] == []
+    assert [(row["line"], row["type"]) for row in diff["new_misses"]] == [(19, "memory_leak")]
+    assert [(row["line"], row["type"]) for row in diff["fixed_misses"]] == [(9, "out_of_bounds")]
+
+    counts = diff["tools"]["CppcheckTool"]
+    assert (counts["base"].tp, counts["base"].fp, counts["base"].fn) == (1, 1, 1)
+    assert (counts["head"].tp, counts["head"].fp, counts["head"].fn) == (1, 0, 1)
+    assert "Fixed false positives: 1" in format_diff(diff)
+    store.close()
+
+
+def test_tool_runtimes_skip_fast_fail_and_timed_out_runs(tmp_path):
+    """
+    Test scenario: valgrind ran app four times: twice normally, once with fast_fail and once until it was killed.
+    Expected Result: the runtime is the median of the two complete runs; the stopped and killed runs are ignored.
+    """
+    store = ResultsStore(str(tmp_path / "results.db"))
+    engine = MatchEngine(GROUND_TRUTH)
+
+    def save(wall_s, bugs, config):
+        report = VerificationReport()
+        report.add(engine.match("ValgrindTool", "app", ["vulnerable.cpp"], bugs))
+        store.save_run(report, [{"category": "tool", "name": "ValgrindTool", "target": "/build/app", "wall_s": wall_s}],
+                       config)
+
+    save(4.0, [_bug(9, "InvalidWrite")], {"fast_fail": False})
+    save(6.0, [_bug(9, "InvalidWrite")], {"fast_fail": False})
+    save(0.5, [_bug(9, "InvalidWrite")], {"fast_fail": True})
+    save(60.0, [{"message": "Execution timed out", "severity": "error", "line": 0}], {"fast_fail": False})
+
+    assert store.tool_runtimes() == {("ValgrindTool", "app"): 5.0}
+    assert store.tool_runtimes(last_runs=1) == {}
+    store.close()
@@ -0,0 +1,72 @@
+import os
+import shutil
+import subprocess
+import pytest
+from core.dynamic_scheduler import ResourceLimits
+from tools.sanitizer_tool import SanitizerTool
+
+"""
+Tests for the ASan / UBSan / LSan report parser of SanitizerTool.
+The end to end test compiles a program with the sanitizers and is skipped without g++.
+"""
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+PROJECT_SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+
+def _fixture_text():
+    with open(os.path.join(FIXTURES, "sanitizer_vulnerable.txt"), "r") as f:
+        return f.read()
+
+
+def test_parse_asan_and_leak_reports():
+    """
+    Test scenario: a stack buffer overflow (recovered) followed by the LeakSanitizer report.
+    Expected Result: two bugs located at the user source lines, not in the sanitizer runtime.
+    """
+    bugs = SanitizerTool()._parse_output(_fixture_text())["bugs"]
+
+    assert len(bugs) == 2
+    overflow, leak = bugs
+
+    assert (overflow["type"], overflow["kind"]) == ("out_of_bounds", "stack-buffer-overflow")
+    assert (overflow["file"], overflow["line"]) == ("vulnerable.cpp", 9)
+    assert overflow["stack"][1] == "buffer_overflow_example() (vulnerable.cpp:9)"
+
+    assert (leak["type"], leak["kind"]) == ("memory_leak", "DirectLeak")
+    assert (leak["file"], leak["line"]) == ("vulnerable.cpp", 15)
+    assert leak["bytes"] == 40
+
+
+def test_parse_ubsan_report():
+    report = ("/app/src/math.cpp:7:14: runtime error: signed integer overflow: "
+              "2147483647 + 1 cannot be represented in type 'int'\n"
+              "    #0 0x55d1 in add(int, int) /app/src/math.cpp:7\n")
+
+    bug, = SanitizerTool()._parse_output(report)["bugs"]
+
+    assert (bug["type"], bug["file"], bug["line"]) == ("integer_overflow", "math.cpp", 7)
+
+
+def test_memory_limit_is_left_to_asan():
+    """
+    Test scenario: the dynamic job has a memory limit.
+    Expected Result: it becomes ASan's hard_rss_limit_mb instead of RLIMIT_AS.
+    """
+    options = SanitizerTool._asan_options("/tmp/report", ResourceLimits(cpu_seconds=5, memory_bytes=512 * 1024 * 1024))
+
+    assert "hard_rss_limit_mb=512" in options.split(":")
+    assert "log_path=/tmp/report" in options.split(":")
+
+
+@pytest.mark.skipif(shutil.which("g++") is None, reason="g++ is not installed")
+def test_run_instrumented_executable(tmp_path):
+    executable = str(tmp_path / "vulnerable_test")
+    compiled = subprocess.run(["g++", *SanitizerTool.build_flags, os.path.join(PROJECT_SRC, "vulnerable.cpp"),
+                               "-o", executable], capture_output=True)
+    if compiled.returncode != 0:
+        pytest.skip("the sanitizer runtime is not available")
+
+    bugs = SanitizerTool().run(executable, cwd=str(tmp_path))["bugs"]
+
+    assert {(bug["type"], bug["line"]) for bug in bugs} == {("out_of_bounds", 9), ("memory_leak", 15)}
@@ -0,0 +1,102 @@
+import pytest
+from core.benchmark_manager import BenchmarkManager
+from core.results_store import ResultsStore
+from core.sharding import merge_shard_files, parse_shard, partition, write_shard_file
+from core.verification import MatchEngine, VerificationReport
+
+"""
+Tests for splitting the benchmark work into shards and merging their partial results.
+"""
+
+GROUND_TRUTH = {"files": [{"filename": "a.cpp", "bugs": [{"line": 3, "type": "memory_leak"}]},
+                          {"filename": "b.cpp", "bugs": [{"line": 5, "type": "out_of_bounds"}]}]}
+
+
+def test_parse_shard():
+    assert parse_shard("2/4") == (2, 4)
+    for spec in ["0/4", "5/4", "2", "a/b"]:
+        with pytest.raises(ValueError):
+            parse_shard(spec)
+
+
+def test_partition_balances_by_cost():
+    """
+    Test scenario: one expensive file and several cheap ones, split in two.
+    Expected Result: the expensive file gets a shard of its own; every name is in exactly one shard.
+    """
+    names = ["big.cpp", "a.cpp", "b.cpp", "c.cpp", "d.cpp"]
+    costs = {"big.cpp": 40.0, "a.cpp": 10.0, "b.cpp": 10.0, "c.cpp": 10.0}
+
+    shards = partition(names, 2, costs)
+
+    assert shards == partition(list(reversed(names)), 2, costs)
+    assert shards[0] == ["big.cpp"]
+    assert sorted(shards[1]) == ["a.cpp", "b.cpp", "c.cpp", "d.cpp"]
+
+
+def test_shards_cover_all_files_once():
+    manager = BenchmarkManager(use_cache=False, store_path="")
+    all_files = [item["filename"] for item in manager.get_files_to_test()]
+
+    selected = []
+    for index in range(1, 4):
+        manager.shard = (index, 3)
+        selected += [item["filename"] for item in manager._shard_files(manager.get_files_to_test())]
+
+    assert sorted(selected) == sorted(all_files)
+
+
+def _shard_report(filename, found_bugs):
+    report = VerificationReport()
+    report.add(MatchEngine(GROUND_TRUTH).match("FakeTool", filename, [filename], found_bugs))
+    return report
+
+
+def test_merge_partial_results(tmp_path):
+    """
+    Test scenario: two shards each verified one file.
+    Expected Result: the merged report counts both; a missing shard is an error.
+    """
+    timing = {"category": "tool", "name": "FakeTool", "target": "a.cpp", "wall_s": 1.0}
+    write_shard_file(str(tmp_path / "shard_1_of_2.json"), 1, 2,
+                     _shard_report("a.cpp", [{"line": 3, "type": "memleak", "severity": "error"}]), [timing], {})
+    with pytest.raises(ValueError, match="missing shards: 2"):
+        merge_shard_files([str(tmp_path / "shard_*_of_2.json")])
+
+    write_shard_file(str(tmp_path / "shard_2_of_2.json"), 2, 2, _shard_report("b.cpp", []), [], {})
+    report, timings, config = merge_shard_files([str(tmp_path / "shard_*_of_2.json")])
+
+    total = report.by_tool()["FakeTool"]
+    assert (total.tp, total.fp, total.fn) == (1, 0, 1)
+    assert timings == [timing]
+    assert config["shards"] == 2
+
+
+def test_false_positives_survive_the_shard_files(tmp_path):
+    """
+    Test scenario: a shard's report with one matched finding and one false positive is written and merged.
+    Expected Result: the store and the reports still tell the false positive from the match.
+    """
+    bugs = [{"line": 3, "type": "memleak", "severity": "error"}, {"line": 40, "type": "memleak", "severity": "error"}]
+    write_shard_file(str(tmp_path / "shard_1_of_1.json"), 1, 1, _shard_report("a.cpp", bugs), [], {})
+    report, _, _ = merge_shard_files([str(tmp_path / "shard_1_of_1.json")])
+
+    assert report.results[0].verdicts() == ["matched", "false_positive"]
+    store = ResultsStore(str(tmp_path / "results.db"))
+    run_id = store.save_run(report, [])
+    statuses = store.connection.execute("SELECT status FROM findings WHERE run_id = ? ORDER BY line",
+                                        (run_id,)).fetchall()
+    assert statuses == [("matched",), ("fp",)]
+
+
+def test_shards_build_in_their_own_trees():
+    """
+    Test scenario: two shards of the same project run on one machine.
+    Expected Result: their build trees, and those of their build variants, differ.
+    """
+    first = BenchmarkManager(use_cache=False, store_path="", shard=(1, 2))
+    second = BenchmarkManager(use_cache=False, store_path="", shard=(2, 2))
+
+    assert first.builder.build_path != second.builder.build_path
+    assert first.builder.build_path.endswith("build-shard-1")
+    assert first.builder.variant("sanitize", []).build_path != second.builder.variant("sanitize", []).build_path
@@ -0,0 +1,133 @@
+import os
+import stat
+import subprocess
+import sys
+from importlib import metadata
+import pytest
+from core import tool_registry
+from core.tool_registry import BUILTIN_TOOLS, ENTRY_POINT_GROUP, ToolRegistry
+from tools.analysis_tool import AnalysisTool
+
+"""
+Tests for the tool registry: lazy loading, plugins and the cached availability probe.
+"""
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# prints a version and counts how often it was run
+FAKE_TOOL = f"""#!{sys.executable}
+import os
+with open(os.path.join(os.path.dirname(__file__), "runs"), "a") as f:
+    f.write("run\\n")
+print("faketool 1.2.3")
+"""
+
+
+class PluginTool(AnalysisTool):
+    kind = "dynamic"
+    probe_command = ["faketool", "--version"]
+
+    def run_analysis(self, path, **run_options):
+        return ""
+
+    def _parse_output(self, output):
+        return {"bugs": []}
+
+
+def _install_fake_tool(tmp_path, monkeypatch):
+    script = tmp_path / "bin" / "faketool"
+    script.parent.mkdir()
+    script.write_text(FAKE_TOOL)
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{script.parent}{os.pathsep}{os.environ['PATH']}")
+    return script
+
+
+def _register_plugin(monkeypatch):
+    entry_point = metadata.EntryPoint("faketool", f"{__name__}:PluginTool", ENTRY_POINT_GROUP)
+    monkeypatch.setattr(tool_registry.metadata, "entry_points",
+                        lambda group: [entry_point] if group == ENTRY_POINT_GROUP else [])
+
+
+def test_builtin_specs_match_the_tool_classes():
+    for spec in BUILTIN_TOOLS:
+        tool_class = spec.load()
+        assert (tool_class.kind, tool_class.probe_command) == (spec.kind, spec.probe_command)
+
+
+def test_tools_are_imported_only_when_created():
+    code = ("import sys; from core.tool_registry import ToolRegistry; registry = ToolRegistry(); "
+            "registry.names(); registry.spec('valgrind'); "
+            "print(any(name.startswith('tools.') for name in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=PROJECT_ROOT)
+
+    assert result.stdout.strip() == "False", result.stderr
+
+
+def test_probe_runs_once_per_binary(tmp_path, monkeypatch):
+    """
+    Test scenario: a plugin tool is probed by two registries sharing a probe cache, then its binary is replaced.
+    Expected Result: the binary only runs again after it changed.
+    """
+    script = _install_fake_tool(tmp_path, monkeypatch)
+    _register_plugin(monkeypatch)
+    cache_path = str(tmp_path / "cache" / "tool_probe.json")
+
+    status = ToolRegistry(cache_path).probe("faketool")
+    assert (status.available, status.version) == (True, "faketool 1.2.3")
+    assert ToolRegistry(cache_path).probe("faketool").version == "faketool 1.2.3"
+    assert (tmp_path / "bin" / "runs").read_text().count("run") == 1
+
+    script.write_text(FAKE_TOOL.replace("1.2.3", "1.3.0"))
+    assert ToolRegistry(cache_path).probe("faketool").version == "faketool 1.3.0"
+    assert (tmp_path / "bin" / "runs").read_text().count("run") == 2
+
+
+def test_unavailable_tools_are_skipped(tmp_path, monkeypatch, capsys):
+    """
+    Test scenario: an installed plugin tool and a missing tool are created.
+    Expected Result: only the installed one is created; the missing one is reported once.
+    """
+    _install_fake_tool(tmp_path, monkeypatch)
+    _register_plugin(monkeypatch)
+    registry = ToolRegistry(str(tmp_path / "tool_probe.json"))
+    registry.specs["missing"] = tool_registry.ToolSpec("missing", f"{__name__}:PluginTool", "static",
+                                                       ["no-such-tool-binary", "--version"])
+
+    tools = registry.create(["faketool", "missing"])
+
+    assert [type(tool) for tool in tools] == [PluginTool]
+    assert "Skipping missing: no-such-tool-binary not found on PATH." in capsys.readouterr().out
+    assert "faketool" in registry.format_table()
+    with pytest.raises(ValueError):
+        registry.create(["no-such-tool"])
+
+
+def test_plugins_are_imported_only_when_selected(tmp_path, monkeypatch, capsys):
+    """
+    Test scenario: two plugins are registered, one of them fails to import; the tools are listed,
+    then only the working plugin is created.
+    Expected Result: listing imports neither plugin; creating imports only the selected one,
+    and the broken plugin is reported as unavailable when it is probed.
+    """
+    _install_fake_tool(tmp_path, monkeypatch)
+    (tmp_path / "lazy_plugin.py").write_text(f"from {__name__} import PluginTool as LazyTool\n")
+    (tmp_path / "broken_plugin.py").write_text("raise ImportError('missing dependency')\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    entry_points = [metadata.EntryPoint("lazy", "lazy_plugin:LazyTool", ENTRY_POINT_GROUP),
+                    metadata.EntryPoint("broken", "broken_plugin:Tool", ENTRY_POINT_GROUP)]
+    monkeypatch.setattr(tool_registry.metadata, "entry_points",
+                        lambda group: entry_points if group == ENTRY_POINT_GROUP else [])
+    registry = ToolRegistry(str(tmp_path / "tool_probe.json"))
+
+    assert {"lazy", "broken"} <= set(registry.names())
+    assert registry.spec("lazy").target == "lazy_plugin:LazyTool"
+    assert "lazy_plugin" not in sys.modules and "broken_plugin" not in sys.modules
+
+    tools = registry.create(["lazy"])
+    assert [type(tool) for tool in tools] == [PluginTool]
+    assert "broken_plugin" not in sys.modules
+
+    assert not registry.probe("broken").available
+    assert "Cannot load tool plugin 'broken'" in capsys.readouterr().out
+    monkeypatch.delitem(sys.modules, "lazy_plugin")
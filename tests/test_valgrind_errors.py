@@ -0,0 +1,137 @@
+import os
+import stat
+from core.valgrind_errors import ErrorGroups, SuppressionFile
+from tools.valgrind_tool import ValgrindTool
+
+"""
+Tests for grouping valgrind errors by stack and learning suppressions of third-party noise.
+"""
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "valgrind_vulnerable.xml")
+
+# a leak inside the dynamic loader, as reported with --gen-suppressions=all
+NOISE_ERROR = """
+<error>
+  <unique>0x9</unique>
+  <tid>1</tid>
+  <kind>Leak_DefinitelyLost</kind>
+  <xwhat><text>16 bytes in 1 blocks are definitely lost in loss record 1 of 2</text><leakedbytes>16</leakedbytes></xwhat>
+  <stack>
+    <frame><ip>0x4848899</ip><obj>/usr/libexec/valgrind/vgpreload_memcheck-amd64-linux.so</obj><fn>malloc</fn></frame>
+    <frame><ip>0x4011F2</ip><obj>/usr/lib/x86_64-linux-gnu/ld-linux-x86-64.so.2</obj><fn>_dl_init</fn></frame>
+  </stack>
+  <suppression>
+    <sname>insert_a_suppression_name_here</sname>
+    <skind>Memcheck:Leak</skind>
+    <rawtext>
+<![CDATA[
+{
+   <insert_a_suppression_name_here>
+   Memcheck:Leak
+   match-leak-kinds: definite
+   fun:malloc
+   fun:_dl_init
+}
+]]>
+    </rawtext>
+  </suppression>
+</error>
+"""
+
+
+def _report_with_noise() -> str:
+    with open(FIXTURE, "r") as f:
+        text = f.read()
+    return text.replace("</valgrindoutput>", NOISE_ERROR + "</valgrindoutput>")
+
+
+def test_noise_carries_its_suppression():
+    bugs = ValgrindTool()._parse_output(_report_with_noise())["bugs"]
+
+    overflow, leak, noise = bugs
+    assert "suppression" not in overflow and "suppression" not in leak
+    assert noise["suppression"].startswith("{") and "fun:_dl_init" in noise["suppression"]
+    assert len({bug["signature"] for bug in bugs}) == 3
+
+
+def test_errors_are_grouped_across_executables(tmp_path):
+    """
+    Test scenario: two executables report the same errors; the noise group is learned twice.
+    Expected Result: three groups seen in both executables; the suppression is stored once and survives a reload.
+    """
+    bugs = ValgrindTool()._parse_output(_report_with_noise())["bugs"]
+    groups = ErrorGroups()
+    groups.add("first_test", bugs)
+    groups.add("second_test", bugs)
+
+    assert len(groups) == 3
+    assert all(group.executables == {"first_test", "second_test"} for group in groups.groups.values())
+    assert groups.summary().startswith("6 errors in 3 groups across 2 executables (1 of them third-party noise)")
+
+    suppressions = SuppressionFile(str(tmp_path / "noise.supp"))
+    assert [suppressions.add(group.suppression) for group in groups.noise() * 2] == [True, False]
+    assert suppressions.save() == 1
+    reloaded = SuppressionFile(str(tmp_path / "noise.supp"))
+    assert len(reloaded) == 1 and not reloaded.add(groups.noise()[0].suppression)
+
+
+def test_concurrent_runs_save_a_suppression_once(tmp_path):
+    """
+    Test scenario: two runs learn the same noise from the same file, then both save.
+    Expected Result: the second save re-reads the file and does not append the suppression again.
+    """
+    suppression = ValgrindTool()._parse_output(_report_with_noise())["bugs"][2]["suppression"]
+    first = SuppressionFile(str(tmp_path / "noise.supp"))
+    second = SuppressionFile(str(tmp_path / "noise.supp"))
+
+    assert first.add(suppression) and second.add(suppression)
+    assert (first.save(), second.save()) == (1, 0)
+    assert (tmp_path / "noise.supp").read_text().count("{") == 1
+
+
+def test_cut_stacks_are_not_learned_as_noise():
+    """
+    Test scenario: the third-party stack is as deep as --num-callers, so the program may be above the cut.
+    Expected Result: no suppression is attached.
+    """
+    tool = ValgrindTool()
+    tool.num_callers = 2
+
+    noise = tool._parse_output(_report_with_noise())["bugs"][2]
+
+    assert "suppression" not in noise
+
+
+def test_project_under_usr_is_not_noise():
+    """
+    Test scenario: the project lives in /usr/src/app, so its sources and executable are under /usr/.
+    Expected Result: with the project roots known, its errors are located in its sources and never
+    learned as noise, while the loader's leak still is.
+    """
+    report = _report_with_noise().replace("/app/src", "/usr/src/app/src").replace(
+        "/app/build/vulnerable_test", "/usr/src/app/build/vulnerable_test")
+    tool = ValgrindTool()
+    tool.project_roots = ("/usr/src/app/src", "/usr/src/app/build")
+
+    overflow, leak, noise = tool._parse_output(report)["bugs"]
+
+    assert (overflow["file"], leak["file"]) == ("vulnerable.cpp", "vulnerable.cpp")
+    assert overflow["line"] and leak["line"]
+    assert "suppression" not in overflow and "suppression" not in leak
+    assert "suppression" in noise and noise["file"] == ""
+
+
+def test_learned_suppressions_are_passed_to_valgrind(tmp_path, monkeypatch):
+    script = tmp_path / "valgrind"
+    script.write_text(f'#!/bin/sh\necho "$@" > {tmp_path}/args\n')
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+    (tmp_path / "noise.supp").write_text("{\n   noise-1\n   Memcheck:Leak\n   fun:malloc\n}\n")
+    tool = ValgrindTool()
+    tool.suppressions_file = str(tmp_path / "noise.supp")
+
+    tool.run("/bin/true")
+
+    args = (tmp_path / "args").read_text().split()
+    assert "--gen-suppressions=all" in args and "--num-callers=50" in args
+    assert f"--suppressions={tmp_path / 'noise.supp'}" in args
@@ -0,0 +1,123 @@
+import os
+import stat
+import time
+from tools.valgrind_tool import ValgrindTool
+
+"""
+Tests for the streaming XML parser of ValgrindTool.
+A fake 'valgrind' script replays a recorded report, so Valgrind does not need to be installed.
+"""
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "valgrind_vulnerable.xml")
+
+
+def _fixture_text():
+    with open(FIXTURE, "r") as f:
+        return f.read()
+
+
+def _install_fake_valgrind(tmp_path, monkeypatch, script_body):
+    script = tmp_path / "valgrind"
+    script.write_text("#!/bin/sh\n" + script_body)
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+
+
+def test_parse_errors_with_locations():
+    """
+    Test scenario: a report with an invalid write, a definite leak and still reachable memory.
+    Expected Result: two bugs with the user source line, leak bytes and the full stack.
+    """
+    bugs = ValgrindTool()._parse_output(_fixture_text())["bugs"]
+
+    assert len(bugs) == 2
+    overflow, leak = bugs
+
+    assert overflow["type"] == "out_of_bounds"
+    assert (overflow["file"], overflow["line"]) == ("vulnerable.cpp", 9)
+    assert overflow["message"] == "Invalid write of size 8"
+    assert overflow["stack"][0] == "strcpy (vg_replace_strmem.c:523)"
+
+    assert leak["type"] == "memory_leak"
+    assert leak["kind"] == "Leak_DefinitelyLost"
+    assert (leak["file"], leak["line"]) == ("vulnerable.cpp", 15)
+    assert leak["bytes"] == 40
+
+
+def test_truncated_report_keeps_parsed_errors():
+    text = _fixture_text()
+    truncated = text[:text.index("<kind>Leak_DefinitelyLost</kind>")]
+
+    bugs = ValgrindTool()._parse_output(truncated)["bugs"]
+
+    assert [bug["type"] for bug in bugs] == ["out_of_bounds"]
+
+
+def test_run_streams_report_from_xml_fd(tmp_path, monkeypatch):
+    """
+    Test scenario: the fake valgrind writes the report to the --xml-fd descriptor
+    and noise to stdout/stderr.
+    Expected Result: only the XML report is parsed.
+    """
+    _install_fake_valgrind(tmp_path, monkeypatch, f"""
+for arg in "$@"; do
+  case "$arg" in --xml-fd=*) fd="${{arg#--xml-fd=}}";; esac
+done
+echo "program output"
+echo "==1== Memcheck noise" >&2
+cat "{FIXTURE}" > "/dev/fd/$fd"
+""")
+
+    bugs = ValgrindTool().run("/bin/true")["bugs"]
+
+    assert [bug["line"] for bug in bugs] == [9, 15]
+
+
+def test_timeout_keeps_partial_findings(tmp_path, monkeypatch):
+    text = _fixture_text()
+    partial = tmp_path / "partial.xml"
+    partial.write_text(text[:text.index("<status>\n  <state>FINISHED")])
+    _install_fake_valgrind(tmp_path, monkeypatch, f"""
+for arg in "$@"; do
+  case "$arg" in --xml-fd=*) fd="${{arg#--xml-fd=}}";; esac
+done
+cat "{partial}" > "/dev/fd/$fd"
+exec sleep 30
+""")
+    tool = ValgrindTool()
+    tool.timeout = 0.5
+
+    bugs = tool.run("/bin/true")["bugs"]
+
+    assert [bug["message"] for bug in bugs] == ["Invalid write of size 8", "Execution timed out"]
+
+
+def test_fast_fail_stops_at_first_error(tmp_path, monkeypatch):
+    """
+    Test scenario: the program hangs after its first error, fast-fail is on.
+    Expected Result: the run stops at that error instead of waiting for the timeout.
+    """
+    text = _fixture_text()
+    partial = tmp_path / "partial.xml"
+    partial.write_text(text[:text.index("<status>\n  <state>FINISHED")])
+    _install_fake_valgrind(tmp_path, monkeypatch, f"""
+for arg in "$@"; do
+  case "$arg" in --xml-fd=*) fd="${{arg#--xml-fd=}}";; esac
+done
+cat "{partial}" > "/dev/fd/$fd"
+exec sleep 30
+""")
+    start = time.monotonic()
+
+    bugs = ValgrindTool().run("/bin/true", timeout=20, fast_fail=True)["bugs"]
+
+    assert [bug["message"] for bug in bugs] == ["Invalid write of size 8"]
+    assert time.monotonic() - start < 10
+
+
+def test_valgrind_not_installed(tmp_path, monkeypatch):
+    monkeypatch.setenv("PATH", str(tmp_path))
+
+    bugs = ValgrindTool().run("/bin/true")["bugs"]
+
+    assert bugs[0]["message"] == "Valgrind not installed"
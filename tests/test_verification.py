@@ -0,0 +1,110 @@
+from core.verification import MatchEngine, VerificationReport
+
+"""
+Tests for the ground-truth matching engine that replaced the count-based verification.
+"""
+
+GROUND_TRUTH = {
+    "files": [
+        {"filename": "vulnerable.cpp", "bugs": [
+            {"line": 9, "type": "out_of_bounds", "severity": "error"},
+            {"line": 19, "type": "memory_leak", "severity": "error"},
+        ]},
+        {"filename": "leak.cpp", "bugs": [
+            {"line": 10, "type": "memory_leak", "severity": "error"},
+            {"line": 11, "type": "memory_leak", "severity": "error"},
+        ]},
+    ]
+}
+
+
+def _bug(line, bug_type, file=None):
+    bug = {"message": "m", "severity": "error", "line": line, "type": bug_type}
+    if file:
+        bug["file"] = file
+    return bug
+
+
+def test_match_by_file_type_and_line():
+    """
+    Test scenario: one correct finding (tool specific id), one finding of the wrong type,
+    and one expected bug that is missed.
+    Expected Result: TP 1, FP 1, FN 1.
+    """
+    engine = MatchEngine(GROUND_TRUTH, line_tolerance=0)
+
+    result = engine.match("CppcheckTool", "vulnerable.cpp", ["vulnerable.cpp"],
+                          [_bug(9, "bufferAccessOutOfBounds"), _bug(19, "nullPointer")])
+
+    total = result.total
+    assert (total.tp, total.fp, total.fn) == (1, 1, 1)
+    assert result.false_negatives == [dict(GROUND_TRUTH["files"][0]["bugs"][1], file="vulnerable.cpp")]
+    assert result.false_positives[0]["type"] == "nullPointer"
+
+
+def test_line_tolerance_and_duplicates():
+    engine = MatchEngine(GROUND_TRUTH, line_tolerance=1)
+
+    result = engine.match("ValgrindTool", "leak_test", ["leak.cpp"],
+                          [_bug(10, "memory_leak", "leak.cpp"), _bug(12, "memory_leak", "leak.cpp"),
+                           _bug(12, "memory_leak", "leak.cpp"), _bug(40, "memory_leak", "leak.cpp")])
+
+    total = result.total
+    assert (total.tp, total.fp, total.fn, total.duplicates) == (2, 1, 0, 1)
+    assert total.precision == 2 / 3
+    assert total.recall == 1.0
+
+
+def test_findings_in_other_files_are_not_false_negatives():
+    """
+    Test scenario: a finding is reported in a header that has no expected bugs.
+    Expected Result: it is a false positive of the header; the expected bugs of
+    files outside the target are not counted as missed.
+    """
+    engine = MatchEngine(GROUND_TRUTH)
+
+    result = engine.match("CppcheckTool", "leak.cpp", ["leak.cpp"],
+                          [_bug(10, "memleak"), _bug(11, "memleak"), _bug(3, "uninitvar", "/src/util.h")])
+
+    assert result.counts[("util.h", "uninitialized_variable")].fp == 1
+    assert result.total.fn == 0
+    assert ("vulnerable.cpp", "out_of_bounds") not in result.counts
+
+
+def test_tool_diagnostics_are_not_scored():
+    engine = MatchEngine(GROUND_TRUTH)
+
+    result = engine.match("CppcheckTool", "leak.cpp", ["leak.cpp"],
+                          [{"message": "Cppcheck not installed", "severity": "critical", "line": 0}])
+
+    assert result.notes[0]["message"] == "Cppcheck not installed"
+    assert result.total.fp == 0 and result.total.fn == 2
+
+
+def test_report_groups_by_tool_file_and_type():
+    engine = MatchEngine(GROUND_TRUTH)
+    report = VerificationReport()
+    report.add(engine.match("CppcheckTool", "vulnerable.cpp", ["vulnerable.cpp"], [_bug(9, "arrayIndexOutOfBounds")]))
+    report.add(engine.match("CppcheckTool", "leak.cpp", ["leak.cpp"], [_bug(10, "memleak")]))
+    report.add(engine.match("ValgrindTool", "leak_test", ["leak.cpp"], []))
+
+    assert report.by_tool()["CppcheckTool"].tp == 2
+    assert report.by_tool()["CppcheckTool"].fn == 2
+    assert report.by_tool()["ValgrindTool"].fn == 2
+    assert report.by_file()[("CppcheckTool", "leak.cpp")].recall == 0.5
+    assert report.by_type()[("CppcheckTool", "memory_leak")].fn == 2
+    assert "CppcheckTool" in report.summary()
+
+
+def test_matching_scales_linearly():
+    """
+    Test scenario: 20k expected bugs and 20k findings in one file.
+    Expected Result: every finding is matched (this would time out with a quadratic matcher).
+    """
+    truth = {"files": [{"filename": "big.cpp",
+                        "bugs": [{"line": line, "type": "memory_leak"} for line in range(0, 100000, 5)]}]}
+    found = [_bug(line + 1, "memleak") for line in range(0, 100000, 5)]
+
+    result = MatchEngine(truth).match("CppcheckTool", "big.cpp", ["big.cpp"], reversed(found))
+
+    assert result.total.tp == 20000
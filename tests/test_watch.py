@@ -0,0 +1,113 @@
+import json
+import pytest
+from core.benchmark_manager import BenchmarkManager
+from core.watch import InotifyWatcher, PollingWatcher, WatchSession, wait_for_changes
+
+"""
+Tests for watch mode: change detection and working out which tool runs a change affects.
+"""
+
+
+def _write_project(src):
+    src.mkdir()
+    (src / "util.h").write_text("int twice(int x);\n")
+    (src / "a.cpp").write_text("int main() { return 0; }\n")
+    (src / "b.cpp").write_text('#include "util.h"\nint main() { return twice(1); }\n')
+    (src / "CMakeLists.txt").write_text("add_executable(app_a a.cpp)\nadd_executable(app_b b.cpp)\n")
+    (src / "expected_results.json").write_text(json.dumps({"files": [{"filename": "a.cpp", "bugs": []},
+                                                                     {"filename": "b.cpp", "bugs": []}]}))
+
+
+def test_changes_are_debounced(tmp_path):
+    """
+    Test scenario: a file is saved, then another one right after it.
+    Expected Result: both saves are reported together, once.
+    """
+    watcher = PollingWatcher(str(tmp_path), interval=0.05)
+    (tmp_path / "a.cpp").write_text("int a;\n")
+    (tmp_path / "b.cpp").write_text("int b;\n")
+
+    changed = wait_for_changes(watcher, debounce=0.2)
+
+    assert changed == {str(tmp_path / "a.cpp"), str(tmp_path / "b.cpp")}
+    assert watcher.poll(0.1) == set()
+
+
+def test_inotify_reports_saved_files(tmp_path):
+    try:
+        watcher = InotifyWatcher(str(tmp_path))
+    except (OSError, AttributeError) as e:
+        pytest.skip(f"inotify is not available: {e}")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a.cpp").write_text("int a;\n")
+    watcher.poll(1.0)
+    (tmp_path / "sub" / "b.cpp").write_text("int b;\n")
+
+    changed = wait_for_changes(watcher, debounce=0.2)
+    watcher.close()
+
+    assert str(tmp_path / "sub" / "b.cpp") in changed
+
+
+def test_inotify_reports_files_of_new_directories(tmp_path):
+    """
+    Test scenario: a directory tree with sources is moved into the watched folder at once.
+    Expected Result: its sources are reported, and later saves inside it are seen too.
+    """
+    (tmp_path / "src").mkdir()
+    try:
+        watcher = InotifyWatcher(str(tmp_path / "src"))
+    except (OSError, AttributeError) as e:
+        pytest.skip(f"inotify is not available: {e}")
+    (tmp_path / "new" / "sub").mkdir(parents=True)
+    (tmp_path / "new" / "sub" / "a.cpp").write_text("int a;\n")
+    (tmp_path / "new").rename(tmp_path / "src" / "new")
+
+    changed = wait_for_changes(watcher, debounce=0.2)
+    (tmp_path / "src" / "new" / "sub" / "b.cpp").write_text("int b;\n")
+    later = wait_for_changes(watcher, debounce=0.2)
+    watcher.close()
+
+    assert str(tmp_path / "src" / "new" / "sub" / "a.cpp") in changed
+    assert str(tmp_path / "src" / "new" / "sub" / "b.cpp") in later
+
+
+def test_header_change_affects_including_sources_and_targets(tmp_path):
+    """
+    Test scenario: util.h, included by b.cpp only, is saved.
+    Expected Result: only b.cpp is re-analyzed and only app_b (built from b.cpp) re-runs.
+    """
+    _write_project(tmp_path / "src")
+    session = WatchSession(BenchmarkManager(input_dir_name=str(tmp_path / "src"), use_cache=False, store_path=""))
+
+    affected = session.affected_sources({"util.h"})
+
+    assert affected == {"util.h", "b.cpp"}
+    assert session.affected_executables(["/build/app_a", "/build/app_b"], affected) == ["/build/app_b"]
+    assert session.affected_sources({"CMakeLists.txt"}) is None
+
+
+def test_nested_sources_are_matched_by_path(tmp_path, monkeypatch):
+    """
+    Test scenario: the sources live in subfolders (app/, lib/), two of them named main.cpp;
+    lib/util.h, included by app/main.cpp only, is saved.
+    Expected Result: only app/main.cpp is affected, and only its target re-runs, both with
+    the File API's paths and with those of CMakeLists.txt.
+    """
+    src = tmp_path / "src"
+    for folder in ["app", "lib", "tools"]:
+        (src / folder).mkdir(parents=True)
+    (src / "lib" / "util.h").write_text("int twice(int x);\n")
+    (src / "app" / "main.cpp").write_text('#include "../lib/util.h"\nint main() { return twice(1); }\n')
+    (src / "tools" / "main.cpp").write_text("int main() { return 0; }\n")
+    (src / "CMakeLists.txt").write_text("add_executable(app app/main.cpp)\nadd_executable(tool tools/main.cpp)\n")
+    (src / "expected_results.json").write_text(json.dumps({"files": []}))
+    session = WatchSession(BenchmarkManager(input_dir_name=str(src), use_cache=False, store_path=""))
+
+    affected = session.affected_sources({"lib/util.h"})
+
+    assert affected == {"lib/util.h", "app/main.cpp"}
+    assert session.affected_executables(["/build/app", "/build/tool"], affected) == ["/build/app"]
+    monkeypatch.setattr(session.manager.builder, "target_sources",
+                        lambda: {"app": [str(src / "app" / "main.cpp")], "tool": ["tools/main.cpp"]})
+    assert session.affected_executables(["/build/app", "/build/tool"], affected) == ["/build/app"]
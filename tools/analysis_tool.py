@@ -1,22 +1,80 @@
+import os
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+from core import profiler
 
 class AnalysisTool(ABC):
+
+    # "static" tools analyze source files, "dynamic" tools run the built executables;
+    # probe_command (e.g. ["cppcheck", "--version"]) tells whether the tool is installed.
+    # Plugins registered with the tool registry (core/tool_registry.py) declare both.
+    kind = "static"
+    probe_command: Optional[List[str]] = None
+
+    # True for tools implementing run_project(compile_commands, files, jobs),
+    # which analyzes a whole compile_commands.json project in one invocation
+    supports_project = False
+
+    # dynamic tools that need instrumented executables name a build variant;
+    # the project is then also built in build-<variant> with build_flags added
+    build_variant = None
+    build_flags: List[str] = []
+
+    # dynamic tools: how many times slower the program runs under the tool
+    # (used to derive timeouts from the runtimes of other tools)
+    slowdown = 1.0
+
+    # shared PreprocessCache, set by the BenchmarkManager (e.g. for cppcheck's build dirs)
+    preprocess_cache = None
+
+    # persistent valgrind-format suppression file of third-party noise, set by the
+    # BenchmarkManager for the tools that read one (see core/valgrind_errors.py)
+    suppressions_file: Optional[str] = None
+
+    # source and build directories of the analyzed project, set by the BenchmarkManager;
+    # dynamic tools tell the program's own stack frames from library code by them
+    project_roots: Tuple[str, ...] = ()
     
-    def run(self, file_path: str) -> Dict[str, Any]:
+    def run(self, file_path: str, **run_options) -> Dict[str, Any]:
         """
         Template method that executes the full analysis flow.
+        run_options are passed on to run_analysis (e.g. cwd/limits for dynamic tools).
+        """
+        with profiler.span("tool", self.__class__.__name__, file_path) as record:
+            # 1. Run the specific tool command -> returns string.
+            raw_output = self.run_analysis(file_path, **run_options)
+
+            # 2. Parse the output using the internal method
+            # (for streamed output this includes waiting for the tool)
+            parse_start = time.perf_counter()
+            result = self._parse_output(raw_output)
+            record["parse_s"] = time.perf_counter() - parse_start
+        return result
+
+    def in_project(self, path: str) -> bool:
+        """True if path lies inside one of the project_roots."""
+        return bool(path) and any(path == root or path.startswith(root.rstrip(os.sep) + os.sep)
+                                  for root in self.project_roots)
+
+    def get_command(self, file_path: str) -> List[str]:
+        """
+        Returns the command line used to analyze file_path (part of the result cache key).
+        """
+        return [self.__class__.__name__, file_path]
+
+    def get_version(self) -> Optional[str]:
+        """
+        Returns the version of the underlying tool, or None if it is unknown.
+        Results of tools without a version are never cached.
         """
-        # 1. Run the specific tool command -> returns string.
-        raw_output = self.run_analysis(file_path)
-        
-        # 2. Parse the output using the internal method
-        return self._parse_output(raw_output)
+        return None
 
     @abstractmethod
     def run_analysis(self, file_path: str) -> str:
         """
-        Abstract method: Must run the tool and return raw output (string).
+        Abstract method: Must run the tool and return raw output (string,
+        or a readable stream for tools that parse their output incrementally).
         """
         pass
 
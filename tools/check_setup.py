@@ -1,7 +1,12 @@
 # tools/check_setup.py
 
 import os
-import subprocess
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.tool_registry import ToolRegistry
+
 
 def check_environment():
     print("--- Starting Environment Check ---")
@@ -13,18 +18,16 @@ def check_environment():
     else:
         print(f"[X] ERROR: Could not find {file_path}. Check folder structure!")
 
-    # 2. Check if CppCheck is installed and accessible
-    try:
-        # Run a simple version check command
-        result = subprocess.run(['cppcheck', '--version'], capture_output=True, text=True)
-        if result.returncode == 0:
-            print(f"[V] CppCheck is installed: {result.stdout.strip()}")
+    # 2. Check which analysis tools are installed (the same probe the benchmark uses)
+    registry = ToolRegistry()
+    for name in registry.names():
+        status = registry.probe(name)
+        if status.available:
+            print(f"[V] {name} is installed: {status.version}")
         else:
-            print(f"[X] CppCheck returned error: {result.stderr}")
-    except FileNotFoundError:
-        print("[X] ERROR: CppCheck not found via Python (is it installed in Docker?)")
+            print(f"[X] {name} is not available: {status.reason}")
 
     print("--- Check Finished ---")
 
 if __name__ == "__main__":
-    check_environment()
\ No newline at end of file
+    check_environment()
@@ -0,0 +1,131 @@
+import os
+import re
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from core import profiler
+from tools.analysis_tool import AnalysisTool
+
+# file:line:column: severity: message [check]
+DIAGNOSTIC = re.compile(r"^(.+?):(\d+):(\d+): (warning|error): (.*?)(?: \[([\w\-.,]+)\])?$")
+
+
+class ClangTidyTool(AnalysisTool):
+    """
+    Implementation of the AnalysisTool for clang-tidy (Clang static analyzer and bugprone checks).
+    Static analysis
+    """
+
+    supports_project = True
+    probe_command = ["clang-tidy", "--version"]
+
+    checks = "-*,clang-analyzer-*,bugprone-*"
+
+    def __init__(self):
+        self._version = None
+
+    def get_command(self, file_path: str) -> List[str]:
+        # "--" : no compilation database, the file is compiled with default flags
+        return ["clang-tidy", f"--checks={self.checks}", "--quiet", file_path, "--"]
+
+    def get_version(self) -> Optional[str]:
+        if self._version is None:
+            try:
+                result = subprocess.run(["clang-tidy", "--version"], capture_output=True, text=True)
+            except FileNotFoundError:
+                return None
+            if result.returncode != 0:
+                return None
+            self._version = result.stdout.strip()
+        return self._version
+
+    def run_analysis(self, file_path: str) -> str:
+        print(f"[ClangTidy] Analyzing: {file_path}")
+
+        try:
+            result = profiler.run_process(
+                self.get_command(file_path),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True
+            )
+            return result.stdout
+        except FileNotFoundError:
+            return "CLANG_TIDY_NOT_INSTALLED"
+        except Exception as e:
+            return f"GENERAL_ERROR: {str(e)}"
+
+    def _parse_output(self, raw_output: str) -> Dict[str, Any]:
+        if raw_output == "CLANG_TIDY_NOT_INSTALLED":
+            return {"bugs": [{"message": "Clang-tidy not installed", "severity": "critical", "line": 0}]}
+        if raw_output.startswith("GENERAL_ERROR"):
+            return {"bugs": [{"message": raw_output, "severity": "error", "line": 0}]}
+
+        return {"bugs": [bug for bug, _ in self._iter_diagnostics(raw_output)]}
+
+    @staticmethod
+    def _iter_diagnostics(output: str) -> Iterator[Tuple[Dict[str, Any], str]]:
+        """
+        Yields (bug, full path of its file) for every warning/error line; notes and
+        the "N warnings generated." lines are skipped.
+        """
+        for line in output.splitlines():
+            match = DIAGNOSTIC.match(line)
+            if not match:
+                continue
+            path, line_number, _, severity, message, check = match.groups()
+            yield {
+                "message": message,
+                "severity": severity,
+                "line": int(line_number),
+                "file": os.path.basename(path),
+                # compiler errors have no check name
+                "type": check.split(",")[0] if check else "clang-diagnostic-error",
+            }, path
+
+    def get_project_command(self, build_path: str, file_path: str, header_filter: str) -> List[str]:
+        return ["clang-tidy", f"--checks={self.checks}", "--quiet", "-p", build_path,
+                f"--header-filter={header_filter}", file_path]
+
+    def run_project(self, compile_commands: str, files: List[str], jobs: int = 1) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyzes files with the flags of compile_commands.json, one clang-tidy
+        process per file, up to jobs at a time. Diagnostics in the project's
+        headers carry the header's path ("header"), so they can be reported once
+        for all translation units including it (see BenchmarkManager).
+        """
+        build_path = os.path.dirname(compile_commands)
+        # headers of the project itself, not system or third party ones
+        header_filter = re.escape(os.path.commonpath([os.path.dirname(os.path.realpath(path)) for path in files]))
+        print(f"[ClangTidy] Analyzing {len(files)} files (project mode, {jobs} jobs)")
+
+        def analyze(file_path: str):
+            try:
+                process = profiler.MeasuredPopen(
+                    self.get_project_command(build_path, file_path, header_filter),
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True
+                )
+            except FileNotFoundError:
+                return "CLANG_TIDY_NOT_INSTALLED", None
+            output, _ = process.communicate()
+            return output, process.rusage
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            for file_path, (output, rusage) in zip(files, pool.map(analyze, files)):
+                profiler.note_process(rusage, len(output))
+                if output == "CLANG_TIDY_NOT_INSTALLED":
+                    results[file_path] = self._parse_output(output)
+                    continue
+
+                bugs = []
+                source = os.path.realpath(file_path)
+                for bug, path in self._iter_diagnostics(output):
+                    path = os.path.realpath(path)
+                    if path != source:
+                        bug["header"] = path
+                    bugs.append(bug)
+                results[file_path] = {"bugs": bugs}
+        return results
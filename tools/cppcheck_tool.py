@@ -1,60 +1,212 @@
 # tools/cppcheck_tool.py
 
+import io
+import json
+import os
 import subprocess
+import tempfile
 import xml.etree.ElementTree as ET
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List, Optional
+from core import profiler
+from core.findings import Findings
 from tools.analysis_tool import AnalysisTool
 
 
+class CppcheckProcess:
+    """
+    Running cppcheck process, read as a binary stream of its XML report (stderr).
+    """
+    def __init__(self, process: profiler.MeasuredPopen):
+        self.process = process
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.process.stderr.read(size)
+        self.bytes_read += len(data)
+        return data
+
+    def close(self):
+        self.process.stderr.close()
+        self.process.wait()
+        profiler.note_process(self.process.rusage, self.bytes_read)
+
+
 class CppcheckTool(AnalysisTool):
     """
     Implementation of the AnalysisTool for CppCheck.
     Static analysis
     """
 
-    def run_analysis(self, file_path: str) -> str:
-        print(f"[Cppcheck] Analyzing: {file_path}")
+    supports_project = True
+    probe_command = ["cppcheck", "--version"]
+
+    def __init__(self):
+        self._version = None
+
+    def get_command(self, file_path: str) -> List[str]:
         # --subprocess=missingIncludeSystem for exclude information notifications
-        command = ["cppcheck", "--enable=all", "--xml", file_path]
+        return ["cppcheck", "--enable=all", "--xml", *self._build_dir_option(file_path), file_path]
+
+    def _build_dir_option(self, name: str) -> List[str]:
+        # cppcheck runs its own preprocessor (every #ifdef configuration); with a build dir
+        # it keeps the analyzer info of each file and configuration, and skips unchanged files
+        if self.preprocess_cache is None:
+            return []
+        return [f"--cppcheck-build-dir={self.preprocess_cache.cppcheck_build_dir(name)}"]
+
+    def get_version(self) -> Optional[str]:
+        if self._version is None:
+            try:
+                result = subprocess.run(["cppcheck", "--version"], capture_output=True, text=True)
+            except FileNotFoundError:
+                return None
+            if result.returncode != 0:
+                return None
+            self._version = result.stdout.strip()
+        return self._version
+
+    def run_analysis(self, file_path: str):
+        """
+        Starts cppcheck on the file.
+        Returns a CppcheckProcess streaming the XML report (or an error string).
+        """
+        print(f"[Cppcheck] Analyzing: {file_path}")
+        command = self.get_command(file_path)
 
         try:
-            result = subprocess.run(
+            process = profiler.MeasuredPopen(
             command, 
             stderr=subprocess.PIPE, 
-            stdout=subprocess.DEVNULL, 
-            text=True
+            stdout=subprocess.DEVNULL
             )            
-            return result.stderr
+            return CppcheckProcess(process)
         except FileNotFoundError:
             return "CPPCHECK_NOT_INSTALLED"
         except Exception as e:
             return f"GENERAL_ERROR: {str(e)}"
     
-    def _parse_output(self, raw_output: str) -> Dict[str, Any]:
-        
+    def _parse_output(self, raw_output) -> Dict[str, Any]:
+        """
+        Parses cppcheck's XML report into JSON format.
+        raw_output is a CppcheckProcess (or the XML text itself).
+        """
         if raw_output == "CPPCHECK_NOT_INSTALLED":
             return {"bugs": [{"message": "Cppcheck not installed", "severity": "critical", "line": 0}]}
-        if raw_output.startswith("GENERAL_ERROR"):
+        if isinstance(raw_output, str) and raw_output.startswith("GENERAL_ERROR"):
             return {"bugs": [{"message": raw_output, "severity": "error", "line": 0}]}
-        
-        bugs = []
-        
+
+        return {"bugs": Findings(self.iter_bugs(raw_output))}
+
+    def iter_bugs(self, raw_output) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the bugs of a cppcheck XML report while cppcheck is still writing it.
+        Every <error> is dropped once converted, so memory use stays flat however
+        large the report is. A truncated report yields the errors before the cut.
+        """
+        stream = io.BytesIO(raw_output.encode()) if isinstance(raw_output, str) else raw_output
         try:
-            root = ET.fromstring(raw_output)
-            for error in root.findall(".//error"):
-                severity = error.get("severity", "unknown")
-                if severity == "information":
-                    continue        # information notification not consider as an error
-                bugs.append({
-                    "message": error.get("msg", "Unknown error"),
-                    "severity": error.get("severity", "unknown"),
-                    "line": int(error.find("location").get("line")) if error.find("location") is not None else 0,
-                    "type": error.get("id", "unknown")
-                })
+            for error in self._iter_errors(stream):
+                bug = self._error_to_bug(error)
+                if bug:
+                    yield bug
         except ET.ParseError:
-             return {"bugs": []}
-             
-        return {"bugs": bugs}
+            pass        # empty or truncated report: keep what was parsed
+        finally:
+            if isinstance(raw_output, CppcheckProcess):
+                raw_output.close()
+
+    @staticmethod
+    def _error_to_bug(error: ET.Element) -> Optional[Dict[str, Any]]:
+        severity = error.get("severity", "unknown")
+        if severity == "information":
+            return None        # information notification not consider as an error
+
+        location = error.find("location")
+        if location is None:
+            line, file = 0, ""
+        else:
+            line, file = int(location.get("line", 0)), location.get("file", "")
+        return {
+            "message": error.get("msg", "Unknown error"),
+            "severity": severity,
+            "line": line,
+            "file": file,
+            "type": error.get("id", "unknown")
+        }
+
+    def get_project_command(self, compile_commands: str, jobs: int, build_dir_name: Optional[str] = None) -> List[str]:
+        # build_dir_name: the project the build dir belongs to, when compile_commands is a filtered copy
+        return ["cppcheck", "--enable=all", "--xml", *self._build_dir_option(build_dir_name or compile_commands),
+                f"--project={compile_commands}", f"-j{jobs}"]
+
+    def run_project(self, compile_commands: str, files: List[str], jobs: int = 1) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyzes files (as listed in compile_commands.json) with a single cppcheck process
+        running jobs threads, using the include paths and defines of the real build.
+        The combined XML report is parsed while cppcheck is still running and
+        split back into {file path: {"bugs": Findings}}.
+        """
+        owners = {os.path.realpath(path): path for path in files}
+        results = {path: {"bugs": Findings()} for path in files}
+        print(f"[Cppcheck] Analyzing {len(files)} files (project mode, -j {jobs})")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            project = self._filter_project(compile_commands, owners, tmp_dir)
+            try:
+                process = profiler.MeasuredPopen(
+                    self.get_project_command(project, jobs, build_dir_name=compile_commands),
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE
+                )
+            except FileNotFoundError:
+                return {path: self._parse_output("CPPCHECK_NOT_INSTALLED") for path in files}
+
+            try:
+                for error in self._iter_errors(process.stderr):
+                    bug = self._error_to_bug(error)
+                    # file0 is the translation unit an error in a header was found through
+                    owner = owners.get(os.path.realpath(error.get("file0") or bug["file"])) if bug else None
+                    if owner:
+                        results[owner]["bugs"].append(bug)
+            except ET.ParseError:
+                pass        # cppcheck died mid-report: keep what was parsed
+            finally:
+                process.stderr.close()
+                process.wait()
+                profiler.note_process(process.rusage)
+
+        return results
+
+    @staticmethod
+    def _filter_project(compile_commands: str, owners: Dict[str, str], tmp_dir: str) -> str:
+        """
+        Writes a compile_commands.json that only lists the requested files.
+        """
+        with open(compile_commands, 'r') as f:
+            entries = json.load(f)
+
+        selected = [entry for entry in entries
+                    if os.path.realpath(os.path.join(entry.get("directory", ""), entry["file"])) in owners]
+        project = os.path.join(tmp_dir, "compile_commands.json")
+        with open(project, 'w') as f:
+            json.dump(selected, f)
+        return project
+
+    @staticmethod
+    def _iter_errors(stream) -> Iterator[ET.Element]:
+        """
+        Yields every <error> of a cppcheck XML report as soon as it is complete,
+        then drops it, so the report is never held in memory as a whole.
+        """
+        errors = None
+        for event, elem in ET.iterparse(stream, events=("start", "end")):
+            if event == "start":
+                if elem.tag == "errors":
+                    errors = elem
+            elif elem.tag == "error":
+                yield elem
+                if errors is not None:
+                    errors.clear()
 
 
 
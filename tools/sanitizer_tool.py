@@ -0,0 +1,202 @@
+import glob
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from typing import Dict, Any, Optional
+from core import profiler
+from core.dynamic_scheduler import ResourceLimits
+from core.findings import TIMED_OUT
+from tools.analysis_tool import AnalysisTool
+
+# AddressSanitizer error kinds -> bug types used in expected_results.json
+ERROR_TYPES = {
+    "heap-buffer-overflow": "out_of_bounds",
+    "stack-buffer-overflow": "out_of_bounds",
+    "stack-buffer-underflow": "out_of_bounds",
+    "global-buffer-overflow": "out_of_bounds",
+    "container-overflow": "out_of_bounds",
+    "dynamic-stack-buffer-overflow": "out_of_bounds",
+    "heap-use-after-free": "use_after_free",
+    "double-free": "invalid_free",
+    "bad-free": "invalid_free",
+    "alloc-dealloc-mismatch": "mismatched_free",
+    "new-delete-type-mismatch": "mismatched_free",
+}
+
+# UndefinedBehaviorSanitizer messages -> bug types
+UB_TYPES = [
+    (re.compile(r"out of bounds"), "out_of_bounds"),
+    (re.compile(r"null pointer"), "null_pointer"),
+    (re.compile(r"integer overflow"), "integer_overflow"),
+    (re.compile(r"division by zero"), "division_by_zero"),
+    (re.compile(r"shift exponent|left shift"), "invalid_shift"),
+]
+
+ASAN_ERROR = re.compile(r"ERROR: AddressSanitizer: (?:attempting )?([\w\-]+)")
+LEAK = re.compile(r"(Direct|Indirect) leak of (\d+) byte\(s\) in \d+ object\(s\) allocated from:")
+UB_ERROR = re.compile(r"^(\S+?):(\d+):(?:\d+:)? runtime error: (.*)$")
+FRAME = re.compile(r"^\s*#\d+ 0x[0-9a-f]+ in (.+?) (\S+?):(\d+)(?::\d+)?$")
+FRAME_NO_SOURCE = re.compile(r"^\s*#\d+ 0x[0-9a-f]+ (?:in (.+?) )?\((.+)\)$")
+
+# leak reports are written at exit, so a killed program only has its earlier errors
+TIMEOUT_MARKER = "SANITIZER_TIMEOUT"
+
+
+class SanitizerTool(AnalysisTool):
+    """
+    Runs executables built with AddressSanitizer, UndefinedBehaviorSanitizer and
+    LeakSanitizer. The instrumented programs run about 2x slower than normal builds,
+    where Valgrind's emulation is 20-50x slower.
+    """
+
+    # the executables must come from a separate build with these flags
+    build_variant = "sanitize"
+    build_flags = ["-fsanitize=address,undefined", "-fsanitize-recover=address",
+                   "-fno-omit-frame-pointer", "-g"]
+
+    kind = "dynamic"
+    probe_command = ["c++", "--version"]   # the sanitize build uses the system compiler
+    timeout = 20        # seconds per executable without runtime history
+    slowdown = 2
+
+    def run_analysis(self, executable_path: str, cwd: Optional[str] = None, limits=None,
+                     timeout: Optional[float] = None, fast_fail: bool = False):
+        """
+        Runs the instrumented executable. The sanitizers write their reports to
+        files in a private directory, so program output never mixes with them.
+        cwd: working directory of the program, limits: ResourceLimits applied to the process,
+        timeout: seconds before the program is killed (default: self.timeout),
+        fast_fail: halt the program at its first error.
+        Returns the report text (or an error string).
+        """
+        print(f"[Sanitizer] Analyzing: {executable_path}")
+
+        log_dir = tempfile.mkdtemp(prefix="sanitizer-")
+        log_path = os.path.join(log_dir, "report")
+        env = dict(os.environ)
+        env["ASAN_OPTIONS"] = self._asan_options(log_path, limits, fast_fail)
+        env["UBSAN_OPTIONS"] = f"print_stacktrace=1:log_path={log_path}:halt_on_error={int(fast_fail)}"
+
+        try:
+            profiler.run_process(
+                [executable_path],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                cwd=cwd,
+                env=env,
+                timeout=timeout or self.timeout,
+                preexec_fn=self._preexec(limits)
+            )
+            timed_out = False
+        except subprocess.TimeoutExpired:
+            timed_out = True
+        except Exception as e:
+            shutil.rmtree(log_dir, ignore_errors=True)
+            return f"GENERAL_ERROR: {str(e)}"
+
+        # one file per process: report.<pid>
+        reports = []
+        for path in sorted(glob.glob(log_path + ".*")):
+            with open(path, "r", errors="ignore") as f:
+                reports.append(f.read())
+        shutil.rmtree(log_dir, ignore_errors=True)
+
+        if timed_out:
+            reports.append(TIMEOUT_MARKER)
+        return "\n".join(reports)
+
+    @staticmethod
+    def _asan_options(log_path: str, limits, fast_fail: bool = False) -> str:
+        options = [f"halt_on_error={int(fast_fail)}", "detect_leaks=1", f"log_path={log_path}"]
+        if limits is not None and limits.memory_bytes:
+            # the memory limit is enforced by ASan itself (see _preexec)
+            options.append(f"hard_rss_limit_mb={max(1, limits.memory_bytes // (1024 * 1024))}")
+        return ":".join(options)
+
+    @staticmethod
+    def _preexec(limits):
+        """
+        ASan reserves terabytes of address space for its shadow memory, so an
+        RLIMIT_AS limit would stop it from starting; only the CPU limit is applied here.
+        """
+        if limits is None:
+            return None
+        return ResourceLimits(cpu_seconds=limits.cpu_seconds).apply
+
+    def _parse_output(self, raw_output: str) -> Dict[str, Any]:
+        """
+        Parses the sanitizer reports into JSON format.
+        """
+        if raw_output.startswith("GENERAL_ERROR"):
+            return {"bugs": [{"message": raw_output, "severity": "error", "line": 0}]}
+
+        bugs = []
+        current = None          # bug whose stack is being read
+        for line in raw_output.splitlines():
+            asan_error = ASAN_ERROR.search(line)
+            leak = LEAK.search(line)
+            ub_error = UB_ERROR.match(line)
+
+            if asan_error:
+                kind = asan_error.group(1)
+                message = line.split("AddressSanitizer: ", 1)[1]
+                current = self._new_bug(ERROR_TYPES.get(kind, kind), kind, message.split(" on ")[0])
+                bugs.append(current)
+            elif leak:
+                kind = f"{leak.group(1)}Leak"
+                current = self._new_bug("memory_leak", kind, line.strip())
+                current["bytes"] = int(leak.group(2))
+                bugs.append(current)
+            elif ub_error:
+                message = ub_error.group(3)
+                current = self._new_bug(self._ub_type(message), "UndefinedBehavior", message)
+                current["file"] = os.path.basename(ub_error.group(1))
+                current["line"] = int(ub_error.group(2))
+                bugs.append(current)
+            elif current is not None and line.strip().startswith("#"):
+                self._add_frame(current, line)
+            elif current is not None and current["stack"] and not line.strip():
+                # a blank line ends the first stack; later ones (allocated by / freed by) are not needed
+                current = None
+
+        if TIMEOUT_MARKER in raw_output:
+            bugs.append({"message": TIMED_OUT, "severity": "error", "line": 0})
+
+        return {"bugs": bugs}
+
+    @staticmethod
+    def _new_bug(bug_type: str, kind: str, message: str) -> Dict[str, Any]:
+        return {"message": message, "severity": "error", "line": 0, "file": "",
+                "type": bug_type, "kind": kind, "stack": []}
+
+    @staticmethod
+    def _ub_type(message: str) -> str:
+        for pattern, bug_type in UB_TYPES:
+            if pattern.search(message):
+                return bug_type
+        return "undefined_behavior"
+
+    def _add_frame(self, bug: Dict[str, Any], line: str):
+        """
+        Adds a stack frame; the first frame in user code gives the bug its file and line.
+        """
+        frame = FRAME.match(line)
+        if frame is None:
+            no_source = FRAME_NO_SOURCE.match(line)
+            if no_source:
+                bug["stack"].append(f"{no_source.group(1) or '???'} (in {no_source.group(2)})")
+            return
+
+        function, path, line_number = frame.group(1), frame.group(2), int(frame.group(3))
+        bug["stack"].append(f"{function} ({os.path.basename(path)}:{line_number})")
+        if not bug["line"] and self._is_user_path(path):
+            bug["file"] = os.path.basename(path)
+            bug["line"] = line_number
+
+    def _is_user_path(self, path: str) -> bool:
+        if self.project_roots:
+            return self.in_project(path)
+        # the sanitizer runtime is built from ../../../../src/libsanitizer, system headers live in /usr
+        return "libsanitizer" not in path and not path.startswith("/usr/")
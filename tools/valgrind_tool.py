@@ -1,91 +1,250 @@
+import io
+import os
 import subprocess
-import re
-from typing import Dict, Any
+import threading
+import xml.etree.ElementTree as ET
+from typing import Dict, Any, List, Optional
+from core import profiler
+from core.findings import TIMED_OUT, Findings
+from core.valgrind_errors import stack_signature
 from tools.analysis_tool import AnalysisTool
 
+# valgrind error kinds -> bug types used in expected_results.json
+ERROR_TYPES = {
+    "Leak_DefinitelyLost": "memory_leak",
+    "Leak_IndirectlyLost": "memory_leak",
+    "Leak_PossiblyLost": "memory_leak",
+    "InvalidRead": "out_of_bounds",
+    "InvalidWrite": "out_of_bounds",
+    "UninitCondition": "uninitialized_variable",
+    "UninitValue": "uninitialized_variable",
+    "MismatchedFree": "mismatched_free",
+    "InvalidFree": "invalid_free",
+}
+
+# still reachable memory is not a bug
+IGNORED_KINDS = {"Leak_StillReachable"}
+
+
+class ValgrindProcess:
+    """
+    Running valgrind process, read as a binary stream of its --xml-fd output.
+    The process is killed if it runs longer than timeout seconds; with fast_fail,
+    the parser stops it at the first definite error.
+    """
+    def __init__(self, process: profiler.MeasuredPopen, stream, timeout: float, fast_fail: bool = False):
+        self.process = process
+        self.stream = stream
+        self.timeout = timeout
+        self.fast_fail = fast_fail
+        self.timed_out = False
+        self.stopped = False
+        self.bytes_read = 0
+        self._timer = threading.Timer(timeout, self._kill)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _kill(self):
+        self.timed_out = True
+        self.process.kill()
+
+    def stop(self):
+        self._timer.cancel()
+        self.stopped = True
+        self.process.kill()
+
+    def read(self, size: int = -1) -> bytes:
+        # read1 returns what is available instead of waiting for size bytes,
+        # so every error is parsed as soon as valgrind reports it
+        data = self.stream.read1(size) if size > 0 else self.stream.read()
+        self.bytes_read += len(data)
+        return data
+
+    def close(self):
+        self._timer.cancel()
+        self.stream.close()
+        self.process.wait()
+        profiler.note_process(self.process.rusage, self.bytes_read)
+
+
 class ValgrindTool(AnalysisTool):
-    
-    def run_analysis(self, executable_path: str) ->str:
+
+    kind = "dynamic"
+    num_callers = 50    # stack depth; deeper stacks are cut, so they cannot be told apart from noise
+    probe_command = ["valgrind", "--version"]
+    timeout = 20        # seconds per executable without runtime history
+    slowdown = 30       # memcheck runs programs 20-50x slower
+
+    def run_analysis(self, executable_path: str, cwd: Optional[str] = None, limits=None,
+                     timeout: Optional[float] = None, fast_fail: bool = False):
         """
         Runs Valgrind on the given executable file and detects memory leaks
+        cwd: working directory of the program, limits: ResourceLimits applied to the process,
+        timeout: seconds before the program is killed (default: self.timeout),
+        fast_fail: stop the program at its first definite error.
+        Returns a ValgrindProcess streaming the XML report (or an error string).
         """
 
         print(f"[Valgrind] Analyzing: {executable_path}")
 
-        # build commnd = --leak-check=full --track-origins=yes ./my_program
+        # the XML report goes to its own pipe, so program output never mixes with it
+        read_fd, write_fd = os.pipe()
+
+        # build commnd = --leak-check=full --track-origins=yes --xml=yes ./my_program
         command = [
             "valgrind",
             "--leak-check=full",
             "--track-origins=yes",
-            executable_path
+            "--xml=yes",
+            f"--xml-fd={write_fd}",
+            "--child-silent-after-fork=yes",
+            f"--num-callers={self.num_callers}",
+            # every error carries the suppression that would hide it (no prompt in XML mode)
+            "--gen-suppressions=all",
         ]
+        if self.suppressions_file and os.path.exists(self.suppressions_file):
+            command.append(f"--suppressions={self.suppressions_file}")
+        command.append(executable_path)
 
         try:
-            result = subprocess.run(
+            process = profiler.MeasuredPopen(
                 command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                errors='ignore',
-                text=True,
-                timeout=20          # limits time
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                pass_fds=(write_fd,),
+                cwd=cwd,
+                preexec_fn=limits.apply if limits else None
             )
-
-            
-            return result.stderr
-        
-        except subprocess.TimeoutExpired:
-            return "TIMEOUT_ERROR"
         except FileNotFoundError:
-            return "VALGRING_NOT_INSTALLED"
+            os.close(read_fd)
+            return "VALGRIND_NOT_INSTALLED"
         except Exception as e:
+            os.close(read_fd)
             return f"GENERAL_ERROR: {str(e)}"
+        finally:
+            os.close(write_fd)
+
+        return ValgrindProcess(process, os.fdopen(read_fd, 'rb'), timeout or self.timeout, fast_fail)
     
 
-    def _parse_output(self, raw_output: str) -> Dict[str, Any]:
+    def _parse_output(self, raw_output) -> Dict[str, Any]:
         """
-        Parses Valgrind raw text output into JSON format.
+        Parses Valgrind's XML output into JSON format.
+        raw_output is a ValgrindProcess (or the XML text itself). The XML is parsed
+        incrementally and every <error> is dropped once converted, so memory use
+        does not grow with the size of the report.
         """
 
-        bugs = []
-
         # edge cases:
-        if raw_output == "TIMEOUT_ERROR":
-            return {"bugs": [{"message": "Execution timed out", "severity": "error", "line": 0}]}
         if raw_output == "VALGRIND_NOT_INSTALLED":
              return {"bugs": [{"message": "Valgrind not installed", "severity": "critical", "line": 0}]}
-        if raw_output.startswith("GENERAL_ERROR"):
+        if isinstance(raw_output, str) and raw_output.startswith("GENERAL_ERROR"):
              return {"bugs": [{"message": raw_output, "severity": "error", "line": 0}]}
-        
-        # patterns to search in valgrind's raw_output
-        patterns = [
-            (r"definitely lost: ([0-9,]+) bytes", "Memory Leak (Definitely Lost)"),
-            (r"indirectly lost: ([0-9,]+) bytes", "Memory Leak (Indirectly Lost)"),
-            (r"Invalid read of size", "Invalid Memory Read"),
-            (r"Invalid write of size", "Invalid Memory Write"),
-            (r"Mismatched free", "Mismatched Free/Delete")
-        ]
 
-        for line in raw_output.splitlines():
-            for pattern, error_type in patterns:
-                match = re.search(pattern, line)
-                if match:
-                    # error found:
-
-                    # regex catch bytes 0 as an error -> if 0 bytes lost -> skip
-                    if "lost" in error_type.lower():        
-                        bytes_lost_str = match.group(1).replace(',','')
-                        if int(bytes_lost_str) == 0:
-                            continue # skip if leak is 0
-                    bugs.append({
-                        "message": f"{error_type}: {line.strip()}",
-                        "severity": "error",
-                        "line": 0,          # for now, line = 0
-                        "type": "memory_leak"
-                    })
-                    break
+        stream = io.BytesIO(raw_output.encode()) if isinstance(raw_output, str) else raw_output
+        bugs = Findings()
+        try:
+            root = None
+            depth = 0
+            for event, elem in ET.iterparse(stream, events=("start", "end")):
+                if event == "start":
+                    if root is None:
+                        root = elem
+                    depth += 1
+                    continue
+
+                depth -= 1
+                if depth == 1:
+                    # a top level element is complete
+                    if elem.tag == "error":
+                        bug = self._error_to_bug(elem)
+                        if bug:
+                            bugs.append(bug)
+                            if bug["severity"] == "error" and getattr(raw_output, "fast_fail", False):
+                                print("[Valgrind] Stopped at the first error (fast-fail).")
+                                raw_output.stop()
+                                break
+                    root.clear()
+        except ET.ParseError:
+            pass        # truncated report (crash / timeout): keep what was parsed
+        finally:
+            if isinstance(raw_output, ValgrindProcess):
+                raw_output.close()
+
+        if isinstance(raw_output, ValgrindProcess) and raw_output.timed_out:
+            print(f"[Valgrind] Timed out after {raw_output.timeout:.1f}s, keeping the errors reported so far.")
+            bugs.append({"message": TIMED_OUT, "severity": "error", "line": 0})
 
         return {"bugs": bugs}
-    
 
+    def _error_to_bug(self, error: ET.Element) -> Optional[Dict[str, Any]]:
+        kind = error.findtext("kind", "unknown")
+        if kind in IGNORED_KINDS:
+            return None
+
+        frames = [self._parse_frame(frame) for frame in error.findall("stack/frame")]
+        location = self._user_frame(frames)
+        stack = [self._format_frame(frame) for frame in frames]
+        bug = {
+            "message": error.findtext("what") or error.findtext("xwhat/text") or kind,
+            "severity": "warning" if kind == "Leak_PossiblyLost" else "error",
+            "line": location["line"] if location else 0,
+            "file": location["file"] if location else "",
+            "type": ERROR_TYPES.get(kind, kind),
+            "kind": kind,
+            "stack": stack,
+            "signature": stack_signature(kind, stack),
+        }
+        # errors raised entirely inside system libraries are noise the program cannot fix;
+        # their generated suppression is learned by the manager (see core/valgrind_errors.py).
+        # A stack cut at --num-callers may still reach the program above the cut: never learned
+        if frames and len(frames) < self.num_callers and all(self._is_third_party(frame) for frame in frames):
+            suppression = error.findtext("suppression/rawtext")
+            if suppression:
+                bug["suppression"] = suppression.strip()
+
+        leaked_bytes = error.findtext("xwhat/leakedbytes")
+        if leaked_bytes is not None:
+            bug["bytes"] = int(leaked_bytes)
+        return bug
+
+    @staticmethod
+    def _parse_frame(frame: ET.Element) -> Dict[str, Any]:
+        line = frame.findtext("line")
+        return {
+            "fn": frame.findtext("fn", "???"),
+            "obj": frame.findtext("obj", ""),
+            "dir": frame.findtext("dir", ""),
+            "file": frame.findtext("file", ""),
+            "line": int(line) if line else 0,
+        }
+
+    def _user_frame(self, stack: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Returns the first frame with source information in the project's sources, i.e.
+        neither valgrind's own replacement code (operator new, malloc...) nor a library.
+        """
+        for frame in stack:
+            if not frame["file"] or not frame["line"]:
+                continue
+            if self.project_roots:
+                if self.in_project(os.path.join(frame["dir"], frame["file"])):
+                    return frame
+            elif "vgpreload" not in frame["obj"] and not frame["dir"].startswith("/usr/"):
+                return frame
+        return None
 
+    def _is_third_party(self, frame: Dict[str, Any]) -> bool:
+        obj = frame["obj"]
+        if self.project_roots:
+            # the program's own binaries and sources, wherever the project lives (even under /usr/src)
+            source = os.path.join(frame["dir"], frame["file"]) if frame["file"] else ""
+            return not (self.in_project(obj) or self.in_project(source))
+        # without known roots: system prefixes
+        return "vgpreload" in obj or obj.startswith(("/usr/", "/lib"))
 
+    @staticmethod
+    def _format_frame(frame: Dict[str, Any]) -> str:
+        if frame["file"]:
+            return f"{frame['fn']} ({frame['file']}:{frame['line']})"
+        return f"{frame['fn']} (in {frame['obj']})"